@@ -203,7 +203,7 @@ def walter_backend(email: str = None) -> None:
     log.info("Walter CLI: Invoking WalterBackend...")
     event = get_walter_backend_event(email)
     response = create_newsletter_and_send_entrypoint(event, CONTEXT)
-    log.info(f"Walter CLI: Response:\n{parse_response(response)}")
+    log.info(f"Walter CLI: Response:\n{json.dumps(response, indent=4)}")
 
 
 if __name__ == "__main__":
@@ -1,8 +1,12 @@
-from dataclasses import dataclass
-from typing import Dict
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List
 
 from src.ai.context.models import Context
 from src.database.users.models import User
+from src.knowledge.base import WalterKnowledgeBase
+from src.knowledge.index import NewsIndex
 from src.stocks.models import Portfolio
 from src.stocks.polygon.models import StockPrice
 from src.utils.log import Logger
@@ -12,21 +16,94 @@ log = Logger(__name__).get_logger()
 
 @dataclass
 class ContextGenerator:
+    """
+    ContextGenerator
+
+    The news context of a portfolio is retrieved from the news index of each
+    held symbol in the knowledge base, so the prompt includes at most `top_k`
+    passages per symbol regardless of the volume of ingested news. Symbols that
+    are not indexed fall back to the top k news descriptions of the portfolio.
+    News indexes are cached for `INDEX_CACHE_TTL_SECONDS` as they only change
+    when news is ingested, and at most `index_cache_max_size` indexes are cached
+    with the least recently used evicted first.
+    """
+
+    DEFAULT_TOP_K = 3
+    DEFAULT_INDEX_CACHE_MAX_SIZE = 256
+    INDEX_CACHE_TTL_SECONDS = 900
+    QUERY = "{symbol} {company} earnings revenue guidance outlook analysts shares price"
 
     stocks: Dict[str, StockPrice] = None
+    knowledge_base: WalterKnowledgeBase | None = None
+    top_k: int = DEFAULT_TOP_K
+    index_cache_max_size: int = DEFAULT_INDEX_CACHE_MAX_SIZE
+
+    indexes: OrderedDict = field(default_factory=OrderedDict)
 
     def __post_init__(self) -> None:
-        log.debug("Creating ContextGenerator")
+        log.debug(f"Creating ContextGenerator with top {self.top_k} passages")
 
     def get_context(self, user: User, portfolio: Portfolio) -> Context:
-        log.info(f"Creating context for {user}")
+        log.debug(f"Creating context for user with email '{user.email}'")
 
         context = f"Generate an investments newsletter for {user.username} in a business casual fashion with jokes.\n"
         context += f"{user.username} total portfolio value is ${portfolio.get_total_equity():.2f}"
         context += "Use the following financial data for writing the newsletter.\n"
-
-        for stock in portfolio.get_stock_symbols():
-            news = portfolio.get_news(stock)
-            context += "\n".join(news.descriptions)
+        context += self.get_news_context(portfolio)
 
         return Context(context)
+
+    def get_news_context(self, portfolio: Portfolio) -> str:
+        """
+        Get the top k news passages of each stock in the portfolio.
+
+        Args:
+            portfolio: The portfolio of the user.
+
+        Returns:
+            The news passages of each stock in the portfolio grouped by symbol.
+        """
+        news = []
+        for symbol in portfolio.get_stock_symbols():
+            stock = portfolio.stocks.get(symbol)
+            passages = self._get_passages(symbol, stock.company if stock else "")
+            if not passages:
+                passages = self._get_descriptions(portfolio, symbol)
+            if passages:
+                news.append(f"{symbol}:\n" + "\n".join(passages))
+        return "\n\n".join(news)
+
+    def _get_passages(self, symbol: str, company: str) -> List[str]:
+        if self.knowledge_base is None:
+            return []
+        try:
+            index = self._get_news_index(symbol)
+        except Exception as exception:
+            log.error(
+                f"Unexpected error occurred getting news index for '{symbol}'!\nError: {exception}"
+            )
+            return []
+        query = ContextGenerator.QUERY.format(symbol=symbol, company=company)
+        return [passage.text for passage in index.search(query, self.top_k)]
+
+    def _get_descriptions(self, portfolio: Portfolio, symbol: str) -> List[str]:
+        # the news of a symbol is None if it could not be retrieved from polygon
+        news = portfolio.news.get(symbol)
+        if news is None:
+            return []
+        return news.descriptions[: self.top_k]
+
+    def _get_news_index(self, symbol: str) -> NewsIndex:
+        cached = self.indexes.get(symbol)
+        if (
+            cached is not None
+            and time.monotonic() - cached[1] < ContextGenerator.INDEX_CACHE_TTL_SECONDS
+        ):
+            self.indexes.move_to_end(symbol)
+            return cached[0]
+        index = self.knowledge_base.get_news_index(symbol)
+        self.indexes[symbol] = (index, time.monotonic())
+        self.indexes.move_to_end(symbol)
+        while len(self.indexes) > self.index_cache_max_size:
+            self.indexes.popitem(last=False)
+        return index
@@ -77,7 +77,8 @@ class AuthUser(WalterAPIMethod):
     def _verify_user_exists(self, event: dict) -> User:
         email = json.loads(event["body"])["email"]
         log.info(f"Verifying user exists with email '{email}'")
-        user = self.walter_db.get_user(email)
+        # credentials are checked against the stored user rather than a cached copy
+        user = self.walter_db.get_user(email, use_cache=False)
         if user is None:
             raise UserDoesNotExist("User not found!")
         log.info("Verified user exists!")
@@ -90,6 +91,12 @@ class AuthUser(WalterAPIMethod):
             raise InvalidPassword("Password incorrect!")
         log.info("Verified password matches!")
 
+        # upgrade stale password hashes while the plaintext password is known,
+        # the new hash is persisted with the last active date update
+        if self.authenticator.needs_rehash(user.password_hash):
+            log.info("Rehashing password with the configured hashing scheme and cost")
+            user.password_hash = self.authenticator.hash_password(password)
+
     def _update_last_active_date(self, user: User) -> None:
         log.info("Updating user last active time")
         user.last_active_date = dt.datetime.now(dt.UTC)
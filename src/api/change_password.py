@@ -80,7 +80,7 @@ class ChangePassword(WalterAPIMethod):
         # hash new password
         body = json.loads(event["body"])
         new_password = body["new_password"]
-        salt, new_password_hash = self.authenticator.hash_password(new_password)
+        new_password_hash = self.authenticator.hash_password(new_password)
 
         self.walter_db.update_user_password(
             email=email, password_hash=new_password_hash
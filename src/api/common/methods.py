@@ -1,4 +1,5 @@
 import json
+import time
 from abc import ABC, abstractmethod
 from typing import List
 
@@ -6,7 +7,10 @@ from src.api.common.exceptions import BadRequest, NotAuthenticated
 from src.api.common.models import HTTPStatus, Status, Response
 from src.auth.authenticator import WalterAuthenticator
 from src.aws.cloudwatch.client import WalterCloudWatchClient
-from src.utils.log import Logger
+from src.clients import DOMAIN
+from src.environment import Domain
+from src.utils.log import Logger, Payload
+from src.utils.tracing import SpanKind, Trace, span, start_trace
 
 log = Logger(__name__).get_logger()
 
@@ -25,6 +29,25 @@ METRICS_FAILURE_COUNT = "FailureCount"
 METRICS_TOTAL_COUNT = "TotalCount"
 """The total number of API invocations."""
 
+METRICS_LATENCY = "Latency"
+"""The latency of API invocations in milliseconds."""
+
+METRICS_STAGE_LATENCY = "StageLatency"
+"""The latency of each stage of API invocations in milliseconds, e.g. Validate."""
+
+METRICS_DOWNSTREAM_LATENCY = "DownstreamLatency"
+"""The latency of each downstream call of API invocations in milliseconds, e.g. DynamoDB.GetItem."""
+
+#########
+# DEBUG #
+#########
+
+DEBUG_HEADER = "X-Walter-Debug"
+"""Requests that include this header receive their stage timings in the Server-Timing response header."""
+
+DEBUG_DOMAINS = frozenset(domain for domain in Domain if domain != Domain.PRODUCTION)
+"""The domains that honor the debug header, stage timings are never exposed to production callers."""
+
 
 class WalterAPIMethod(ABC):
     """
@@ -62,23 +85,35 @@ class WalterAPIMethod(ABC):
             The API response.
         """
         log.info(
-            f"Invoking '{self.api_name}' API with event:\n{json.dumps(event, indent=4)}"
+            "Invoking '%s' API: %s %s",
+            self.api_name,
+            event.get("httpMethod"),
+            event.get("path"),
         )
+        log.debug("Invoking '%s' API with event: %s", self.api_name, Payload(event))
 
         response = None
-        try:
-            self._validate_request(event)
-
-            # authenticate request if necessary
-            authenticated_email = None
-            if self.is_authenticated_api():
-                authenticated_email = self._authenticate_request(event)
-
-            response = self.execute(event, authenticated_email)
-        except Exception as exception:
-            response = self._handle_exception(exception)
-        finally:
-            self.emit_metrics(response)
+        start = time.perf_counter()
+        with start_trace() as trace:
+            try:
+                with span("Validate"):
+                    self._validate_request(event)
+
+                # authenticate request if necessary
+                authenticated_email = None
+                if self.is_authenticated_api():
+                    with span("Authenticate"):
+                        authenticated_email = self._authenticate_request(event)
+
+                with span("Execute"):
+                    response = self.execute(event, authenticated_email)
+            except Exception as exception:
+                response = self._handle_exception(exception)
+            finally:
+                self.emit_metrics(response, (time.perf_counter() - start) * 1000, trace)
+
+        if WalterAPIMethod._is_debug_request(event):
+            response = WalterAPIMethod._add_server_timing_header(response, trace)
 
         return response
 
@@ -211,12 +246,20 @@ class WalterAPIMethod(ABC):
             data=data,
         ).to_json()
 
-    def emit_metrics(self, response: dict) -> None:
+    def emit_metrics(
+        self, response: dict, latency_ms: float, trace: Trace | None = None
+    ) -> None:
         """
         Emit the common metrics for the API.
 
+        The metrics are buffered and flushed together once per invocation. The
+        latency of each stage and downstream call recorded in the trace of the
+        invocation is emitted with the stage or call name as a dimension.
+
         Args:
             response: The API response object.
+            latency_ms: The latency of the API invocation in milliseconds.
+            trace: The trace of the API invocation, if any.
         """
         success = response["statusCode"] == HTTPStatus.OK.value
         self.metrics.emit_metric(
@@ -226,6 +269,26 @@ class WalterAPIMethod(ABC):
             self._get_failure_count_metric_name(), 0 if success else 1
         )
         self.metrics.emit_metric(self._get_total_count_metric_name(), 1)
+        self.metrics.put_metric(
+            self._get_latency_metric_name(), latency_ms, "Milliseconds"
+        )
+        if trace is not None:
+            for (kind, name), (duration_ms, _) in trace.get_totals().items():
+                if kind == SpanKind.STAGE:
+                    self.metrics.put_metric(
+                        self._get_stage_latency_metric_name(),
+                        duration_ms,
+                        "Milliseconds",
+                        dimensions={"Stage": name},
+                    )
+                else:
+                    self.metrics.put_metric(
+                        self._get_downstream_latency_metric_name(),
+                        duration_ms,
+                        "Milliseconds",
+                        dimensions={"Call": name},
+                    )
+        self.metrics.flush()
 
     def _get_success_count_metric_name(self) -> str:
         return f"{self.api_name}.{METRICS_SUCCESS_COUNT}"
@@ -236,6 +299,37 @@ class WalterAPIMethod(ABC):
     def _get_total_count_metric_name(self) -> str:
         return f"{self.api_name}.{METRICS_TOTAL_COUNT}"
 
+    def _get_latency_metric_name(self) -> str:
+        return f"{self.api_name}.{METRICS_LATENCY}"
+
+    def _get_stage_latency_metric_name(self) -> str:
+        return f"{self.api_name}.{METRICS_STAGE_LATENCY}"
+
+    def _get_downstream_latency_metric_name(self) -> str:
+        return f"{self.api_name}.{METRICS_DOWNSTREAM_LATENCY}"
+
+    @staticmethod
+    def _is_debug_request(event: dict) -> bool:
+        if DOMAIN not in DEBUG_DOMAINS:
+            return False
+        headers = event.get("headers") or {}
+        return any(
+            key.lower() == DEBUG_HEADER.lower() and str(value).lower() in ("1", "true")
+            for key, value in headers.items()
+        )
+
+    @staticmethod
+    def _add_server_timing_header(response: dict, trace: Trace) -> dict:
+        """
+        Add the stage and downstream call timings of the trace to the response headers.
+
+        The response headers are copied as they are shared by all responses.
+        """
+        headers = dict(response["headers"])
+        headers["Server-Timing"] = trace.to_server_timing()
+        headers["Access-Control-Expose-Headers"] = "Server-Timing"
+        return {**response, "headers": headers}
+
     @abstractmethod
     def execute(self, event: dict, email: str) -> dict:
         """
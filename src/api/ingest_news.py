@@ -1,3 +1,4 @@
+import datetime as dt
 from dataclasses import dataclass
 
 from src.api.common.methods import WalterAPIMethod
@@ -5,9 +6,9 @@ from src.api.common.models import HTTPStatus, Status
 from src.auth.authenticator import WalterAuthenticator
 from src.aws.cloudwatch.client import WalterCloudWatchClient
 from src.database.client import WalterDB
-from src.database.stocks.models import Stock
 from src.knowledge.base import WalterKnowledgeBase
-from src.stocks.alphavantage.models import CompanyNews
+from src.knowledge.ingest import MANIFEST_RETENTION, ingest_stock_news
+from src.stocks.alphavantage.client import AlphaVantageError
 from src.stocks.client import WalterStocksAPI
 from src.utils.log import Logger
 
@@ -21,6 +22,14 @@ class IngestNews(WalterAPIMethod):
 
     Scan WalterDB for all stocks and pull relevant market news and add
     to knowledge base.
+
+    Ingestion is incremental. The news of each stock is only requested since
+    it was last ingested, articles already in the knowledge base are not
+    scraped again and articles are only written if their content changed.
+
+    The stock universe is ingested in a single invocation. Stocks whose news
+    could not be retrieved are skipped and retried by the next run. Large
+    universes should be ingested by the sharded IngestNews workers instead.
     """
 
     # TODO: Add authorization so that only admins can call this API with an admin token
@@ -55,10 +64,30 @@ class IngestNews(WalterAPIMethod):
         self.walter_knowledge_base = walter_knowledge_base
 
     def execute(self, event: dict, authenticated_email: str) -> dict:
-        stocks = self._get_stocks_from_db()
-        for stock in stocks:
-            news = self._get_stock_news(stock)
-            self._dump_news(news)
+        manifest = self.walter_knowledge_base.get_manifest()
+        log.info("Getting all stocks from WalterDB")
+        count = 0
+        try:
+            for stock in self.walter_db.get_all_stocks():
+                try:
+                    ingest_stock_news(
+                        self.walter_stocks_api,
+                        self.walter_knowledge_base,
+                        manifest,
+                        stock.symbol,
+                    )
+                except AlphaVantageError as error:
+                    log.error(
+                        f"Failed to get news for stock '{stock.symbol}'!\n"
+                        f"Error: {error}"
+                    )
+                    continue
+                count += 1
+        finally:
+            # save the progress of partial runs so that the next run resumes incrementally
+            manifest.prune(dt.datetime.now(dt.UTC) - MANIFEST_RETENTION)
+            self.walter_knowledge_base.put_manifest(manifest)
+        log.info(f"Successfully ingested news for {count} stocks from WalterDB!")
         return self._create_response(
             http_status=HTTPStatus.OK,
             status=Status.SUCCESS,
@@ -70,20 +99,3 @@ class IngestNews(WalterAPIMethod):
 
     def is_authenticated_api(self) -> bool:
         return False
-
-    def _get_stocks_from_db(self) -> list:
-        log.info("Getting all stocks from WalterDB")
-        stocks = self.walter_db.get_all_stocks()
-        log.info(f"Successfully retrieved {len(stocks)} stocks from WalterDB!")
-        return stocks
-
-    def _get_stock_news(self, stock: Stock) -> CompanyNews:
-        log.info("Getting stocks news")
-        news = self.walter_stocks_api.get_news(stock.symbol)
-        log.info("Successfully retrieved stocks news!")
-        return news
-
-    def _dump_news(self, news: CompanyNews) -> None:
-        log.info("Dumping news to S3")
-        self.walter_knowledge_base.add_news(news)
-        log.info("Successfully dumped news to S3!")
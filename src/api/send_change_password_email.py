@@ -51,8 +51,8 @@ class SendChangePasswordEmail(WalterAPIMethod):
         # get email from query parameters
         email = self._get_email(event)
 
-        # verify user exists with email
-        user = self.walter_db.get_user(email)
+        # verify user exists with email, a cached user may have been deleted
+        user = self.walter_db.get_user(email, use_cache=False)
         if user is None:
             raise UserDoesNotExist("User does not exist!")
 
@@ -1,10 +1,14 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 import datetime as dt
-from typing import Tuple
+from typing import Callable, Tuple
 
-import bcrypt
 import jwt
 
+from src.auth.passwords import PasswordHashingService, get_password_hashing_service
 from src.aws.secretsmanager.client import WalterSecretsManagerClient
 from src.config import CONFIG
 from src.utils.log import Logger
@@ -12,14 +16,50 @@ from src.utils.log import Logger
 log = Logger(__name__).get_logger()
 
 
+@dataclass(frozen=True)
+class VerifiedToken:
+    """
+    Verified Token
+
+    The claims of a user token whose signature has been verified.
+    """
+
+    claims: dict
+    expires_at: float
+
+
 @dataclass
 class WalterAuthenticator:
     """
     Walter Authenticator
+
+    Verified user tokens are cached in a bounded LRU keyed by the SHA-256 hash
+    of the token and the secret key it was verified with, so repeat requests
+    with the same token skip signature verification. Cached tokens are only
+    served until their `exp` claim and the optional revocation check is applied
+    to every decode, cached or not.
+
+    Passwords are hashed with the configured password hashing scheme and cost.
     """
 
+    DEFAULT_TOKEN_CACHE_MAX_SIZE = 1024
+
     walter_sm: WalterSecretsManagerClient
 
+    token_cache_max_size: int = DEFAULT_TOKEN_CACHE_MAX_SIZE
+    is_token_revoked: Callable[[dict], bool] | None = None
+
+    passwords: PasswordHashingService = None  # set during post init if not given
+    verified_tokens: OrderedDict = None  # set during post init
+
+    def __post_init__(self) -> None:
+        if self.passwords is None:
+            self.passwords = get_password_hashing_service(
+                CONFIG.password_hash_scheme, CONFIG.password_hash_cost
+            )
+        self.verified_tokens = OrderedDict()
+        self._tokens_lock = threading.Lock()
+
     def generate_user_token(self, email: str) -> str:
         """
         Generate JSON web token for user.
@@ -46,7 +86,7 @@ class WalterAuthenticator:
             algorithm=CONFIG.jwt_algorithm,
         )
 
-    def decode_user_token(self, token: str) -> bool | None:
+    def decode_user_token(self, token: str) -> dict | None:
         """
         Decode the given user token to verify user identity.
 
@@ -54,21 +94,57 @@ class WalterAuthenticator:
             token: The user identity token
 
         Returns:
-            True if the token is valid, False otherwise.
+            The claims of the token if it is valid and not revoked, None otherwise.
         """
-        try:
-            return jwt.decode(
-                token,
-                self.walter_sm.get_jwt_secret_key(),
-                algorithms=[CONFIG.jwt_algorithm],
-            )
-        except jwt.ExpiredSignatureError:
-            log.error("Token has expired!")
-            return None
-        except jwt.InvalidTokenError:
-            log.error("Invalid token!")
+        secret_key = self.walter_sm.get_jwt_secret_key()
+        key = (hashlib.sha256(token.encode()).digest(), secret_key)
+
+        claims = self._get_verified_token(key)
+        if claims is None:
+            try:
+                claims = jwt.decode(
+                    token,
+                    secret_key,
+                    algorithms=[CONFIG.jwt_algorithm],
+                )
+            except jwt.ExpiredSignatureError:
+                log.error("Token has expired!")
+                return None
+            except jwt.InvalidTokenError:
+                log.error("Invalid token!")
+                return None
+            self._put_verified_token(key, claims)
+
+        if self.is_token_revoked is not None and self.is_token_revoked(claims):
+            log.error("Token has been revoked!")
             return None
 
+        return claims
+
+    def _get_verified_token(self, key: Tuple[bytes, str]) -> dict | None:
+        with self._tokens_lock:
+            verified = self.verified_tokens.get(key)
+            if verified is None:
+                return None
+            # expire tokens exactly as jwt.decode does, i.e. invalid once now >= exp
+            if time.time() >= verified.expires_at:
+                del self.verified_tokens[key]
+                return None
+            self.verified_tokens.move_to_end(key)
+            return dict(verified.claims)
+
+    def _put_verified_token(self, key: Tuple[bytes, str], claims: dict) -> None:
+        # tokens without an expiry are never cached as they could never be evicted on expiry
+        if self.token_cache_max_size <= 0 or "exp" not in claims:
+            return
+        with self._tokens_lock:
+            self.verified_tokens[key] = VerifiedToken(
+                claims=dict(claims), expires_at=float(claims["exp"])
+            )
+            self.verified_tokens.move_to_end(key)
+            while len(self.verified_tokens) > self.token_cache_max_size:
+                self.verified_tokens.popitem(last=False)
+
     def generate_email_token(self, email: str) -> str:
         """
         Generate JSON web token for email verification purposes.
@@ -174,23 +250,22 @@ class WalterAuthenticator:
             log.error("Invalid token!")
             return None
 
-    def hash_password(self, password: str) -> Tuple[bytes, bytes]:
+    def hash_password(self, password: str) -> str:
         """
         Hash the given password.
 
-        This method just uses bcrypt: https://github.com/pyca/bcrypt
+        The password is hashed with the configured password hashing scheme,
+        bcrypt by default: https://github.com/pyca/bcrypt
 
         Args:
             password: The password in plaintext before salting and hashing.
 
         Returns:
-            salt, password_hash
+            The password hash, including its scheme, cost and salt.
         """
         if isinstance(password, str) is False:
             raise TypeError("Password must be a string!")
-        salt = bcrypt.gensalt()
-        password_hash = bcrypt.hashpw(password.encode(), salt)
-        return salt, password_hash
+        return self.passwords.hash(password)
 
     def check_password(self, password: str, password_hash: str) -> bool:
         """
@@ -208,7 +283,20 @@ class WalterAuthenticator:
             or isinstance(password_hash, str) is False
         ):
             raise TypeError("Password and password hash must both be strings!")
-        return bcrypt.checkpw(password.encode(), password_hash.encode())
+        return self.passwords.verify(password, password_hash)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """
+        Checks if the given password hash was hashed with a different scheme or cost
+        than the configured password hashing scheme and cost.
+
+        Args:
+            password_hash: The stored password hash.
+
+        Returns:
+            True if the password should be hashed again on the next successful login.
+        """
+        return self.passwords.needs_rehash(password_hash)
 
     def get_token(self, event: dict) -> str | None:
         """
@@ -0,0 +1,220 @@
+import base64
+import hashlib
+import hmac
+import os
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import List
+
+import bcrypt
+
+from src.utils.log import Logger
+
+log = Logger(__name__).get_logger()
+
+
+class PasswordHasher(ABC):
+    """
+    Password Hasher
+
+    A password hashing scheme with a configurable work factor. Password hashes
+    are self-describing, i.e. they encode the scheme and the work factor they
+    were hashed with, so stale hashes can be detected and upgraded on login.
+    """
+
+    @abstractmethod
+    def hash(self, password: str) -> str:
+        """
+        Hash the given password with a random salt.
+        """
+        pass
+
+    @abstractmethod
+    def verify(self, password: str, password_hash: str) -> bool:
+        """
+        Check if the given password matches the given password hash.
+        """
+        pass
+
+    @abstractmethod
+    def identifies(self, password_hash: str) -> bool:
+        """
+        Check if the given password hash was hashed by this scheme.
+        """
+        pass
+
+    @abstractmethod
+    def needs_rehash(self, password_hash: str) -> bool:
+        """
+        Check if the given password hash was hashed with a different work factor.
+        """
+        pass
+
+
+@dataclass
+class BcryptHasher(PasswordHasher):
+    """
+    Bcrypt Password Hasher
+
+    Each increment of the cost doubles the time to hash and verify a password.
+
+    docs: https://github.com/pyca/bcrypt
+    """
+
+    DEFAULT_ROUNDS = 12
+
+    rounds: int = DEFAULT_ROUNDS
+
+    def hash(self, password: str) -> str:
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(self.rounds)).decode()
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        return bcrypt.checkpw(password.encode(), password_hash.encode())
+
+    def identifies(self, password_hash: str) -> bool:
+        return password_hash.startswith(("$2a$", "$2b$", "$2y$"))
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        # bcrypt hashes are formatted as $2b$<rounds>$<salt><hash>
+        return int(password_hash.split("$")[2]) != self.rounds
+
+
+@dataclass
+class ScryptHasher(PasswordHasher):
+    """
+    Scrypt Password Hasher
+
+    A memory-hard alternative to bcrypt via hashlib. Hashing a password takes
+    128 * 2^log_n * r bytes of memory, i.e. 16MB with the default parameters.
+    Hashes are formatted as $scrypt$ln=<log_n>,r=<r>,p=<p>$<salt>$<hash>.
+    """
+
+    DEFAULT_LOG_N = 14
+    DEFAULT_R = 8
+    DEFAULT_P = 1
+    PREFIX = "$scrypt$"
+    SALT_BYTES = 16
+    HASH_BYTES = 32
+
+    log_n: int = DEFAULT_LOG_N
+    r: int = DEFAULT_R
+    p: int = DEFAULT_P
+
+    def hash(self, password: str) -> str:
+        salt = os.urandom(ScryptHasher.SALT_BYTES)
+        key = ScryptHasher._derive(password, salt, self.log_n, self.r, self.p)
+        return (
+            f"{ScryptHasher.PREFIX}ln={self.log_n},r={self.r},p={self.p}"
+            f"${ScryptHasher._encode(salt)}${ScryptHasher._encode(key)}"
+        )
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        log_n, r, p, salt, key = ScryptHasher._parse(password_hash)
+        return hmac.compare_digest(
+            ScryptHasher._derive(password, salt, log_n, r, p), key
+        )
+
+    def identifies(self, password_hash: str) -> bool:
+        return password_hash.startswith(ScryptHasher.PREFIX)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        log_n, r, p, _, _ = ScryptHasher._parse(password_hash)
+        return (log_n, r, p) != (self.log_n, self.r, self.p)
+
+    @staticmethod
+    def _derive(password: str, salt: bytes, log_n: int, r: int, p: int) -> bytes:
+        n = 2**log_n
+        return hashlib.scrypt(
+            password.encode(),
+            salt=salt,
+            n=n,
+            r=r,
+            p=p,
+            maxmem=2 * 128 * n * r * p,
+            dklen=ScryptHasher.HASH_BYTES,
+        )
+
+    @staticmethod
+    def _parse(password_hash: str) -> tuple:
+        _, _, params, salt, key = password_hash.split("$")
+        params = dict(param.split("=") for param in params.split(","))
+        return (
+            int(params["ln"]),
+            int(params["r"]),
+            int(params["p"]),
+            ScryptHasher._decode(salt),
+            ScryptHasher._decode(key),
+        )
+
+    @staticmethod
+    def _encode(value: bytes) -> str:
+        return base64.b64encode(value).decode().rstrip("=")
+
+    @staticmethod
+    def _decode(value: str) -> bytes:
+        return base64.b64decode(value + "=" * (-len(value) % 4))
+
+
+@dataclass
+class PasswordHashingService:
+    """
+    Password Hashing Service
+
+    New passwords are hashed with the given hasher. Existing password hashes
+    are verified by whichever of the given hasher or legacy hashers identifies
+    them, so the scheme or work factor can be changed without invalidating
+    stored passwords. Password hashes made by a legacy hasher or with a stale
+    work factor should be replaced with a new hash after a successful login.
+    """
+
+    hasher: PasswordHasher
+    legacy_hashers: List[PasswordHasher] = field(default_factory=list)
+
+    def hash(self, password: str) -> str:
+        return self.hasher.hash(password)
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        for hasher in [self.hasher] + self.legacy_hashers:
+            if hasher.identifies(password_hash):
+                return hasher.verify(password, password_hash)
+        log.error("Password hash not identified by any password hashing scheme!")
+        return False
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        return not self.hasher.identifies(password_hash) or self.hasher.needs_rehash(
+            password_hash
+        )
+
+
+def get_password_hasher(scheme: str, cost: int | None = None) -> PasswordHasher:
+    """
+    Get the password hasher of the given scheme and work factor.
+
+    Args:
+        scheme: The password hashing scheme, either "bcrypt" or "scrypt".
+        cost: The work factor, i.e. the bcrypt rounds or the scrypt log2(N).
+
+    Returns:
+        The password hasher.
+    """
+    if scheme == "bcrypt":
+        return BcryptHasher(rounds=cost or BcryptHasher.DEFAULT_ROUNDS)
+    if scheme == "scrypt":
+        return ScryptHasher(log_n=cost or ScryptHasher.DEFAULT_LOG_N)
+    raise ValueError(f"Unknown password hashing scheme '{scheme}'!")
+
+
+def get_password_hashing_service(
+    scheme: str, cost: int | None = None
+) -> PasswordHashingService:
+    """
+    Get the password hashing service that hashes passwords with the given scheme
+    and verifies passwords hashed with any supported scheme.
+    """
+    hasher = get_password_hasher(scheme, cost)
+    legacy_hashers = [
+        get_password_hasher(legacy)
+        for legacy in ["bcrypt", "scrypt"]
+        if legacy != scheme
+    ]
+    return PasswordHashingService(hasher=hasher, legacy_hashers=legacy_hashers)
@@ -1,11 +1,13 @@
 import json
 from dataclasses import dataclass
-
-from mypy_boto3_bedrock import BedrockClient
-from mypy_boto3_bedrock_runtime import BedrockRuntimeClient
+from typing import TYPE_CHECKING
 
 from src.utils.log import Logger
 
+if TYPE_CHECKING:
+    from mypy_boto3_bedrock import BedrockClient
+    from mypy_boto3_bedrock_runtime import BedrockRuntimeClient
+
 log = Logger(__name__).get_logger()
 
 
@@ -21,8 +23,8 @@ class WalterBedrockClient:
     Model IDs: https://docs.aws.amazon.com/bedrock/latest/userguide/model-ids.html
     """
 
-    bedrock: BedrockClient
-    bedrock_runtime: BedrockRuntimeClient
+    bedrock: "BedrockClient"
+    bedrock_runtime: "BedrockRuntimeClient"
 
     def __post_init__(self) -> None:
         log.debug(
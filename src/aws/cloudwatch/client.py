@@ -1,44 +1,244 @@
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
 from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING, Dict, Iterator, List, Tuple
 
-from mypy_boto3_cloudwatch import CloudWatchClient
 from src.environment import Domain
 from src.utils.log import Logger
 
+if TYPE_CHECKING:
+    from mypy_boto3_cloudwatch import CloudWatchClient
+
 log = Logger(__name__).get_logger()
 
 
+class MetricsMode(Enum):
+    """
+    Metrics Mode
+
+    API: Metrics are flushed to CloudWatch with PutMetricData.
+    EMF: Metrics are flushed to stdout in the Embedded Metric Format (EMF)
+         and extracted by CloudWatch Logs, no API calls are made.
+    """
+
+    API = "api"
+    EMF = "emf"
+
+
+MetricKey = Tuple[str, str, Tuple[Tuple[str, str], ...]]
+"""(MetricKey): The metric name, unit, and sorted dimensions of a buffered metric."""
+
+
 @dataclass
 class WalterCloudWatchClient:
     """
     WalterBackend Cloud Watch Client
+
+    Metrics are buffered and aggregated in memory and only sent when the
+    buffer is flushed, typically once at the end of each invocation.
     """
 
     METRIC_NAMESPACE = "WalterBackend/{domain}"
 
-    client: CloudWatchClient
+    # put metric data limits
+    MAX_METRIC_DATA_PER_REQUEST = 1000
+    MAX_VALUES_PER_METRIC_DATA = 150
+
+    # embedded metric format limits
+    MAX_METRICS_PER_EMF_DOCUMENT = 100
+    MAX_VALUES_PER_EMF_METRIC = 100
+
+    client: "CloudWatchClient"
     domain: Domain
+    mode: MetricsMode = MetricsMode.API
 
     metric_namespace: str = None
 
     def __post_init__(self) -> None:
         log.debug(
-            f"Creating '{self.domain.value}' CloudWatch client in region '{self.client.meta.region_name}'"
+            f"Creating '{self.domain.value}' CloudWatch client in region '{self.client.meta.region_name}' in '{self.mode.value}' mode"
         )
         self.metric_namespace = WalterCloudWatchClient._get_metric_namespace(
             self.domain
         )
+        self._buffer: Dict[MetricKey, List[float]] = {}
+        self._lock = threading.Lock()
 
-    def emit_metric(self, metric_name: str, count: int) -> None:
-        self.client.put_metric_data(
-            Namespace=self.metric_namespace,
-            MetricData=[
-                {
-                    "MetricName": metric_name,
-                    "Unit": "Count",
-                    "Value": count,
-                }
-            ],
+    def emit_metric(
+        self, metric_name: str, count: int, dimensions: Dict[str, str] = None
+    ) -> None:
+        """
+        Buffer a count metric.
+
+        Args:
+            metric_name: The name of the metric.
+            count: The count to record.
+            dimensions: The optional dimensions of the metric.
+        """
+        self.put_metric(metric_name, count, "Count", dimensions)
+
+    def put_metric(
+        self,
+        metric_name: str,
+        value: float,
+        unit: str,
+        dimensions: Dict[str, str] = None,
+    ) -> None:
+        """
+        Buffer a metric value until the next flush.
+
+        Args:
+            metric_name: The name of the metric.
+            value: The value to record.
+            unit: The CloudWatch unit of the metric, e.g. "Count" or "Milliseconds".
+            dimensions: The optional dimensions of the metric.
+        """
+        key = (metric_name, unit, tuple(sorted((dimensions or {}).items())))
+        with self._lock:
+            self._buffer.setdefault(key, []).append(value)
+
+    @contextmanager
+    def timer(
+        self, metric_name: str, dimensions: Dict[str, str] = None
+    ) -> Iterator[None]:
+        """
+        Time the enclosed block and buffer its latency in milliseconds.
+
+        Args:
+            metric_name: The name of the latency metric.
+            dimensions: The optional dimensions of the metric.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.put_metric(
+                metric_name,
+                (time.perf_counter() - start) * 1000,
+                "Milliseconds",
+                dimensions,
+            )
+
+    def flush(self) -> None:
+        """
+        Flush all buffered metrics.
+
+        Errors are logged and the flushed metrics dropped, metrics emission
+        never fails the invocation.
+        """
+        with self._lock:
+            buffer, self._buffer = self._buffer, {}
+
+        if not buffer:
+            return
+
+        log.debug(
+            f"Flushing {len(buffer)} buffered metrics in '{self.mode.value}' mode"
         )
+        try:
+            if self.mode == MetricsMode.EMF:
+                self._flush_emf(buffer)
+            else:
+                self._flush_api(buffer)
+        except Exception as exception:
+            log.error(
+                f"Unexpected error occurred flushing metrics!\nError: {exception}"
+            )
+
+    def _flush_api(self, buffer: Dict[MetricKey, List[float]]) -> None:
+        metric_data = []
+        for (metric_name, unit, dimensions), values in buffer.items():
+            # aggregate identical values, e.g. counts, into value/count pairs
+            counts = list(Counter(values).items())
+            for i in range(
+                0, len(counts), WalterCloudWatchClient.MAX_VALUES_PER_METRIC_DATA
+            ):
+                j = i + WalterCloudWatchClient.MAX_VALUES_PER_METRIC_DATA
+                chunk = counts[i:j]
+                metric_data.append(
+                    {
+                        "MetricName": metric_name,
+                        "Unit": unit,
+                        "Dimensions": [
+                            {"Name": name, "Value": value} for name, value in dimensions
+                        ],
+                        "Values": [value for value, _ in chunk],
+                        "Counts": [count for _, count in chunk],
+                    }
+                )
+
+        for i in range(
+            0, len(metric_data), WalterCloudWatchClient.MAX_METRIC_DATA_PER_REQUEST
+        ):
+            j = i + WalterCloudWatchClient.MAX_METRIC_DATA_PER_REQUEST
+            self.client.put_metric_data(
+                Namespace=self.metric_namespace,
+                MetricData=metric_data[i:j],
+            )
+
+    def _flush_emf(self, buffer: Dict[MetricKey, List[float]]) -> None:
+        # group metrics by dimensions as each emf document has one dimension set
+        groups: Dict[
+            Tuple[Tuple[str, str], ...], List[Tuple[str, str, List[float]]]
+        ] = {}
+        for (metric_name, unit, dimensions), values in buffer.items():
+            groups.setdefault(dimensions, []).append((metric_name, unit, values))
+
+        timestamp = int(time.time() * 1000)
+        for dimensions, metrics in groups.items():
+            for document in WalterCloudWatchClient._get_emf_documents(
+                self.metric_namespace, timestamp, dict(dimensions), metrics
+            ):
+                sys.stdout.write(json.dumps(document) + "\n")
+        sys.stdout.flush()
+
+    @staticmethod
+    def _get_emf_documents(
+        namespace: str,
+        timestamp: int,
+        dimensions: Dict[str, str],
+        metrics: List[Tuple[str, str, List[float]]],
+    ) -> Iterator[dict]:
+        # each round includes at most the emf value limit of each metric's values
+        max_values = max(len(values) for _, _, values in metrics)
+        for start in range(
+            0, max_values, WalterCloudWatchClient.MAX_VALUES_PER_EMF_METRIC
+        ):
+            end = start + WalterCloudWatchClient.MAX_VALUES_PER_EMF_METRIC
+            batch = [
+                (metric_name, unit, values[start:end])
+                for metric_name, unit, values in metrics
+                if values[start:end]
+            ]
+            for i in range(
+                0, len(batch), WalterCloudWatchClient.MAX_METRICS_PER_EMF_DOCUMENT
+            ):
+                j = i + WalterCloudWatchClient.MAX_METRICS_PER_EMF_DOCUMENT
+                chunk = batch[i:j]
+                document = {
+                    "_aws": {
+                        "Timestamp": timestamp,
+                        "CloudWatchMetrics": [
+                            {
+                                "Namespace": namespace,
+                                "Dimensions": [list(dimensions)],
+                                "Metrics": [
+                                    {"Name": metric_name, "Unit": unit}
+                                    for metric_name, unit, _ in chunk
+                                ],
+                            }
+                        ],
+                    },
+                    **dimensions,
+                }
+                for metric_name, _, values in chunk:
+                    document[metric_name] = values if len(values) > 1 else values[0]
+                yield document
 
     @staticmethod
     def _get_metric_namespace(domain: Domain) -> str:
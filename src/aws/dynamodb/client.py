@@ -1,14 +1,37 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List
+from typing import TYPE_CHECKING, Iterator, List
 
 from botocore.exceptions import ClientError
-from mypy_boto3_dynamodb import DynamoDBClient
 
-from src.utils.log import Logger
+from src.utils.log import Logger, Payload
+from src.utils.tracing import traced
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb import DynamoDBClient
 
 log = Logger(__name__).get_logger()
 
 
+class UnprocessedKeysError(Exception):
+    """
+    Unprocessed Keys Error
+
+    Raised when DDB still returns unprocessed keys for a batch get after the
+    last retry, so callers never mistake a throttled key for a missing item.
+    """
+
+    def __init__(self, table: str, keys: List[dict]) -> None:
+        super().__init__(
+            f"Failed to get {len(keys)} unprocessed keys from table '{table}'!"
+        )
+        self.table = table
+        self.keys = keys
+
+
 @dataclass
 class WalterDDBClient:
     """
@@ -18,14 +41,19 @@ class WalterDDBClient:
     utilized by Walter to interact with all DDB tables.
     """
 
-    client: DynamoDBClient
+    BATCH_GET_ITEM_MAX_KEYS = 100
+    BATCH_GET_ITEM_MAX_RETRIES = 5
+    BATCH_GET_ITEM_BACKOFF_SECONDS = 0.05
+
+    client: "DynamoDBClient"
 
     def __post_init__(self) -> None:
         log.debug(
             f"Creating Walter DDB client in region '{self.client.meta.region_name}'"
         )
 
-    def put_item(self, table: str, item: dict) -> None:
+    @traced("DynamoDB.PutItem")
+    def put_item(self, table: str, item: dict) -> bool:
         """
         Put an item into the DDB table.
 
@@ -34,37 +62,78 @@ class WalterDDBClient:
             item: The item to insert into the DDB table.
 
         Returns:
-            None.
+            True if the item was put into the table, False otherwise.
         """
-        log.debug(f"Adding item to table '{table}':\n{item}")
+        log.debug("Adding item to table '%s': %s", table, Payload(item))
         try:
             self.client.put_item(TableName=table, Item=item)
+            return True
         except ClientError as error:
             log.error(
                 f"Unexpected error occurred putting item to '{table}'!\n"
                 f"Error: {error.response['Error']['Message']}"
             )
+            return False
 
-    def query(self, table: str, query: dict) -> List[dict]:
+    @traced("DynamoDB.Query")
+    def query(
+        self,
+        table: str,
+        key_condition_expression: str,
+        expression_attribute_values: dict,
+        expression_attribute_names: dict = None,
+        projection_expression: str = None,
+        page_size: int = None,
+    ) -> Iterator[dict]:
         """
-        Query for an item in a DDB table.
+        Query for items in a DDB table.
+
+        Pages are followed via `LastEvaluatedKey` and items are yielded as each
+        page is returned so memory use is bounded by the page size rather than
+        the number of matching items.
 
         Args:
             table: The name of the DDB table to query.
-            query: The query expression to query against the DDB table.
+            key_condition_expression: The key condition expression to query against the DDB table.
+            expression_attribute_values: The substitution tokens for attribute values.
+            expression_attribute_names: The optional substitution tokens for attribute names.
+            projection_expression: The optional attributes to return for each item.
+            page_size: The optional maximum number of items to read per page.
 
         Returns:
-            The list of DDB items that are returned by the query expression.
+            An iterator over the DDB items returned by the key condition expression.
         """
-        log.debug(f"Querying items in table '{table}' with query:\n{query}")
-        try:
-            return self.client.query(TableName=table, KeyConditions=query)["Items"]
-        except ClientError as error:
-            log.error(
-                f"Unexpected error occurred querying items from table '{table}'!\n"
-                f"Error: {error.response['Error']['Message']}"
-            )
+        log.debug(
+            f"Querying items in table '{table}' with key condition expression: '{key_condition_expression}'"
+        )
+        kwargs = {
+            "TableName": table,
+            "KeyConditionExpression": key_condition_expression,
+            "ExpressionAttributeValues": expression_attribute_values,
+        }
+        if expression_attribute_names is not None:
+            kwargs["ExpressionAttributeNames"] = expression_attribute_names
+        if projection_expression is not None:
+            kwargs["ProjectionExpression"] = projection_expression
+        if page_size is not None:
+            kwargs["Limit"] = page_size
+
+        while True:
+            try:
+                response = self.client.query(**kwargs)
+            except ClientError as error:
+                log.error(
+                    f"Unexpected error occurred querying items from table '{table}'!\n"
+                    f"Error: {error.response['Error']['Message']}"
+                )
+                raise error
+            yield from response["Items"]
+            last_evaluated_key = response.get("LastEvaluatedKey")
+            if last_evaluated_key is None:
+                return
+            kwargs["ExclusiveStartKey"] = last_evaluated_key
 
+    @traced("DynamoDB.GetItem")
     def get_item(self, table: str, key: dict) -> dict:
         """
         Get an item from a DDB table given its primary key.
@@ -76,7 +145,7 @@ class WalterDDBClient:
         Returns:
             The DDB item of the item with the given primary key.
         """
-        log.debug(f"Getting item from table '{table}' with key:\n{key}")
+        log.debug("Getting item from table '%s' with key: %s", table, Payload(key))
         try:
             return self.client.get_item(TableName=table, Key=key)["Item"]
         except ClientError as clientError:
@@ -90,28 +159,173 @@ class WalterDDBClient:
             # i.e. the item does not exist
             return None
 
-    def scan_table(self, table: str) -> List[dict]:
+    @traced("DynamoDB.BatchGetItem")
+    def batch_get_items(self, table: str, keys: List[dict]) -> List[dict]:
+        """
+        Get a batch of items from a DDB table given their primary keys.
+
+        The keys are requested in chunks of at most 100 keys, the BatchGetItem
+        limit. Any keys returned as unprocessed by DDB are retried with
+        exponential backoff. The returned items are in no particular order
+        and keys that do not exist in the table are omitted.
+
+        Args:
+            table: The name of the DDB table.
+            keys: The unique primary keys of the items to retrieve.
+
+        Returns:
+            The DDB items of the items with the given primary keys.
+
+        Raises:
+            UnprocessedKeysError: If keys are still unprocessed after the last retry.
         """
-        Scan the DDB table and return the list of items contained in the table.
+        log.debug(f"Batch getting {len(keys)} items from table '{table}'")
+        items = []
+        for start in range(0, len(keys), WalterDDBClient.BATCH_GET_ITEM_MAX_KEYS):
+            end = start + WalterDDBClient.BATCH_GET_ITEM_MAX_KEYS
+            chunk = keys[start:end]
+            items.extend(self._batch_get_items_chunk(table, chunk))
+        return items
+
+    def _batch_get_items_chunk(self, table: str, keys: List[dict]) -> List[dict]:
+        items = []
+        request = {table: {"Keys": keys}}
+        for attempt in range(WalterDDBClient.BATCH_GET_ITEM_MAX_RETRIES + 1):
+            if attempt > 0:
+                time.sleep(WalterDDBClient.BATCH_GET_ITEM_BACKOFF_SECONDS * 2**attempt)
+            try:
+                response = self.client.batch_get_item(RequestItems=request)
+            except ClientError as error:
+                log.error(
+                    f"Unexpected error occurred batch getting items from '{table}'!\n"
+                    f"Error: {error.response['Error']['Message']}"
+                )
+                raise error
+            items.extend(response["Responses"].get(table, []))
+            request = response.get("UnprocessedKeys", {})
+            if not request:
+                return items
+            log.debug(
+                f"Retrying {len(request[table]['Keys'])} unprocessed keys from table '{table}'"
+            )
+        log.error(
+            f"Failed to get {len(request[table]['Keys'])} unprocessed keys from table '{table}' "
+            f"after {WalterDDBClient.BATCH_GET_ITEM_MAX_RETRIES} retries!"
+        )
+        raise UnprocessedKeysError(table, request[table]["Keys"])
+
+    @traced("DynamoDB.Scan")
+    def scan_table(
+        self,
+        table: str,
+        projection_expression: str = None,
+        filter_expression: str = None,
+        expression_attribute_names: dict = None,
+        expression_attribute_values: dict = None,
+        total_segments: int = 1,
+    ) -> Iterator[dict]:
+        """
+        Scan the DDB table and yield the items contained in the table.
 
         This operation is expensive as it scans the entire DDB table. Use this method
-        with caution as there are performance implications.
+        with caution as there are performance implications. Pages are followed via
+        `LastEvaluatedKey` and items are yielded as each page is returned so memory
+        use does not grow with the size of the table. If more than one segment is
+        given, the table is scanned with a DDB parallel scan with one worker per
+        segment.
 
         Args:
             table: The name of the DDB table to scan.
+            projection_expression: The optional attributes to return for each item.
+            filter_expression: The optional filter applied to items after they are read.
+            expression_attribute_names: The optional substitution tokens for attribute names.
+            expression_attribute_values: The optional substitution tokens for attribute values.
+            total_segments: The number of segments to scan in parallel.
 
         Returns:
-            The list of items contained in the DDB table.
+            An iterator over the items contained in the DDB table.
         """
-        log.debug(f"Scanning table '{table}'")
+        log.debug(f"Scanning table '{table}' with {total_segments} segment(s)")
+        kwargs = {"TableName": table}
+        if projection_expression is not None:
+            kwargs["ProjectionExpression"] = projection_expression
+        if filter_expression is not None:
+            kwargs["FilterExpression"] = filter_expression
+        if expression_attribute_names is not None:
+            kwargs["ExpressionAttributeNames"] = expression_attribute_names
+        if expression_attribute_values is not None:
+            kwargs["ExpressionAttributeValues"] = expression_attribute_values
+
+        if total_segments <= 1:
+            for page in self._scan_pages(kwargs):
+                yield from page
+            return
+
+        yield from self._parallel_scan(kwargs, total_segments)
+
+    def _parallel_scan(self, kwargs: dict, total_segments: int) -> Iterator[dict]:
+        # workers hand pages to the consumer through a bounded queue so at
+        # most a couple of pages per segment are buffered at any time
+        pages = queue.Queue(maxsize=2 * total_segments)
+        stop = threading.Event()
+        done = object()
+
+        def put(page) -> None:
+            while not stop.is_set():
+                try:
+                    pages.put(page, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def scan_segment(segment: int) -> None:
+            try:
+                for page in self._scan_pages(
+                    {**kwargs, "Segment": segment, "TotalSegments": total_segments}
+                ):
+                    if stop.is_set():
+                        return
+                    put(page)
+            except Exception as exception:
+                put(exception)
+            finally:
+                put(done)
+
+        executor = ThreadPoolExecutor(max_workers=total_segments)
         try:
-            return self.client.scan(TableName=table)["Items"]
-        except ClientError as error:
-            log.error(
-                f"Unexpected error occurred attempting to scan table '{table}'!\n"
-                f"Error: {error.response['Error']['Message']}"
-            )
+            for segment in range(total_segments):
+                executor.submit(scan_segment, segment)
+            remaining = total_segments
+            while remaining > 0:
+                page = pages.get()
+                if page is done:
+                    remaining -= 1
+                elif isinstance(page, Exception):
+                    raise page
+                else:
+                    yield from page
+        finally:
+            stop.set()
+            executor.shutdown(wait=True)
+
+    def _scan_pages(self, kwargs: dict) -> Iterator[List[dict]]:
+        kwargs = dict(kwargs)
+        while True:
+            try:
+                response = self.client.scan(**kwargs)
+            except ClientError as error:
+                log.error(
+                    f"Unexpected error occurred attempting to scan table '{kwargs['TableName']}'!\n"
+                    f"Error: {error.response['Error']['Message']}"
+                )
+                raise error
+            yield response["Items"]
+            last_evaluated_key = response.get("LastEvaluatedKey")
+            if last_evaluated_key is None:
+                return
+            kwargs["ExclusiveStartKey"] = last_evaluated_key
 
+    @traced("DynamoDB.DeleteItem")
     def delete_item(self, table: str, key: dict) -> None:
         """
         Delete an item, if it exists, from the DDB table given its primary key.
@@ -123,7 +337,7 @@ class WalterDDBClient:
         Returns:
             None
         """
-        log.debug(f"Deleting item from table '{table}' with key:\n{key}")
+        log.debug("Deleting item from table '%s' with key: %s", table, Payload(key))
         try:
             self.client.delete_item(TableName=table, Key=key)
         except ClientError as error:
@@ -1,11 +1,16 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from io import BytesIO
-from typing import List
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 from botocore.exceptions import ClientError
-from mypy_boto3_s3 import S3Client
 from src.environment import Domain
 from src.utils.log import Logger
+from src.utils.tracing import traced
+
+if TYPE_CHECKING:
+    from mypy_boto3_s3 import S3Client
 
 log = Logger(__name__).get_logger()
 
@@ -18,7 +23,9 @@ class WalterS3Client:
     Boto3 S3 client wrapper class.
     """
 
-    client: S3Client
+    DEFAULT_MAX_CONCURRENT_REQUESTS = 16
+
+    client: "S3Client"
     domain: Domain
 
     def __post_init__(self) -> None:
@@ -26,6 +33,7 @@ class WalterS3Client:
             f"Creating '{self.domain.value}' WalterAIBackend S3 client in region '{self.client.meta.region_name}'"
         )
 
+    @traced("S3.ListObjects")
     def list_objects(self, bucket: str, prefix: str) -> List[str]:
         log.debug(
             f"Listing objects from S3 with prefix '{WalterS3Client.get_uri(bucket, prefix)}'"
@@ -43,8 +51,8 @@ class WalterS3Client:
             return objects
         except ClientError as error:
             log.error(
-                f"Unexpected error occurred listing objects with prefix '{WalterS3Client.get_uri(bucket, prefix)}'!",
-                error,
+                f"Unexpected error occurred listing objects with prefix '{WalterS3Client.get_uri(bucket, prefix)}'!\n"
+                f"Error: {error}"
             )
             raise error
         except KeyError:
@@ -54,6 +62,26 @@ class WalterS3Client:
             )
             return []
 
+    @traced("S3.ListObjectETags")
+    def list_object_etags(self, bucket: str, prefix: str) -> Dict[str, str]:
+        log.debug(
+            f"Listing object ETags from S3 with prefix '{WalterS3Client.get_uri(bucket, prefix)}'"
+        )
+        try:
+            etags = {}
+            paginator = self.client.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+                for content in page.get("Contents", []):
+                    etags[content["Key"]] = content["ETag"]
+            return etags
+        except ClientError as error:
+            log.error(
+                f"Unexpected error occurred listing object ETags with prefix '{WalterS3Client.get_uri(bucket, prefix)}'!\n"
+                f"Error: {error}"
+            )
+            raise error
+
+    @traced("S3.GetObject")
     def get_object(self, bucket: str, key: str) -> str:
         log.debug(
             f"Getting object from S3 with URI '{WalterS3Client.get_uri(bucket, key)}'"
@@ -70,11 +98,71 @@ class WalterS3Client:
             return object
         except ClientError as error:
             log.error(
-                f"Unexpected error occurred getting object from S3 '{WalterS3Client.get_uri(bucket, key)}'!",
-                error,
+                f"Unexpected error occurred getting object from S3 '{WalterS3Client.get_uri(bucket, key)}'!\n"
+                f"Error: {error}"
             )
             raise error
 
+    @traced("S3.GetObject")
+    def get_object_if_exists(
+        self, bucket: str, key: str, decode: bool = True
+    ) -> str | bytes | None:
+        log.debug(
+            f"Getting object if exists from S3 with URI '{WalterS3Client.get_uri(bucket, key)}'"
+        )
+        try:
+            contents = self.client.get_object(Bucket=bucket, Key=key)["Body"].read()
+            return contents.decode("utf-8") if decode else contents
+        except ClientError as error:
+            if error.response["Error"]["Code"] in ("NoSuchKey", "404"):
+                log.debug(
+                    f"Object does not exist in S3 with URI '{WalterS3Client.get_uri(bucket, key)}'"
+                )
+                return None
+            log.error(
+                f"Unexpected error occurred getting object from S3 '{WalterS3Client.get_uri(bucket, key)}'!\n"
+                f"Error: {error}"
+            )
+            raise error
+
+    @traced("S3.GetObject")
+    def get_object_if_modified(
+        self, bucket: str, key: str, etag: Optional[str] = None
+    ) -> Tuple[Optional[str], str]:
+        """
+        Conditionally get an object from S3 given the ETag of a previously retrieved copy.
+
+        Args:
+            bucket: The name of the bucket containing the object.
+            key: The key of the object.
+            etag: The ETag of the copy of the object held by the caller, if any.
+
+        Returns:
+            A tuple of the decoded object contents and its current ETag. The contents
+            are None if the object has not been modified since the given ETag.
+        """
+        log.debug(
+            f"Getting object if modified from S3 with URI '{WalterS3Client.get_uri(bucket, key)}'"
+        )
+        kwargs = {"Bucket": bucket, "Key": key}
+        if etag is not None:
+            kwargs["IfNoneMatch"] = etag
+        try:
+            response = self.client.get_object(**kwargs)
+            return response["Body"].read().decode("utf-8"), response["ETag"]
+        except ClientError as error:
+            if error.response["Error"]["Code"] in ("304", "NotModified"):
+                log.debug(
+                    f"Object not modified in S3 with URI '{WalterS3Client.get_uri(bucket, key)}'"
+                )
+                return None, etag
+            log.error(
+                f"Unexpected error occurred getting object from S3 '{WalterS3Client.get_uri(bucket, key)}'!\n"
+                f"Error: {error}"
+            )
+            raise error
+
+    @traced("S3.DownloadObject")
     def download_object(self, bucket: str, key: str) -> BytesIO:
         log.debug(
             f"Downloading object from S3 with URI '{WalterS3Client.get_uri(bucket, key)}'"
@@ -88,12 +176,13 @@ class WalterS3Client:
             return stream
         except ClientError as error:
             log.error(
-                f"Unexpected error occurred downloading object from S3 with URI '{WalterS3Client.get_uri(bucket, key)}'!",
-                error,
+                f"Unexpected error occurred downloading object from S3 with URI '{WalterS3Client.get_uri(bucket, key)}'!\n"
+                f"Error: {error}"
             )
             raise error
 
-    def put_object(self, bucket: str, key: str, contents: str) -> None:
+    @traced("S3.PutObject")
+    def put_object(self, bucket: str, key: str, contents: str | bytes) -> None:
         log.debug(
             f"Putting object to S3 with URI '{WalterS3Client.get_uri(bucket, key)}'"
         )
@@ -104,11 +193,63 @@ class WalterS3Client:
             )
         except ClientError as error:
             log.error(
-                f"Unexpected error occurred putting object to S3 with URI '{WalterS3Client.get_uri(bucket, key)}'!",
-                error,
+                f"Unexpected error occurred putting object to S3 with URI '{WalterS3Client.get_uri(bucket, key)}'!\n"
+                f"Error: {error}"
             )
             raise error
 
+    def put_objects(
+        self,
+        bucket: str,
+        objects: Dict[str, str | bytes],
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+    ) -> List[str]:
+        """
+        Put the given objects to S3 concurrently.
+
+        At most `max_concurrent_requests` objects are put at once. The objects
+        share the connection pool of the Boto3 client, which should be sized to
+        at least `max_concurrent_requests` connections. Errors are isolated per
+        object, i.e. an object that fails to be put is logged and the remaining
+        objects are still put.
+
+        Args:
+            bucket: The name of the bucket to put the objects.
+            objects: The contents of the objects to put indexed by key.
+            max_concurrent_requests: The maximum number of objects put at once.
+
+        Returns:
+            The keys of the objects that failed to be put.
+        """
+        log.debug(f"Putting {len(objects)} objects to S3 bucket '{bucket}'")
+        if not objects:
+            return []
+
+        failed = []
+        max_workers = max(1, min(max_concurrent_requests, len(objects)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # puts run in a copy of the caller's context so that their
+            # downstream call timers are recorded in the caller's trace
+            futures = {
+                executor.submit(
+                    contextvars.copy_context().run,
+                    self.put_object,
+                    bucket,
+                    key,
+                    contents,
+                ): key
+                for key, contents in objects.items()
+            }
+            for future in as_completed(futures):
+                if future.exception() is not None:
+                    failed.append(futures[future])
+
+        if failed:
+            log.error(
+                f"Failed to put {len(failed)} of {len(objects)} objects to S3 bucket '{bucket}'!"
+            )
+        return failed
+
     @staticmethod
     def get_uri(bucket: str, key: str) -> str:
         return f"s3://{bucket}/{key}"
@@ -1,14 +1,32 @@
 import json
+import threading
+import time
 from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List
 
-from mypy_boto3_secretsmanager import SecretsManagerClient
+from botocore.exceptions import ClientError
 
 from src.environment import Domain
 from src.utils.log import Logger
 
+if TYPE_CHECKING:
+    from mypy_boto3_secretsmanager import SecretsManagerClient
+
 log = Logger(__name__).get_logger()
 
 
+@dataclass
+class CachedSecret:
+    """
+    Cached Secret
+
+    The parsed secret string of a secret and when it was retrieved.
+    """
+
+    values: Dict[str, str]
+    fetched_at: float
+
+
 @dataclass
 class WalterSecretsManagerClient:
     """
@@ -17,6 +35,11 @@ class WalterSecretsManagerClient:
     This client is responsible for retrieving secrets from SecretsManager used for
     generating/decoding authentication tokens and calling external APIs.
 
+    Secrets are cached for `ttl_seconds`. A secret read within `refresh_ahead_seconds`
+    of expiring is served from the cache while it is refreshed in the background,
+    so rotated secrets are picked up without blocking requests. Entrypoints can
+    prefetch the set of secrets they need in a single batch call.
+
     Secrets:
         - AlphaVantageAPIKey: The API key to access Alpha Vantage for stock market news and pricing data.
         - PolygonAPIKey: The API key to access Polygon API for market data.
@@ -36,63 +59,181 @@ class WalterSecretsManagerClient:
     JWT_CHANGE_PASSWORD_SECRET_KEY_ID = "JWTChangePasswordSecretKey"
     JWT_CHANGE_PASSWORD_SECRET_KEY_NAME = "JWT_CHANGE_PASSWORD_SECRET_KEY"
 
-    client: SecretsManagerClient
+    # the sets of secrets required by entrypoints, prefetched in a single batch
+    USER_TOKEN_SECRET_IDS = [JWT_SECRET_KEY_SECRET_ID]
+    VERIFY_EMAIL_SECRET_IDS = [JWT_VERIFY_EMAIL_SECRET_KEY_ID]
+    CHANGE_PASSWORD_SECRET_IDS = [JWT_CHANGE_PASSWORD_SECRET_KEY_ID]
+    MARKET_DATA_SECRET_IDS = [
+        POLYGON_API_KEY_SECRET_ID,
+        ALPHA_VANTAGE_PREMIUM_API_KEY_SECRET_ID,
+    ]
+
+    BATCH_GET_SECRET_VALUE_MAX_SECRETS = 20
+    DEFAULT_TTL_SECONDS = 900
+    DEFAULT_REFRESH_AHEAD_SECONDS = 120
+
+    client: "SecretsManagerClient"
     domain: Domain
+    ttl_seconds: int = DEFAULT_TTL_SECONDS
+    refresh_ahead_seconds: int = DEFAULT_REFRESH_AHEAD_SECONDS
 
-    # lazy init all secrets
-    alpha_vantage_premium_api_key: str = None
-    alpha_vantage_api_key: str = None
-    polygon_api_key: str = None
-    jwt_secret_key: str = None
-    jwt_verify_email_secret_key: str = None
-    jwt_change_password_secret_key: str = None
+    secrets: Dict[str, CachedSecret] = None  # set during post init
 
     def __post_init__(self) -> None:
         log.debug(
             f"Creating {self.domain.value} SecretsManager client in region '{self.client.meta.region_name}'"
         )
+        self.secrets = {}
+        self._lock = threading.Lock()
+        self._refreshing = set()
 
     def get_alpha_vantage_api_key(self) -> str:
-        if self.alpha_vantage_premium_api_key is None:
-            self.alpha_vantage_premium_api_key = self._get_secret(
-                WalterSecretsManagerClient.ALPHA_VANTAGE_PREMIUM_API_KEY_SECRET_ID,
-                WalterSecretsManagerClient.ALPHA_VANTAGE_PREMIUM_API_KEY_SECRET_NAME,
-            )
-        return self.alpha_vantage_premium_api_key
+        return self._get_secret(
+            WalterSecretsManagerClient.ALPHA_VANTAGE_PREMIUM_API_KEY_SECRET_ID,
+            WalterSecretsManagerClient.ALPHA_VANTAGE_PREMIUM_API_KEY_SECRET_NAME,
+        )
 
     def get_polygon_api_key(self) -> str:
-        if self.polygon_api_key is None:
-            self.polygon_api_key = self._get_secret(
-                WalterSecretsManagerClient.POLYGON_API_KEY_SECRET_ID,
-                WalterSecretsManagerClient.POLYGON_API_KEY_SECRET_NAME,
-            )
-        return self.polygon_api_key
+        return self._get_secret(
+            WalterSecretsManagerClient.POLYGON_API_KEY_SECRET_ID,
+            WalterSecretsManagerClient.POLYGON_API_KEY_SECRET_NAME,
+        )
 
     def get_jwt_secret_key(self) -> str:
-        if self.jwt_secret_key is None:
-            self.jwt_secret_key = self._get_secret(
-                WalterSecretsManagerClient.JWT_SECRET_KEY_SECRET_ID,
-                WalterSecretsManagerClient.JWT_SECRET_KEY_SECRET_NAME,
-            )
-        return self.jwt_secret_key
+        return self._get_secret(
+            WalterSecretsManagerClient.JWT_SECRET_KEY_SECRET_ID,
+            WalterSecretsManagerClient.JWT_SECRET_KEY_SECRET_NAME,
+        )
 
     def get_jwt_verify_email_secret_key(self) -> str:
-        if self.jwt_verify_email_secret_key is None:
-            self.jwt_verify_email_secret_key = self._get_secret(
-                WalterSecretsManagerClient.JWT_VERIFY_EMAIL_SECRET_KEY_ID,
-                WalterSecretsManagerClient.JWT_VERIFY_EMAIL_SECRET_KEY_NAME,
-            )
-        return self.jwt_verify_email_secret_key
+        return self._get_secret(
+            WalterSecretsManagerClient.JWT_VERIFY_EMAIL_SECRET_KEY_ID,
+            WalterSecretsManagerClient.JWT_VERIFY_EMAIL_SECRET_KEY_NAME,
+        )
 
     def get_jwt_change_password_secret_key(self) -> str:
-        if self.jwt_change_password_secret_key is None:
-            self.jwt_change_password_secret_key = self._get_secret(
-                WalterSecretsManagerClient.JWT_CHANGE_PASSWORD_SECRET_KEY_ID,
-                WalterSecretsManagerClient.JWT_CHANGE_PASSWORD_SECRET_KEY_NAME,
-            )
-        return self.jwt_change_password_secret_key
+        return self._get_secret(
+            WalterSecretsManagerClient.JWT_CHANGE_PASSWORD_SECRET_KEY_ID,
+            WalterSecretsManagerClient.JWT_CHANGE_PASSWORD_SECRET_KEY_NAME,
+        )
+
+    def prefetch(self, secret_ids: Iterable[str]) -> None:
+        """
+        Prefetch the given secrets that are not cached or have expired.
+
+        Secrets that are cached but due for a refresh are left to be refreshed
+        in the background on their next read.
+
+        The secrets are retrieved with as few `BatchGetSecretValue` calls as
+        possible. Secrets that cannot be retrieved in the batch are logged and
+        left to be fetched individually on first use.
+
+        Args:
+            secret_ids: The IDs of the secrets to prefetch.
+        """
+        now = time.monotonic()
+        missing = [
+            secret_id
+            for secret_id in dict.fromkeys(secret_ids)
+            if self._is_expired(self.secrets.get(secret_id), now)
+        ]
+        if not missing:
+            return
+
+        log.debug(f"Prefetching {len(missing)} secrets: {missing}")
+        for start in range(
+            0,
+            len(missing),
+            WalterSecretsManagerClient.BATCH_GET_SECRET_VALUE_MAX_SECRETS,
+        ):
+            end = start + WalterSecretsManagerClient.BATCH_GET_SECRET_VALUE_MAX_SECRETS
+            chunk = missing[start:end]
+            try:
+                self._batch_get_secrets(chunk)
+            except Exception as error:
+                log.error(
+                    f"Unexpected error occurred prefetching secrets {chunk}!\n"
+                    f"Error: {error}"
+                )
+
+    def _batch_get_secrets(self, secret_ids: List[str]) -> None:
+        kwargs = {"SecretIdList": secret_ids}
+        while True:
+            response = self.client.batch_get_secret_value(**kwargs)
+            fetched_at = time.monotonic()
+            for secret in response.get("SecretValues", []):
+                # secret values are returned by name, cache them by requested ID
+                secret_id = next(
+                    (
+                        secret_id
+                        for secret_id in secret_ids
+                        if secret_id in (secret["Name"], secret["ARN"])
+                    ),
+                    secret["Name"],
+                )
+                self._put_secret(secret_id, secret["SecretString"], fetched_at)
+            for error in response.get("Errors", []):
+                log.error(
+                    f"Unable to prefetch secret '{error['SecretId']}': {error['ErrorCode']}"
+                )
+            if "NextToken" not in response:
+                return
+            kwargs["NextToken"] = response["NextToken"]
 
     def _get_secret(self, secret_id: str, secret_name: str) -> str:
-        return json.loads(
-            self.client.get_secret_value(SecretId=secret_id)["SecretString"]
-        )[secret_name]
+        now = time.monotonic()
+        cached = self.secrets.get(secret_id)
+
+        if cached is None:
+            return self._fetch_secret(secret_id).values[secret_name]
+
+        if self._is_expired(cached, now):
+            try:
+                return self._fetch_secret(secret_id).values[secret_name]
+            except ClientError as error:
+                log.error(
+                    f"Unexpected error occurred refreshing secret '{secret_id}', using expired secret!\n"
+                    f"Error: {error}"
+                )
+                return cached.values[secret_name]
+
+        if now - cached.fetched_at >= self.ttl_seconds - self.refresh_ahead_seconds:
+            self._refresh_in_background(secret_id)
+
+        return cached.values[secret_name]
+
+    def _fetch_secret(self, secret_id: str) -> CachedSecret:
+        log.debug(f"Getting secret '{secret_id}'")
+        response = self.client.get_secret_value(SecretId=secret_id)
+        return self._put_secret(secret_id, response["SecretString"], time.monotonic())
+
+    def _refresh_in_background(self, secret_id: str) -> None:
+        with self._lock:
+            if secret_id in self._refreshing:
+                return
+            self._refreshing.add(secret_id)
+
+        def refresh() -> None:
+            try:
+                self._fetch_secret(secret_id)
+                log.debug(f"Refreshed secret '{secret_id}' ahead of expiry")
+            except Exception as error:
+                log.error(
+                    f"Unexpected error occurred refreshing secret '{secret_id}'!\n"
+                    f"Error: {error}"
+                )
+            finally:
+                with self._lock:
+                    self._refreshing.discard(secret_id)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def _put_secret(
+        self, secret_id: str, secret_string: str, fetched_at: float
+    ) -> CachedSecret:
+        secret = CachedSecret(values=json.loads(secret_string), fetched_at=fetched_at)
+        self.secrets[secret_id] = secret
+        return secret
+
+    def _is_expired(self, secret: CachedSecret | None, now: float) -> bool:
+        return secret is None or now - secret.fetched_at >= self.ttl_seconds
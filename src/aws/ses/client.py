@@ -1,18 +1,36 @@
 import os
+import threading
 from dataclasses import dataclass
 from email.mime.image import MIMEImage
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from typing import TYPE_CHECKING, Dict, List
 
 from botocore.exceptions import ClientError
-from mypy_boto3_ses import SESClient
 from src.environment import Domain
 from src.templates.models import TemplateAssets
 from src.utils.log import Logger
+from src.utils.tracing import traced
+
+if TYPE_CHECKING:
+    from mypy_boto3_ses import SESClient
 
 log = Logger(__name__).get_logger()
 
 
+@dataclass
+class EncodedTemplateAssets:
+    """
+    Encoded Template Assets
+
+    The MIME attachments of a template's assets encoded from the asset
+    versions identified by the given ETags.
+    """
+
+    etags: Dict[str, str]
+    attachments: List[MIMEImage]
+
+
 @dataclass
 class WalterSESClient:
     """
@@ -28,14 +46,19 @@ class WalterSESClient:
     SENDER = "walter@walterai.dev"
     CHARSET = "utf-8"
 
-    client: SESClient
+    client: "SESClient"
     domain: Domain
 
+    encoded_assets: Dict[str, EncodedTemplateAssets] = None  # set during post init
+
     def __post_init__(self) -> None:
+        self.encoded_assets = {}
+        self._encoded_assets_lock = threading.Lock()
         log.debug(
             f"Creating {self.domain.value} SES client in region '{self.client.meta.region_name}'"
         )
 
+    @traced("SES.SendEmail")
     def send_email(
         self, recipient: str, body: str, subject: str, assets: TemplateAssets
     ) -> None:
@@ -59,9 +82,7 @@ class WalterSESClient:
                 Source=WalterSESClient.SENDER,
                 Destinations=[recipient],
                 RawMessage={
-                    "Data": WalterSESClient._create_email(
-                        recipient, subject, body, assets
-                    ),
+                    "Data": self._create_email(recipient, subject, body, assets),
                 },
             )
             log.info(f"Successfully sent email to recipient '{recipient}'")
@@ -71,9 +92,8 @@ class WalterSESClient:
                 f"Exception: {exception.response['Error']['Message']}"
             )
 
-    @staticmethod
     def _create_email(
-        recipient: str, subject: str, body: str, assets: TemplateAssets
+        self, recipient: str, subject: str, body: str, assets: TemplateAssets
     ) -> str:
         """Create an email to the given recipient.
 
@@ -107,15 +127,42 @@ class WalterSESClient:
         email_body.attach(html_body)
         email.attach(email_body)
 
-        # add assets as attachments
-        for name, stream in assets.assets.items():
-            cid_name = name.split(".")[0]
-            attachment = MIMEImage(stream.getvalue())
-            attachment.add_header("Content-ID", f"<{cid_name}>")
-            attachment.add_header(
-                "Content-Disposition", "inline", filename=os.path.basename(cid_name)
-            )
+        # add pre-encoded assets as attachments
+        for attachment in self._get_encoded_assets(assets):
             email.attach(attachment)
 
         # return email as a string
         return email.as_string()
+
+    def _get_encoded_assets(self, assets: TemplateAssets) -> List[MIMEImage]:
+        """Get the encoded MIME attachments for the given template assets.
+
+        The base64 encoded MIME parts of each template's assets are cached and
+        reused across emails until the ETags of the assets change.
+
+        Args:
+            assets (TemplateAssets): The assets referenced by the HTML body.
+
+        Returns:
+            List[MIMEImage]: The encoded MIME attachments of the assets.
+        """
+        with self._encoded_assets_lock:
+            cached = self.encoded_assets.get(assets.name)
+            if cached is not None and assets.etags and cached.etags == assets.etags:
+                return cached.attachments
+
+            log.debug(f"Encoding '{assets.name}' template assets")
+            attachments = []
+            for name, stream in assets.assets.items():
+                cid_name = name.split(".")[0]
+                attachment = MIMEImage(stream.getvalue())
+                attachment.add_header("Content-ID", f"<{cid_name}>")
+                attachment.add_header(
+                    "Content-Disposition", "inline", filename=os.path.basename(cid_name)
+                )
+                attachments.append(attachment)
+
+            self.encoded_assets[assets.name] = EncodedTemplateAssets(
+                etags=dict(assets.etags), attachments=attachments
+            )
+            return attachments
@@ -1,19 +1,55 @@
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Tuple
 
 from botocore.exceptions import ClientError
-from mypy_boto3_sqs.client import SQSClient
 
 from src.environment import Domain
 from src.utils.log import Logger
 
+if TYPE_CHECKING:
+    from mypy_boto3_sqs.client import SQSClient
+
 log = Logger(__name__).get_logger()
 
 
+class SendMessagesError(Exception):
+    """
+    Send Messages Error
+
+    Raised when messages could not be sent to a queue. The IDs of the
+    messages that were sent are kept so that callers can report both.
+    """
+
+    def __init__(
+        self, queue_url: str, failed: List[dict], message_ids: List[str]
+    ) -> None:
+        super().__init__(
+            f"Failed to publish {len(failed)} messages to queue '{queue_url}'!"
+        )
+        self.failed = failed
+        self.message_ids = message_ids
+
+
 @dataclass
 class WalterSQSClient:
 
-    client: SQSClient
+    MAX_BATCH_SIZE = 10
+    MAX_CONCURRENT_BATCHES = 4
+    MAX_BATCH_RETRIES = 3
+    BATCH_RETRY_BACKOFF_SECONDS = 0.1
+
+    # error codes of whole batch requests that are safe to retry
+    RETRYABLE_ERROR_CODES = {
+        "InternalError",
+        "RequestThrottled",
+        "ServiceUnavailable",
+        "ThrottlingException",
+    }
+
+    client: "SQSClient"
     domain: Domain
 
     def __post_init__(self) -> None:
@@ -34,6 +70,115 @@ class WalterSQSClient:
             )
             raise error
 
+    def send_messages(self, queue_url: str, messages: List[dict]) -> List[str]:
+        """
+        Send a list of messages to the queue in batches.
+
+        Messages are sent via SendMessageBatch in batches of ten, the SQS batch
+        limit, with up to `MAX_CONCURRENT_BATCHES` batches in flight at once.
+        Messages that fail within a batch due to a server-side fault, as well as
+        batches that are throttled or fail due to a server-side fault, are retried
+        with exponential backoff. All batches are sent before failures are
+        raised.
+
+        Args:
+            queue_url: The URL of the queue to send the messages.
+            messages: The messages to send to the queue.
+
+        Returns:
+            The message IDs of the messages sent to the queue.
+
+        Raises:
+            SendMessagesError: If any message was rejected or still failed after the retries.
+        """
+        log.debug(f"Sending {len(messages)} messages to queue '{queue_url}'")
+        if not messages:
+            return []
+
+        batches = []
+        for start in range(0, len(messages), WalterSQSClient.MAX_BATCH_SIZE):
+            end = start + WalterSQSClient.MAX_BATCH_SIZE
+            batches.append(messages[start:end])
+        max_workers = min(WalterSQSClient.MAX_CONCURRENT_BATCHES, len(batches))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(
+                executor.map(
+                    lambda batch: self._send_message_batch(queue_url, batch), batches
+                )
+            )
+
+        message_ids = [message_id for ids, _ in results for message_id in ids]
+        failed = [message for _, messages in results for message in messages]
+        if failed:
+            raise SendMessagesError(queue_url, failed, message_ids)
+        return message_ids
+
+    def _send_message_batch(
+        self, queue_url: str, messages: List[dict]
+    ) -> Tuple[List[str], List[dict]]:
+        """
+        Send a batch of at most ten messages to the queue.
+
+        Returns:
+            The message IDs of the messages sent and the messages that failed.
+        """
+        entries = {str(i): json.dumps(message) for i, message in enumerate(messages)}
+        message_ids, rejected = {}, []
+        for attempt in range(WalterSQSClient.MAX_BATCH_RETRIES + 1):
+            if attempt > 0:
+                time.sleep(WalterSQSClient.BATCH_RETRY_BACKOFF_SECONDS * 2**attempt)
+            try:
+                response = self.client.send_message_batch(
+                    QueueUrl=queue_url,
+                    Entries=[
+                        {"Id": entry_id, "MessageBody": body}
+                        for entry_id, body in entries.items()
+                    ],
+                )
+            except ClientError as error:
+                if (
+                    error.response["Error"]["Code"]
+                    in WalterSQSClient.RETRYABLE_ERROR_CODES
+                ):
+                    log.warning(
+                        f"Retryable error occurred publishing message batch to queue '{queue_url}'\n"
+                        f"Error: {error.response['Error']['Message']}"
+                    )
+                    continue
+                # the remaining entries of the batch are reported as failed
+                log.error(
+                    f"Unexpected error occurred publishing message batch to queue '{queue_url}'\n"
+                    f"Error: {error.response['Error']['Message']}"
+                )
+                break
+            for success in response.get("Successful", []):
+                message_ids[success["Id"]] = success["MessageId"]
+                entries.pop(success["Id"])
+            for failure in response.get("Failed", []):
+                # sender faults are not retryable as the entry itself is invalid
+                if failure["SenderFault"]:
+                    log.error(
+                        f"Message rejected by queue '{queue_url}': {failure['Message']}"
+                    )
+                    entries.pop(failure["Id"])
+                    rejected.append(failure["Id"])
+            if not entries:
+                break
+        if entries:
+            log.error(
+                f"Failed to publish {len(entries)} messages to queue '{queue_url}' "
+                f"after {WalterSQSClient.MAX_BATCH_RETRIES} retries!"
+            )
+        failed = set(entries) | set(rejected)
+        return (
+            [
+                message_ids[str(i)]
+                for i in range(len(messages))
+                if str(i) in message_ids
+            ],
+            [messages[i] for i in range(len(messages)) if str(i) in failed],
+        )
+
     def delete_event(self, queue_url: str, receipt_handle: str) -> None:
         log.debug(
             f"Deleting message with the following receipt handle from queue '{queue_url}': {receipt_handle}"
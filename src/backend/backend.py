@@ -1,22 +1,14 @@
-import json
-from datetime import datetime, timedelta
+from dataclasses import dataclass
+from datetime import datetime
 
 import markdown
 
-from src.clients import (
-    walter_cw,
-    newsletters_bucket,
-    walter_stocks_api,
-    walter_ses,
-    newsletters_queue,
-    template_engine,
-    templates_bucket,
-    walter_db,
-    walter_ai,
-    walter_event_parser,
-    walter_authenticator,
-)
+from src import clients
 from src.config import CONFIG
+from src.events.parser import CreateNewsletterAndSendEvent
+from src.newsletters.snapshot import get_market_data_window
+from src.stocks.models import MarketDataSnapshot
+from src.templates.models import TemplateAssets
 from src.utils.log import Logger
 
 log = Logger(__name__).get_logger()
@@ -26,81 +18,174 @@ log = Logger(__name__).get_logger()
 #############
 
 TEMPLATE_NAME = "default"
-END_DATE = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-START_DATE = END_DATE - timedelta(days=7)
+
+# the market data snapshot is reused across invocations of the same container
+# until the market data window moves on
+market_data_snapshot: MarketDataSnapshot | None = None
+
+
+@dataclass(frozen=True)
+class NewsletterBatchResources:
+    """
+    Newsletter Batch Resources
+
+    The resources shared by every newsletter created in a batch of records.
+    These are retrieved once per invocation rather than once per newsletter.
+    Compiled templates are cached by the templates engine across invocations.
+    """
+
+    start_date: datetime
+    end_date: datetime
+    assets: TemplateAssets | None
+    snapshot: MarketDataSnapshot | None
 
 
 def get_unsubscribe_link(email: str) -> str:
-    token = walter_authenticator.generate_user_token(email)
+    token = clients.walter_authenticator.generate_user_token(email)
     return "https://walterai.dev/unsubscribe?token=" + token
 
 
 def create_newsletter_and_send(event, context) -> dict:
+    """
+    Create and send a newsletter for each record in the SQS event.
+
+    Each record is processed independently. The message IDs of records that
+    failed are returned as a partial batch response, Lambda deletes the other
+    records from the queue so that only the failed records are retried.
+    """
     log.info(f"WalterBackend invoked! Using the following configurations:\n{CONFIG}")
 
-    # parse event from queue
-    event = walter_event_parser.parse_create_newsletter_and_send_event(event)
+    records = event["Records"]
+    log.info(f"Processing batch of {len(records)} newsletter requests")
 
-    try:
-        # get user and portfolio info from db
-        user = walter_db.get_user(event.email)
-        user_stocks = walter_db.get_stocks_for_user(user)
-        stocks = walter_db.get_stocks(list(user_stocks.keys()) if user_stocks else [])
-        portfolio = walter_stocks_api.get_portfolio(
-            user_stocks, stocks, START_DATE, END_DATE
-        )
+    resources = get_newsletter_batch_resources()
 
-        template_spec_args = {
-            "user": user.username,
-            "datestamp": END_DATE,
-            "portfolio_value": portfolio.get_total_equity(),
-            "stocks": portfolio.get_stock_equities(),
-            "news": portfolio.get_all_news(),
-            "unsubscribe_link": get_unsubscribe_link(event.email),
-        }
-
-        # get template spec with user inputs
-        template_spec = template_engine.get_template_spec(
-            template_name=TEMPLATE_NAME, template_spec_args=template_spec_args
+    failures = []
+    for record in records:
+        try:
+            request = (
+                clients.walter_event_parser.parse_create_newsletter_and_send_record(
+                    record
+                )
+            )
+            create_newsletter_and_send_request(request, resources)
+        except Exception as exception:
+            log.error(
+                f"Unexpected error occurred processing newsletter request '{record.get('messageId')}'!\n"
+                f"Error: {exception}"
+            )
+            failures.append({"itemIdentifier": record.get("messageId")})
+
+    log.info(
+        f"Processed {len(records) - len(failures)} of {len(records)} newsletter requests successfully"
+    )
+
+    # metrics are buffered per newsletter and flushed once per batch
+    if CONFIG.emit_metrics:
+        clients.walter_cw.flush()
+
+    return {"batchItemFailures": failures}
+
+
+def get_newsletter_batch_resources() -> NewsletterBatchResources:
+    start_date, end_date = get_market_data_window()
+    return NewsletterBatchResources(
+        start_date=start_date,
+        end_date=end_date,
+        assets=(
+            clients.templates_bucket.get_template_assets(TEMPLATE_NAME)
+            if CONFIG.send_newsletter
+            else None
+        ),
+        snapshot=get_market_data_snapshot(end_date),
+    )
+
+
+def get_market_data_snapshot(end_date: datetime) -> MarketDataSnapshot | None:
+    """
+    Get the market data snapshot of the newsletter window.
+
+    Newsletters fall back to fetching market data per user only if the snapshot
+    does not exist. Any other error reading the snapshot, e.g. access denied,
+    is raised so that it fails the batch rather than silently disabling the
+    snapshot.
+    """
+    global market_data_snapshot
+    if market_data_snapshot is None or market_data_snapshot.end_date != end_date:
+        market_data_snapshot = clients.newsletters_bucket.get_market_data_snapshot(
+            end_date
+        )
+    return market_data_snapshot
+
+
+def create_newsletter_and_send_request(
+    request: CreateNewsletterAndSendEvent, resources: NewsletterBatchResources
+) -> None:
+    # get user and portfolio info from db
+    user = clients.walter_db.get_user(request.email)
+    user_stocks = clients.walter_db.get_stocks_for_user(user)
+    stocks = clients.walter_db.get_stocks(
+        list(user_stocks.keys()) if user_stocks else []
+    )
+    portfolio = clients.walter_stocks_api.get_portfolio(
+        user_stocks,
+        stocks,
+        resources.start_date,
+        resources.end_date,
+        resources.snapshot,
+    )
+
+    template_spec_args = {
+        "user": user.username,
+        "datestamp": resources.end_date,
+        "portfolio_value": portfolio.get_total_equity(),
+        "stocks": portfolio.get_stock_equities(),
+        "news": portfolio.get_all_news(),
+        "unsubscribe_link": get_unsubscribe_link(request.email),
+    }
+
+    # get template spec with user inputs
+    template_spec = clients.template_engine.get_template_spec(
+        TEMPLATE_NAME, template_spec_args
+    )
+
+    # get template args from the template spec
+    template_args = template_spec.get_template_args()
+
+    # if bedrock is enabled populate the prompts with responses and add to template args
+    if CONFIG.generate_responses:
+        # retrieve the top news passages per stock rather than every news description
+        context = template_spec.get_context(
+            clients.context_generator.get_news_context(portfolio)
+        )
+        prompt = template_spec.get_prompts().pop()
+        response = clients.walter_ai.generate_response(
+            context=context, prompt=prompt.prompt, max_gen_len=prompt.max_gen_length
         )
+        template_args[prompt.name] = markdown.markdown(response)
+    else:
+        log.info("Not generating responses...")
 
-        # get template args from the template spec
-        template_args = template_spec.get_template_args()
+    newsletter = clients.template_engine.get_template(TEMPLATE_NAME, template_args)
 
-        # if bedrock is enabled populate the prompts with responses and add to template args
-        if CONFIG.generate_responses:
-            context = template_spec.get_context()
-            prompt = template_spec.get_prompts().pop()
-            response = walter_ai.generate_response(
-                context=context, prompt=prompt.prompt, max_gen_len=prompt.max_gen_length
-            )
-            template_args[prompt.name] = markdown.markdown(response)
-        else:
-            log.info("Not generating responses...")
-
-        newsletter = template_engine.get_template(TEMPLATE_NAME, template_args)
-
-        if CONFIG.send_newsletter:
-            assets = templates_bucket.get_template_assets()
-            walter_ses.send_email(user.email, newsletter, "Walter", assets)
-            newsletters_bucket.put_newsletter(user, "default", newsletter)
-        else:
-            log.info("Not sending newsletter...")
-
-        if CONFIG.dump_newsletter:
-            log.info("Dumping newsletter")
-            open("./newsletter.html", "w").write(newsletter)
-        else:
-            log.info("Not dumping newsletter...")
-
-        if CONFIG.emit_metrics:
-            walter_cw.emit_metric("WalterBackend.NumberOfEmailsSent", 1)
-            walter_cw.emit_metric("WalterBackend.NumberOfStocksAnalyzed", len(stocks))
-        else:
-            log.info("Not emitting metrics")
-
-    except Exception:
-        newsletters_queue.delete_newsletter_request(event.receipt_handle)
-    newsletters_queue.delete_newsletter_request(event.receipt_handle)
-
-    return {"statusCode": 200, "body": json.dumps("WalterBackend")}
+    if CONFIG.send_newsletter:
+        clients.walter_ses.send_email(
+            user.email, newsletter, "Walter", resources.assets
+        )
+        clients.newsletters_bucket.put_newsletter(user, "default", newsletter)
+    else:
+        log.info("Not sending newsletter...")
+
+    if CONFIG.dump_newsletter:
+        log.info("Dumping newsletter")
+        open("./newsletter.html", "w").write(newsletter)
+    else:
+        log.info("Not dumping newsletter...")
+
+    if CONFIG.emit_metrics:
+        clients.walter_cw.emit_metric("WalterBackend.NumberOfEmailsSent", 1)
+        clients.walter_cw.emit_metric(
+            "WalterBackend.NumberOfStocksAnalyzed", len(stocks)
+        )
+    else:
+        log.info("Not emitting metrics")
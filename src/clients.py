@@ -1,34 +1,41 @@
+"""
+Walter Clients
+
+Clients are created lazily on first access, e.g. `clients.walter_db`, and
+reused for the life of the Lambda container. Each entrypoint only pays for the
+clients and secrets it actually touches during its cold start. Client modules
+and their third-party dependencies are imported inside each factory so that
+importing this module is cheap.
+"""
+
+import functools
 import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List
 
-import boto3
-
-from src.ai.client import WalterAI
-from src.ai.context.generator import ContextGenerator
-from src.auth.authenticator import WalterAuthenticator
-from src.aws.bedrock.client import WalterBedrockClient
-from src.aws.cloudwatch.client import WalterCloudWatchClient
-from src.aws.dynamodb.client import WalterDDBClient
-from src.aws.s3.client import WalterS3Client
-from src.aws.secretsmanager.client import WalterSecretsManagerClient
-from src.aws.ses.client import WalterSESClient
-from src.aws.sqs.client import WalterSQSClient
-from src.config import CONFIG
-from src.database.client import WalterDB
 from src.environment import get_domain
-from src.events.parser import WalterEventParser
-from src.knowledge.base import WalterKnowledgeBase
-from src.newsletters.client import NewslettersBucket
-from src.newsletters.queue import NewslettersQueue
-from src.stocks.alphavantage.client import AlphaVantageClient
-from src.stocks.client import WalterStocksAPI
-from src.stocks.polygon.client import PolygonClient
-from src.templates.bucket import TemplatesBucket
-from src.templates.engine import TemplatesEngine
 from src.utils.log import Logger
 
-log = Logger(__name__).get_logger()
+if TYPE_CHECKING:
+    from src.ai.client import WalterAI
+    from src.ai.context.generator import ContextGenerator
+    from src.auth.authenticator import WalterAuthenticator
+    from src.aws.cloudwatch.client import WalterCloudWatchClient
+    from src.aws.s3.client import WalterS3Client
+    from src.aws.secretsmanager.client import WalterSecretsManagerClient
+    from src.aws.ses.client import WalterSESClient
+    from src.database.client import WalterDB
+    from src.events.parser import WalterEventParser
+    from src.knowledge.base import WalterKnowledgeBase
+    from src.knowledge.queue import IngestNewsQueue
+    from src.newsletters.client import NewslettersBucket
+    from src.newsletters.queue import NewslettersQueue
+    from src.stocks.client import WalterStocksAPI
+    from src.templates.bucket import TemplatesBucket
+    from src.templates.engine import TemplatesEngine
 
-log.debug("Initializing clients...")
+log = Logger(__name__).get_logger()
 
 #########################
 # ENVIRONMENT VARIABLES #
@@ -40,103 +47,339 @@ AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
 DOMAIN = get_domain(os.getenv("DOMAIN", "DEVELOPMENT"))
 """(str): The domain of the WalterBackend service environment."""
 
+#############
+# FACTORIES #
+#############
+
+_factories: Dict[str, Callable[[], Any]] = {}
+"""(Dict[str, Callable]): The factory of each lazily created client keyed by client name."""
+
+_initialization_durations: Dict[str, float] = {}
+"""(Dict[str, float]): The time in milliseconds spent creating each initialized client, excluding the clients it depends on."""
+
+_dependency_durations: List[float] = []
+"""(List[float]): The time in milliseconds spent creating the dependencies of each client being created."""
+
+_lock = threading.RLock()
+
+
+def client(name: str) -> Callable[[Callable[[], Any]], Callable[[], Any]]:
+    """
+    Register the decorated function as the factory of the given lazily created client.
+    """
+
+    def register(factory: Callable[[], Any]) -> Callable[[], Any]:
+        _factories[name] = factory
+        return factory
+
+    return register
+
+
+def __getattr__(name: str) -> Any:
+    return get_client(name)
+
+
+def get_client(name: str) -> Any:
+    """
+    Create the given client on first access and cache it as a module attribute.
+
+    Module attributes are looked up before the module `__getattr__` hook, so once
+    a client is created subsequent accesses do not pay for the lock or the factory.
+    """
+    factory = _factories.get(name)
+    if factory is None:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    with _lock:
+        if name not in globals():
+            # factories create the clients they depend on, whose time is only
+            # attributed to the dependencies so that durations are not counted twice
+            _dependency_durations.append(0.0)
+            start = time.perf_counter()
+            try:
+                globals()[name] = factory()
+            finally:
+                dependencies = _dependency_durations.pop()
+            duration = (time.perf_counter() - start) * 1000
+            _initialization_durations[name] = duration - dependencies
+            if _dependency_durations:
+                _dependency_durations[-1] += duration
+            log.debug(
+                f"Initialized '{name}' client in {_initialization_durations[name]:.2f}ms"
+            )
+    return globals()[name]
+
+
+def prefetch_secrets(*secret_ids: List[str]) -> Callable:
+    """
+    Declare the secrets required by the decorated entrypoint.
+
+    Before each invocation the declared secrets that are not cached or have
+    expired are fetched in a single batch, so a cold start pays for one round
+    trip to Secrets Manager rather than one per secret.
+
+    Args:
+        secret_ids: The lists of secret IDs required by the entrypoint.
+    """
+    required = [secret_id for ids in secret_ids for secret_id in ids]
+
+    def decorator(entrypoint: Callable[[dict, dict], dict]) -> Callable:
+        @functools.wraps(entrypoint)
+        def wrapper(event, context) -> dict:
+            get_client("walter_sm").prefetch(required)
+            return entrypoint(event, context)
+
+        return wrapper
+
+    return decorator
+
+
+def get_initialization_durations() -> Dict[str, float]:
+    """
+    Get the time in milliseconds spent creating each client initialized so far.
+
+    The time of each client excludes the time spent creating the clients it
+    depends on, so the durations add up to the total initialization time.
+    """
+    return dict(_initialization_durations)
+
+
 #######################
 # WALTER EVENT PARSER #
 #######################
 
-walter_event_parser = WalterEventParser()
+
+@client("walter_event_parser")
+def _walter_event_parser() -> "WalterEventParser":
+    from src.events.parser import WalterEventParser
+
+    return WalterEventParser()
 
 
 ########################
 # WALTER BOTO3 CLIENTS #
 ########################
 
-walter_cw = WalterCloudWatchClient(
-    client=boto3.client("cloudwatch", region_name=AWS_REGION), domain=DOMAIN
-)
-walter_ses = WalterSESClient(
-    client=boto3.client("ses", region_name=AWS_REGION), domain=DOMAIN
-)
+
+@client("walter_cw")
+def _walter_cw() -> "WalterCloudWatchClient":
+    import boto3
+    from src.aws.cloudwatch.client import MetricsMode, WalterCloudWatchClient
+    from src.config import CONFIG
+
+    return WalterCloudWatchClient(
+        client=boto3.client("cloudwatch", region_name=AWS_REGION),
+        domain=DOMAIN,
+        mode=MetricsMode(CONFIG.metrics_mode),
+    )
+
+
+@client("walter_ses")
+def _walter_ses() -> "WalterSESClient":
+    import boto3
+    from src.aws.ses.client import WalterSESClient
+
+    return WalterSESClient(
+        client=boto3.client("ses", region_name=AWS_REGION), domain=DOMAIN
+    )
+
 
 ###########
 # BUCKETS #
 ###########
 
-s3 = WalterS3Client(client=boto3.client("s3", region_name=AWS_REGION), domain=DOMAIN)
 
-templates_bucket = TemplatesBucket(s3, DOMAIN)
-newsletters_bucket = NewslettersBucket(s3, DOMAIN)
-knowledge_base = WalterKnowledgeBase(s3)
+@client("s3")
+def _s3() -> "WalterS3Client":
+    import boto3
+    from botocore.config import Config
+    from src.aws.s3.client import WalterS3Client
+
+    # size the connection pool for the concurrent requests of bulk puts
+    return WalterS3Client(
+        client=boto3.client(
+            "s3",
+            region_name=AWS_REGION,
+            config=Config(
+                max_pool_connections=WalterS3Client.DEFAULT_MAX_CONCURRENT_REQUESTS
+            ),
+        ),
+        domain=DOMAIN,
+    )
+
+
+@client("templates_bucket")
+def _templates_bucket() -> "TemplatesBucket":
+    from src.templates.bucket import TemplatesBucket
+
+    return TemplatesBucket(get_client("s3"), DOMAIN)
+
+
+@client("newsletters_bucket")
+def _newsletters_bucket() -> "NewslettersBucket":
+    from src.newsletters.client import NewslettersBucket
+
+    return NewslettersBucket(get_client("s3"), DOMAIN)
+
+
+@client("knowledge_base")
+def _knowledge_base() -> "WalterKnowledgeBase":
+    from src.config import CONFIG
+    from src.knowledge.base import WalterKnowledgeBase
+
+    return WalterKnowledgeBase(get_client("s3"), packed=CONFIG.pack_news)
+
 
 ###########
 # SECRETS #
 ###########
 
-walter_sm = WalterSecretsManagerClient(
-    client=boto3.client("secretsmanager", region_name=AWS_REGION), domain=DOMAIN
-)
 
-ALPHA_VANTAGE_API_KEY = walter_sm.get_alpha_vantage_api_key()
-POLYGON_API_KEY = walter_sm.get_polygon_api_key()
-JWT_TOKEN_KEY = walter_sm.get_jwt_secret_key()
+@client("walter_sm")
+def _walter_sm() -> "WalterSecretsManagerClient":
+    import boto3
+    from src.aws.secretsmanager.client import WalterSecretsManagerClient
+
+    # secrets are fetched by the client on first use
+    return WalterSecretsManagerClient(
+        client=boto3.client("secretsmanager", region_name=AWS_REGION), domain=DOMAIN
+    )
+
 
 ########################
 # WALTER AUTHENTICATOR #
 ########################
 
-walter_authenticator = WalterAuthenticator(walter_sm=walter_sm)
+
+@client("walter_authenticator")
+def _walter_authenticator() -> "WalterAuthenticator":
+    from src.auth.authenticator import WalterAuthenticator
+
+    return WalterAuthenticator(walter_sm=get_client("walter_sm"))
+
 
 #####################
 # NEWSLETTERS QUEUE #
 #####################
 
-newsletters_queue = NewslettersQueue(
-    client=WalterSQSClient(
-        client=boto3.client("sqs", region_name=AWS_REGION), domain=DOMAIN
+
+@client("newsletters_queue")
+def _newsletters_queue() -> "NewslettersQueue":
+    import boto3
+    from src.aws.sqs.client import WalterSQSClient
+    from src.newsletters.queue import NewslettersQueue
+
+    return NewslettersQueue(
+        client=WalterSQSClient(
+            client=boto3.client("sqs", region_name=AWS_REGION), domain=DOMAIN
+        )
     )
-)
+
+
+#####################
+# INGEST NEWS QUEUE #
+#####################
+
+
+@client("ingest_news_queue")
+def _ingest_news_queue() -> "IngestNewsQueue":
+    import boto3
+    from src.aws.sqs.client import WalterSQSClient
+    from src.knowledge.queue import IngestNewsQueue
+
+    return IngestNewsQueue(
+        client=WalterSQSClient(
+            client=boto3.client("sqs", region_name=AWS_REGION), domain=DOMAIN
+        )
+    )
+
 
 #############
 # WALTER DB #
 #############
 
-walter_db = WalterDB(
-    ddb=WalterDDBClient(client=boto3.client("dynamodb", region_name=AWS_REGION)),
-    authenticator=walter_authenticator,
-    domain=DOMAIN,
-)
+
+@client("walter_db")
+def _walter_db() -> "WalterDB":
+    import boto3
+    from src.aws.dynamodb.client import WalterDDBClient
+    from src.config import CONFIG
+    from src.database.client import WalterDB
+
+    return WalterDB(
+        ddb=WalterDDBClient(client=boto3.client("dynamodb", region_name=AWS_REGION)),
+        authenticator=get_client("walter_authenticator"),
+        domain=DOMAIN,
+        user_cache_ttl_seconds=CONFIG.user_cache_ttl_seconds,
+    )
+
 
 #####################
 # WALTER STOCKS API #
 #####################
 
-walter_stocks_api = WalterStocksAPI(
-    polygon=PolygonClient(
-        api_key=POLYGON_API_KEY,
-    ),
-    alpha_vantage=AlphaVantageClient(api_key=ALPHA_VANTAGE_API_KEY),
-)
+
+@client("walter_stocks_api")
+def _walter_stocks_api() -> "WalterStocksAPI":
+    from src.stocks.alphavantage.client import AlphaVantageClient
+    from src.stocks.cache.backends import InMemoryBackend
+    from src.stocks.cache.client import MarketDataCache
+    from src.stocks.client import WalterStocksAPI
+    from src.stocks.polygon.client import PolygonClient
+
+    walter_sm = get_client("walter_sm")
+    return WalterStocksAPI(
+        # api keys are read from the secrets cache on use to pick up rotated keys
+        polygon=PolygonClient(get_api_key=walter_sm.get_polygon_api_key),
+        alpha_vantage=AlphaVantageClient(
+            get_api_key=walter_sm.get_alpha_vantage_api_key
+        ),
+        cache=MarketDataCache(backend=InMemoryBackend()),
+    )
+
 
 #########################
 # JINJA TEMPLATE ENGINE #
 #########################
 
-template_engine = TemplatesEngine(templates_bucket=templates_bucket)
+
+@client("template_engine")
+def _template_engine() -> "TemplatesEngine":
+    from src.templates.engine import TemplatesEngine
+
+    return TemplatesEngine(templates_bucket=get_client("templates_bucket"))
+
 
 #############
 # WALTER AI #
 #############
 
-walter_ai = WalterAI(
-    model=CONFIG.model_id,
-    client=WalterBedrockClient(
-        bedrock=boto3.client("bedrock", region_name=AWS_REGION),
-        bedrock_runtime=boto3.client("bedrock-runtime", region_name=AWS_REGION),
-    ),
-)
+
+@client("walter_ai")
+def _walter_ai() -> "WalterAI":
+    import boto3
+    from src.ai.client import WalterAI
+    from src.aws.bedrock.client import WalterBedrockClient
+    from src.config import CONFIG
+
+    return WalterAI(
+        model=CONFIG.model_id,
+        client=WalterBedrockClient(
+            bedrock=boto3.client("bedrock", region_name=AWS_REGION),
+            bedrock_runtime=boto3.client("bedrock-runtime", region_name=AWS_REGION),
+        ),
+    )
+
 
 #####################
 # CONTEXT GENERATOR #
 #####################
 
-context_generator = ContextGenerator()
+
+@client("context_generator")
+def _context_generator() -> "ContextGenerator":
+    from src.ai.context.generator import ContextGenerator
+    from src.config import CONFIG
+
+    return ContextGenerator(
+        knowledge_base=get_client("knowledge_base"), top_k=CONFIG.news_context_top_k
+    )
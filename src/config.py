@@ -20,6 +20,14 @@ class WalterConfig:
     send_newsletter: bool = False
     dump_newsletter: bool = False
     emit_metrics: bool = False
+    metrics_mode: str = "api"
+    trace_downstream_calls: bool = False
+    user_cache_ttl_seconds: float = 0
+    password_hash_scheme: str = "bcrypt"
+    password_hash_cost: int = 12
+    pack_news: bool = False
+    ingest_news_shards: int = 16
+    news_context_top_k: int = 3
     jwt_algorithm: str = "HS256"
 
     def __str__(self) -> str:
@@ -33,6 +41,14 @@ class WalterConfig:
                 "send_newsletter": self.send_newsletter,
                 "dump_newsletter": self.dump_newsletter,
                 "emit_metrics": self.emit_metrics,
+                "metrics_mode": self.metrics_mode,
+                "trace_downstream_calls": self.trace_downstream_calls,
+                "user_cache_ttl_seconds": self.user_cache_ttl_seconds,
+                "password_hash_scheme": self.password_hash_scheme,
+                "password_hash_cost": self.password_hash_cost,
+                "pack_news": self.pack_news,
+                "ingest_news_shards": self.ingest_news_shards,
+                "news_context_top_k": self.news_context_top_k,
                 "jwt_algorithm": self.jwt_algorithm,
             },
             indent=4,
@@ -52,6 +68,26 @@ def get_walter_config() -> WalterConfig:
             send_newsletter=config["send_newsletter"],
             dump_newsletter=config["dump_newsletter"],
             emit_metrics=config["emit_metrics"],
+            metrics_mode=config.get("metrics_mode", WalterConfig.metrics_mode),
+            trace_downstream_calls=config.get(
+                "trace_downstream_calls", WalterConfig.trace_downstream_calls
+            ),
+            user_cache_ttl_seconds=config.get(
+                "user_cache_ttl_seconds", WalterConfig.user_cache_ttl_seconds
+            ),
+            password_hash_scheme=config.get(
+                "password_hash_scheme", WalterConfig.password_hash_scheme
+            ),
+            password_hash_cost=config.get(
+                "password_hash_cost", WalterConfig.password_hash_cost
+            ),
+            pack_news=config.get("pack_news", WalterConfig.pack_news),
+            ingest_news_shards=config.get(
+                "ingest_news_shards", WalterConfig.ingest_news_shards
+            ),
+            news_context_top_k=config.get(
+                "news_context_top_k", WalterConfig.news_context_top_k
+            ),
             jwt_algorithm=config["jwt_algorithm"],
         )
     except Exception as exception:
@@ -1,6 +1,8 @@
 import datetime as dt
-from dataclasses import dataclass
-from typing import Dict, List
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Dict, Iterator, List, Set
 
 from src.auth.authenticator import WalterAuthenticator
 from src.aws.dynamodb.client import WalterDDBClient
@@ -16,54 +18,124 @@ from src.utils.log import Logger
 log = Logger(__name__).get_logger()
 
 
+@dataclass
+class CachedUser:
+    """
+    Cached User
+
+    A user read from or written to the users table and when.
+    """
+
+    user: User
+    fetched_at: float
+
+
 @dataclass
 class WalterDB:
+    """
+    WalterDB
+
+    Users read by email are optionally cached in memory for the life of the
+    Lambda container. Cached users are served for `user_cache_ttl_seconds`
+    after they are read or written. Users written through this client replace
+    their cached copy and deleted users are evicted. Writes made by other
+    containers are only seen once the cached user expires, so the TTL bounds
+    how stale a user can be. The cache is disabled when the TTL is zero.
+    """
+
+    USER_CACHE_MAX_SIZE = 1024
 
     ddb: WalterDDBClient
     authenticator: WalterAuthenticator
     domain: Domain
 
+    user_cache_ttl_seconds: float = 0
+
     users_table: UsersTable = None
     stocks_table: StocksTable = None
     users_stocks_table: UsersStocksTable = None
+    cached_users: Dict[str, CachedUser] = None  # set during post init
 
     def __post_init__(self) -> None:
         self.users_table = UsersTable(self.ddb, self.domain)
         self.stocks_table = StocksTable(self.ddb, self.domain)
         self.users_stocks_table = UsersStocksTable(self.ddb, self.domain)
+        self.cached_users = {}
+        self._users_lock = threading.Lock()
 
     def create_user(self, email: str, username: str, password: str) -> None:
         # generate salt and hash the given password to store in users table
-        salt, password_hash = self.authenticator.hash_password(password)
+        password_hash = self.authenticator.hash_password(password)
         user = User(
             email=email,
             username=username,
-            password_hash=password_hash.decode(),
+            password_hash=password_hash,
             sign_up_date=dt.datetime.now(dt.UTC),
             last_active_date=dt.datetime.now(dt.UTC),
         )
         self.users_table.create_user(user)
+        self._invalidate_user(email)
+
+    def get_user(self, email: str, use_cache: bool = True) -> User | None:
+        """
+        Get user by email from WalterDB, return None if not found.
+
+        If the user cache is enabled, users are read through the cache. A copy
+        of the cached user is returned so callers can modify it freely. Callers
+        that check credentials should not use the cache, as a cached user may
+        have a stale password hash or may have been deleted by another container.
+
+        Args:
+            email: The email of the user.
+            use_cache: Whether the user can be read from the cache.
+
+        Returns:
+            The user from WalterDB or None if not found.
+        """
+        if self.user_cache_ttl_seconds <= 0 or not use_cache:
+            return self.users_table.get_user(email)
+
+        with self._users_lock:
+            cached = self.cached_users.get(email)
+            if (
+                cached is not None
+                and time.monotonic() - cached.fetched_at < self.user_cache_ttl_seconds
+            ):
+                log.debug(f"Using cached user '{email}'")
+                return replace(cached.user)
+
+        user = self.users_table.get_user(email)
+        if user is not None:
+            self._put_user(user)
+        return user
+
+    def get_users(self, segments: int = 1) -> Iterator[User]:
+        """
+        Get all users from WalterDB.
 
-    def get_user(self, email: str) -> User:
-        return self.users_table.get_user(email)
+        Args:
+            segments: The number of segments to scan the users table with in parallel.
 
-    def get_users(self) -> List[User]:
-        return self.users_table.get_users()
+        Returns:
+            An iterator over all users stored in WalterDB.
+        """
+        return self.users_table.get_users(segments)
 
     def update_user(self, user: User) -> None:
-        self.users_table.update_user(user)
+        self._update_user(user)
 
     def update_user_password(self, email: str, password_hash: str) -> None:
         user = self.users_table.get_user(email)
-        user.password_hash = password_hash.decode()
-        self.users_table.update_user(user)
+        user.password_hash = password_hash
+        self._update_user(user)
 
     def verify_user(self, user: User) -> None:
         user.verified = True
-        self.users_table.update_user(user)
+        self._update_user(user)
 
     def delete_user(self, email: str) -> None:
         self.users_table.delete_user(email)
+        self._invalidate_user(email)
 
     def get_stock(self, symbol: str) -> Stock | None:
         """
@@ -80,23 +152,73 @@ class WalterDB:
     def add_stock(self, stock: Stock) -> None:
         self.stocks_table.put_stock(stock)
 
-    def get_all_stocks(self) -> List[Stock]:
+    def get_all_stocks(self, segments: int = 1) -> Iterator[Stock]:
         """
         Get all stocks from WalterDB.
 
+        Args:
+            segments: The number of segments to scan the stocks table with in parallel.
+
         Returns:
-            The list of all stocks stored in WalterDB.
+            An iterator over all stocks stored in WalterDB.
         """
-        return self.stocks_table.get_stocks()
+        return self.stocks_table.get_stocks(segments)
 
     def get_stocks(self, symbols: List[str]) -> Dict[str, Stock]:
-        stocks = [self.get_stock(symbol) for symbol in symbols]
+        """
+        Get stocks by symbol from WalterDB in a batch.
+
+        Args:
+            symbols: The stock ticker symbols.
+
+        Returns:
+            The stocks found in WalterDB indexed by symbol in the order of the given symbols.
+        """
+        stocks = self.stocks_table.batch_get_stocks(symbols)
         return {stock.symbol: stock for stock in stocks}
 
     def get_stocks_for_user(self, user: User) -> Dict[str, UserStock]:
         stocks = self.users_stocks_table.get_stocks_for_user(user)
         return {stock.stock_symbol: stock for stock in stocks}
 
+    def get_held_stock_symbols(self, segments: int = 1) -> Set[str]:
+        """
+        Get the distinct symbols of the stocks owned by any user.
+
+        Args:
+            segments: The number of segments to scan the users stocks table with in parallel.
+
+        Returns:
+            The distinct stock symbols held across all user portfolios.
+        """
+        return set(self.users_stocks_table.get_stock_symbols(segments))
+
+    def _update_user(self, user: User) -> None:
+        # the cached user is only replaced once the write is confirmed, otherwise
+        # the stored user is unknown and the cached user is evicted
+        if self.users_table.update_user(user):
+            self._put_user(user)
+        else:
+            self._invalidate_user(user.email)
+
+    def _put_user(self, user: User) -> None:
+        if self.user_cache_ttl_seconds <= 0:
+            return
+        with self._users_lock:
+            # evict the oldest cached user once the cache is full
+            if (
+                user.email not in self.cached_users
+                and len(self.cached_users) >= WalterDB.USER_CACHE_MAX_SIZE
+            ):
+                del self.cached_users[next(iter(self.cached_users))]
+            self.cached_users[user.email] = CachedUser(
+                user=replace(user), fetched_at=time.monotonic()
+            )
+
+    def _invalidate_user(self, email: str) -> None:
+        with self._users_lock:
+            self.cached_users.pop(email, None)
+
     def add_stock_to_user_portfolio(self, stock: UserStock) -> None:
         self.users_stocks_table.add_stocks_to_user_portfolio(stock)
 
@@ -1,11 +1,10 @@
-import json
 from dataclasses import dataclass
-from typing import List
+from typing import Iterator, List
 
 from src.aws.dynamodb.client import WalterDDBClient
 from src.database.stocks.models import Stock
 from src.environment import Domain
-from src.utils.log import Logger
+from src.utils.log import Logger, Payload
 
 log = Logger(__name__).get_logger()
 
@@ -49,21 +48,46 @@ class StocksTable:
         item = self.ddb.get_item(self.table, key)
         return StocksTable._get_stock_from_ddb_item(item) if item is not None else None
 
-    def get_stocks(self) -> List[Stock]:
+    def batch_get_stocks(self, symbols: List[str]) -> List[Stock]:
+        """
+        Gets a batch of Stocks from the Stocks table.
+
+        Args:
+            symbols: The symbols of the Stocks to get from the Stocks table.
+
+        Returns:
+            The Stock objects that exist in the Stocks table in the order of
+            the given symbols.
+        """
+        log.info(f"Getting {len(symbols)} stocks from table '{self.table}'")
+        unique_symbols = list(dict.fromkeys(symbols))
+        items = self.ddb.batch_get_items(
+            self.table,
+            [StocksTable._get_stock_key(symbol) for symbol in unique_symbols],
+        )
+        stocks = {
+            stock.symbol: stock
+            for stock in [StocksTable._get_stock_from_ddb_item(item) for item in items]
+        }
+        return [stocks[symbol] for symbol in unique_symbols if symbol in stocks]
+
+    def get_stocks(self, segments: int = 1) -> Iterator[Stock]:
         """
         Lists all stocks in the `Stocks` table.
 
         This is an expensive operation as it simply scans the entire table.
-        Use this method with caution.
+        Use this method with caution. Stocks are yielded as the scan pages
+        are returned rather than loaded into memory all at once.
+
+        Args:
+            segments: The number of segments to scan the table with in parallel.
 
         Returns:
-            The list of all stocks included in the `Stocks` table.
+            An iterator over all stocks included in the `Stocks` table.
         """
         log.info(f"Listing all stocks in table '{self.table}'")
-        return [
-            StocksTable._get_stock_from_ddb_item(item)
-            for item in self.ddb.scan_table(self.table)
-        ]
+        for item in self.ddb.scan_table(self.table, total_segments=segments):
+            yield StocksTable._get_stock_from_ddb_item(item)
 
     def put_stock(self, stock: Stock) -> None:
         """
@@ -76,7 +100,7 @@ class StocksTable:
             None.
         """
         log.info(
-            f"Putting stock to table '{self.table}':\n{json.dumps(stock.to_dict(), indent=4)}"
+            "Putting stock to table '%s': %s", self.table, Payload(stock.to_dict())
         )
         self.ddb.put_item(self.table, stock.to_ddb_item())
 
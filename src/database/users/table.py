@@ -1,6 +1,6 @@
 import datetime as dt
 from dataclasses import dataclass
-from typing import List
+from typing import Iterator
 
 from src.aws.dynamodb.client import WalterDDBClient
 from src.database.users.models import User
@@ -27,12 +27,11 @@ class UsersTable:
         self.table = UsersTable._get_table_name(self.domain)
         log.debug(f"Creating UsersTable DDB client with table name '{self.table}'")
 
-    def create_user(self, user: User) -> None:
-        log.info(
-            f"Creating the following user and adding to table '{self.table}':\n{user}"
-        )
+    def create_user(self, user: User) -> bool:
+        # only the email is logged as the user includes the password hash
+        log.debug(f"Creating user with email '{user.email}' in table '{self.table}'")
         item = user.to_ddb_item()
-        self.ddb.put_item(self.table, item)
+        return self.ddb.put_item(self.table, item)
 
     def get_user(self, email: str) -> User | None:
         log.info(f"Getting user with email '{email}' from table '{self.table}'")
@@ -42,20 +41,18 @@ class UsersTable:
             return None
         return UsersTable._get_user_from_ddb_item(item)
 
-    def update_user(self, user: User) -> None:
+    def update_user(self, user: User) -> bool:
         log.info(f"Updating user with email '{user.email}'")
-        self.ddb.put_item(self.table, user.to_ddb_item())
+        return self.ddb.put_item(self.table, user.to_ddb_item())
 
     def delete_user(self, email: str) -> None:
         log.info(f"Deleting user with email '{email}'")
         self.ddb.delete_item(self.table, UsersTable._get_user_key(email))
 
-    def get_users(self) -> List[User]:
+    def get_users(self, segments: int = 1) -> Iterator[User]:
         log.info(f"Getting users from table '{self.table}'")
-        users = []
-        for item in self.ddb.scan_table(self.table):
-            users.append(UsersTable._get_user_from_ddb_item(item))
-        return users
+        for item in self.ddb.scan_table(self.table, total_segments=segments):
+            yield UsersTable._get_user_from_ddb_item(item)
 
     @staticmethod
     def _get_table_name(domain: Domain) -> str:
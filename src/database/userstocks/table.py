@@ -1,12 +1,11 @@
-import json
 from dataclasses import dataclass
-from typing import List
+from typing import Iterator, List
 
 from src.aws.dynamodb.client import WalterDDBClient
 from src.database.users.models import User
 from src.database.userstocks.models import UserStock
 from src.environment import Domain
-from src.utils.log import Logger
+from src.utils.log import Logger, Payload
 
 log = Logger(__name__).get_logger()
 
@@ -26,6 +25,8 @@ class UsersStocksTable:
     """
 
     TABLE_NAME_FORMAT = "UsersStocks-{domain}"
+    USER_STOCKS_KEY_CONDITION_EXPRESSION = "user_email = :user_email"
+    QUERY_PAGE_SIZE = 100
 
     ddb: WalterDDBClient
     domain: Domain
@@ -46,14 +47,12 @@ class UsersStocksTable:
         Returns:
             None.
         """
-        log.info(
-            f"Adding stock to user portfolio:\n{json.dumps(stock.to_dict(), indent=4)}"
-        )
+        log.info("Adding stock to user portfolio: %s", Payload(stock.to_dict()))
         self.ddb.put_item(self.table, stock.to_ddb_item())
         log.info("Added stock to user portfolio!")
 
     def delete_stock_from_user_portfolio(self, stock: UserStock) -> None:
-        log.info(f"Deleting stock from user portfolio:\n{stock}")
+        log.info("Deleting stock from user portfolio: %s", Payload(stock.to_dict()))
         self.ddb.delete_item(
             self.table, UsersStocksTable._get_user_stocks_primary_key(stock)
         )
@@ -72,12 +71,35 @@ class UsersStocksTable:
         log.info(f"Getting stocks for user '{user.email}' from table '{self.table}'")
         stocks = []
         for item in self.ddb.query(
-            self.table, UsersStocksTable._get_user_stocks_query_key(user.email)
+            self.table,
+            UsersStocksTable.USER_STOCKS_KEY_CONDITION_EXPRESSION,
+            UsersStocksTable._get_user_stocks_expression_attribute_values(user.email),
+            page_size=UsersStocksTable.QUERY_PAGE_SIZE,
         ):
             stocks.append(UsersStocksTable._get_user_stock_from_ddb_item(item))
         log.info(f"Returned {len(stocks)} stocks for user '{user.email}'")
         return stocks
 
+    def get_stock_symbols(self, segments: int = 1) -> Iterator[str]:
+        """
+        Get the symbols of the stocks owned by all users.
+
+        This is an expensive operation as it scans the entire table, only
+        the stock symbol attribute is read for each item. Symbols are
+        yielded once per user that owns the stock.
+
+        Args:
+            segments: The number of segments to scan the table with in parallel.
+
+        Returns:
+            An iterator over the symbols of the stocks owned by all users.
+        """
+        log.info(f"Getting stock symbols for all users from table '{self.table}'")
+        for item in self.ddb.scan_table(
+            self.table, projection_expression="stock_symbol", total_segments=segments
+        ):
+            yield item["stock_symbol"]["S"]
+
     @staticmethod
     def _get_table_name(domain: Domain) -> str:
         return UsersStocksTable.TABLE_NAME_FORMAT.format(domain=domain.value)
@@ -90,13 +112,8 @@ class UsersStocksTable:
         }
 
     @staticmethod
-    def _get_user_stocks_query_key(user_email: str) -> dict:
-        return {
-            "user_email": {
-                "AttributeValueList": [{"S": user_email}],
-                "ComparisonOperator": "EQ",
-            }
-        }
+    def _get_user_stocks_expression_attribute_values(user_email: str) -> dict:
+        return {":user_email": {"S": user_email}}
 
     @staticmethod
     def _get_user_stock_from_ddb_item(item: dict) -> UserStock:
@@ -1,11 +1,26 @@
+import datetime as dt
 import json
 from dataclasses import dataclass
+from typing import List
 
-from src.utils.log import Logger
+from src.utils.log import Logger, Payload
 
 log = Logger(__name__).get_logger()
 
 
+def parse_utc_datetime(timestamp: str) -> dt.datetime:
+    """
+    Parse the given ISO 8601 timestamp as a UTC datetime.
+
+    Timestamps without an offset are assumed to be in UTC so that they can be
+    compared with the timezone aware datetimes of the ingestion manifests.
+    """
+    parsed = dt.datetime.fromisoformat(timestamp)
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=dt.UTC)
+    return parsed.astimezone(dt.UTC)
+
+
 @dataclass(frozen=True)
 class CreateNewsletterAndSendEvent:
     """
@@ -17,6 +32,24 @@ class CreateNewsletterAndSendEvent:
 
     receipt_handle: str
     email: str
+    message_id: str = None
+
+
+@dataclass(frozen=True)
+class IngestNewsShardEvent:
+    """
+    IngestNewsShardEvent
+
+    This event is consumed by the IngestNews workers via a SQS queue and is
+    used to ingest the news of a shard of the stock universe.
+    """
+
+    receipt_handle: str
+    shard: int
+    num_shards: int
+    symbols: List[str]
+    started_at: dt.datetime
+    message_id: str = None
 
 
 @dataclass
@@ -37,17 +70,49 @@ class WalterEventParser:
         Returns:
             The SQS event as a CreateNewsletterAndSendEvent event.
         """
-        log.info(f"Parsing event:\n{json.dumps(event, indent=4)}")
+        log.debug("Parsing event: %s", Payload(event))
 
         records = event["Records"]
         if len(records) != 1:
             raise ValueError("More than one record in event!")
 
-        record = records[0]
-        receipt_handle = record["receiptHandle"]
-        body = json.loads(record["body"])
+        return self.parse_create_newsletter_and_send_record(records[0])
 
+    def parse_create_newsletter_and_send_record(
+        self, record: dict
+    ) -> CreateNewsletterAndSendEvent:
+        """
+        Parse a single SQS record into a CreateNewsletterAndSendEvent event.
+
+        Args:
+            record: A record of the SQS event consumed by WalterBackend.
+
+        Returns:
+            The SQS record as a CreateNewsletterAndSendEvent event.
+        """
+        body = json.loads(record["body"])
         return CreateNewsletterAndSendEvent(
-            receipt_handle=receipt_handle,
+            receipt_handle=record["receiptHandle"],
             email=body["email"],
+            message_id=record.get("messageId"),
+        )
+
+    def parse_ingest_news_shard_record(self, record: dict) -> IngestNewsShardEvent:
+        """
+        Parse a single SQS record into an IngestNewsShardEvent event.
+
+        Args:
+            record: A record of the SQS event consumed by the IngestNews workers.
+
+        Returns:
+            The SQS record as an IngestNewsShardEvent event.
+        """
+        body = json.loads(record["body"])
+        return IngestNewsShardEvent(
+            receipt_handle=record["receiptHandle"],
+            shard=body["shard"],
+            num_shards=body["num_shards"],
+            symbols=body["symbols"],
+            started_at=parse_utc_datetime(body["started_at"]),
+            message_id=record.get("messageId"),
         )
@@ -1,7 +1,13 @@
+import gzip
+import hashlib
+import json
 from dataclasses import dataclass
 import datetime as dt
+from typing import Dict, List
 from src.aws.s3.client import WalterS3Client
 from src.environment import Domain
+from src.knowledge.index import NewsIndex
+from src.knowledge.models import IngestedArticle, IngestionManifest
 from src.stocks.alphavantage.models import CompanyNews
 from src.utils.log import Logger
 
@@ -14,12 +20,33 @@ class WalterKnowledgeBase:
     WalterKnowledgeBase
 
     Bucket: walter-knowledge-base-{domain}
+
+    Ingestion is tracked by the ingestion manifest stored in the bucket. Articles
+    whose content hash is unchanged since they were last ingested are not
+    written again. Written articles are also added to the news index of their
+    symbol, a BM25 index used to retrieve the most relevant passages for a
+    newsletter without reading every article.
+
+    Sharded ingestion tracks each shard of the stock universe in its own
+    manifest so that shards can be ingested in parallel.
+
+    Articles are written concurrently as one object per article by default. In
+    packed mode, the articles of a symbol ingested on the same day are instead
+    written as a single gzip compressed, newline delimited JSON object with one
+    article per line, which cuts the number of S3 requests and objects.
     """
 
     BUCKET = "walter-knowledge-base-{domain}"
     KEY = "{symbol}/year={year}/{filename}"
+    PACKED_KEY = "{symbol}/year={year}/date={date}/news.ndjson.gz"
+    MANIFEST_KEY = "manifests/news.json"
+    INDEX_KEY = "indexes/news/{symbol}.json.gz"
+    INDEX_RETENTION = dt.timedelta(days=30)
+    SHARD_MANIFEST_KEY = "manifests/news/shards={num_shards}/shard={shard}.json"
 
     s3: WalterS3Client
+    packed: bool = False
+    max_concurrent_writes: int = WalterS3Client.DEFAULT_MAX_CONCURRENT_REQUESTS
 
     bucket: str = None  # set during init
 
@@ -27,25 +54,222 @@ class WalterKnowledgeBase:
         self.bucket = WalterKnowledgeBase._get_bucket_name(self.s3.domain)
         log.debug(f"Creating WalterKnowledgeBase client with bucket '{self.bucket}'")
 
-    def add_news(self, news: CompanyNews) -> None:
+    def get_manifest(
+        self, shard: int | None = None, num_shards: int | None = None
+    ) -> IngestionManifest:
+        """
+        Get the ingestion manifest, or an empty manifest if nothing has been ingested yet.
+
+        Args:
+            shard: The optional shard of the stock universe to get the manifest of.
+            num_shards: The number of shards the stock universe is split into.
+
+        Returns:
+            The ingestion manifest of the given shard, or of the whole stock universe.
+        """
+        key = WalterKnowledgeBase._get_manifest_key(shard, num_shards)
+        log.info(
+            f"Getting ingestion manifest '{key}' from knowledge base '{self.bucket}'"
+        )
+        manifest = self.s3.get_object_if_exists(self.bucket, key)
+        if manifest is None:
+            return IngestionManifest()
+        return IngestionManifest.from_json(manifest)
+
+    def put_manifest(
+        self,
+        manifest: IngestionManifest,
+        shard: int | None = None,
+        num_shards: int | None = None,
+    ) -> None:
+        key = WalterKnowledgeBase._get_manifest_key(shard, num_shards)
+        log.info(
+            f"Putting ingestion manifest '{key}' with {len(manifest.articles)} articles to knowledge base '{self.bucket}'"
+        )
+        self.s3.put_object(self.bucket, key, manifest.to_json())
+
+    def add_news(
+        self, news: CompanyNews, manifest: IngestionManifest | None = None
+    ) -> int:
+        """
+        Add the news of a company to the knowledge base.
+
+        Args:
+            news: The news of the company.
+            manifest: The optional ingestion manifest, articles whose content
+                is unchanged in the manifest are skipped and written articles
+                are added to it.
+
+        Returns:
+            The number of articles written to the knowledge base.
+        """
         log.info(f"Adding news for company '{news.symbol}' to knowledge base")
-        stock = news.symbol
+        articles = []
         for title, contents in news.news.items():
-            self._dump_article(stock, title, contents)
+            url = news.urls.get(title)
+            content_hash = hashlib.sha256(contents.encode()).hexdigest()
+            if (
+                manifest is not None
+                and url is not None
+                and manifest.is_unchanged(news.symbol, url, content_hash)
+            ):
+                log.debug(f"Skipping unchanged article '{url}'")
+                continue
+            articles.append(
+                {
+                    "title": title,
+                    "url": url,
+                    "content_hash": content_hash,
+                    "contents": contents,
+                }
+            )
+
+        if not articles:
+            written = {}
+        elif self.packed:
+            written = self._dump_packed_articles(news.symbol, articles)
+        else:
+            written = self._dump_articles(news.symbol, articles)
+
+        ingested_at = dt.datetime.now(dt.UTC)
+        if written:
+            self._index_articles(
+                news.symbol,
+                [article for article in articles if article["title"] in written],
+                ingested_at,
+            )
+
+        if manifest is not None:
+            for article in articles:
+                if article["url"] is not None and article["title"] in written:
+                    manifest.put_article(
+                        IngestedArticle(
+                            symbol=news.symbol,
+                            url=article["url"],
+                            key=written[article["title"]],
+                            content_hash=article["content_hash"],
+                            ingested_at=ingested_at,
+                        )
+                    )
+
+        log.info(
+            f"Successfully dumped {len(written)} of {len(news.news)} articles for company '{news.symbol}' to knowledge base!"
+        )
+        return len(written)
+
+    def get_news_index(self, symbol: str) -> NewsIndex:
+        """
+        Get the news index of the given symbol, or an empty index if no news has been indexed yet.
+        """
+        key = WalterKnowledgeBase._get_index_key(symbol)
+        log.info(f"Getting news index '{key}' from knowledge base '{self.bucket}'")
+        index = self.s3.get_object_if_exists(self.bucket, key, decode=False)
+        if index is None:
+            return NewsIndex(symbol=symbol.upper())
+        return NewsIndex.from_json(gzip.decompress(index).decode())
+
+    def put_news_index(self, index: NewsIndex) -> None:
+        key = WalterKnowledgeBase._get_index_key(index.symbol)
         log.info(
-            "Successfully dumped news for company '{news.symbol}' to knowledge base!"
+            f"Putting news index '{key}' with {len(index.passages)} passages to knowledge base '{self.bucket}'"
+        )
+        self.s3.put_object(
+            self.bucket,
+            key=key,
+            contents=gzip.compress(index.to_json().encode(), mtime=0),
+        )
+
+    def _index_articles(
+        self, symbol: str, articles: List[dict], ingested_at: dt.datetime
+    ) -> None:
+        """
+        Add the articles to the news index of the symbol and drop passages
+        older than the index retention.
+        """
+        index = self.get_news_index(symbol)
+        index.prune(ingested_at - WalterKnowledgeBase.INDEX_RETENTION)
+        for article in articles:
+            index.add_article(
+                article["title"], article["url"], article["contents"], ingested_at
+            )
+        self.put_news_index(index)
+
+    def _dump_articles(self, symbol: str, articles: List[dict]) -> Dict[str, str]:
+        """
+        Dump each article as its own object.
+
+        Returns:
+            The keys of the articles written successfully indexed by title.
+        """
+        keys = {
+            article["title"]: WalterKnowledgeBase._get_key(symbol, article["title"])
+            for article in articles
+        }
+        failed = self.s3.put_objects(
+            self.bucket,
+            {keys[article["title"]]: article["contents"] for article in articles},
+            self.max_concurrent_writes,
         )
+        return {title: key for title, key in keys.items() if key not in failed}
+
+    def _dump_packed_articles(
+        self, symbol: str, articles: List[dict]
+    ) -> Dict[str, str]:
+        """
+        Dump the articles into the packed object of the symbol for the current day.
 
-    def _dump_article(self, symbol: str, title: str, contents: str) -> None:
-        key = WalterKnowledgeBase._get_key(symbol, title)
-        self.s3.put_object(self.bucket, key=key, contents=contents)
+        Articles already packed earlier in the day are kept, unless replaced by
+        an article with the same title.
+
+        Returns:
+            The key of the packed object indexed by the title of each article.
+        """
+        key = WalterKnowledgeBase._get_packed_key(symbol)
+        packed = {
+            article["title"]: article for article in self._get_packed_articles(key)
+        }
+        packed.update({article["title"]: article for article in articles})
+        contents = "\n".join(json.dumps(article) for article in packed.values())
+        self.s3.put_object(
+            self.bucket, key=key, contents=gzip.compress(contents.encode(), mtime=0)
+        )
+        return {article["title"]: key for article in articles}
+
+    def _get_packed_articles(self, key: str) -> List[dict]:
+        contents = self.s3.get_object_if_exists(self.bucket, key, decode=False)
+        if contents is None:
+            return []
+        return [
+            json.loads(line)
+            for line in gzip.decompress(contents).decode().splitlines()
+            if line
+        ]
 
     @staticmethod
     def _get_bucket_name(domain: Domain) -> str:
         return WalterKnowledgeBase.BUCKET.format(domain=domain.value)
 
+    @staticmethod
+    def _get_manifest_key(shard: int | None, num_shards: int | None) -> str:
+        if shard is None:
+            return WalterKnowledgeBase.MANIFEST_KEY
+        return WalterKnowledgeBase.SHARD_MANIFEST_KEY.format(
+            num_shards=num_shards, shard=shard
+        )
+
+    @staticmethod
+    def _get_index_key(symbol: str) -> str:
+        return WalterKnowledgeBase.INDEX_KEY.format(symbol=symbol.upper())
+
     @staticmethod
     def _get_key(symbol: str, title: str) -> str:
         return WalterKnowledgeBase.KEY.format(
             symbol=symbol.upper(), year=dt.datetime.now(dt.UTC).year, filename=title
         )
+
+    @staticmethod
+    def _get_packed_key(symbol: str) -> str:
+        now = dt.datetime.now(dt.UTC)
+        return WalterKnowledgeBase.PACKED_KEY.format(
+            symbol=symbol.upper(), year=now.year, date=now.strftime("%Y-%m-%d")
+        )
@@ -0,0 +1,226 @@
+import datetime as dt
+import json
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOP_WORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or that the "
+    "their this to was were will with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split the given text into lowercase terms, ignoring stop words.
+    """
+    return [
+        term for term in TOKEN_PATTERN.findall(text.lower()) if term not in STOP_WORDS
+    ]
+
+
+@dataclass
+class Passage:
+    """
+    Passage
+
+    A fixed size window of the words of an article, the unit of retrieval of
+    the news index. The term frequencies of the passage are computed once when
+    the passage is indexed.
+    """
+
+    title: str
+    url: str | None
+    text: str
+    ingested_at: dt.datetime
+    terms: Dict[str, int]
+    length: int
+
+    def to_dict(self) -> dict:
+        return {
+            "title": self.title,
+            "url": self.url,
+            "text": self.text,
+            "ingested_at": self.ingested_at.isoformat(),
+            "terms": self.terms,
+            "length": self.length,
+        }
+
+    @staticmethod
+    def from_dict(passage: dict) -> "Passage":
+        return Passage(
+            title=passage["title"],
+            url=passage["url"],
+            text=passage["text"],
+            ingested_at=dt.datetime.fromisoformat(passage["ingested_at"]),
+            terms=passage["terms"],
+            length=passage["length"],
+        )
+
+
+@dataclass
+class NewsIndex:
+    """
+    News Index
+
+    A BM25 keyword index over the passages of the news ingested for a symbol.
+    The index is updated at ingestion time with the term frequencies of each
+    passage, so retrieving the top passages at newsletter time only scores the
+    query terms. The most recently ingested passages are kept when the index
+    exceeds `MAX_PASSAGES`.
+    """
+
+    K1 = 1.5
+    B = 0.75
+    PASSAGE_WORDS = 150
+    MAX_PASSAGES = 1000
+
+    symbol: str
+    passages: List[Passage] = field(default_factory=list)
+    document_frequencies: Dict[str, int] = field(default_factory=dict)
+
+    def add_article(
+        self, title: str, url: str | None, contents: str, ingested_at: dt.datetime
+    ) -> int:
+        """
+        Split the given article into passages and add them to the index.
+
+        Passages previously indexed for an article with the same title are
+        replaced.
+
+        Returns:
+            The number of passages added to the index.
+        """
+        self._remove(lambda passage: passage.title == title)
+        words = contents.split()
+        passages = []
+        for start in range(0, len(words), NewsIndex.PASSAGE_WORDS):
+            end = start + NewsIndex.PASSAGE_WORDS
+            text = " ".join(words[start:end])
+            terms = tokenize(text)
+            if not terms:
+                continue
+            passages.append(
+                Passage(
+                    title=title,
+                    url=url,
+                    text=text,
+                    ingested_at=ingested_at,
+                    terms=dict(Counter(terms)),
+                    length=len(terms),
+                )
+            )
+        for passage in passages:
+            self._add(passage)
+        if len(self.passages) > NewsIndex.MAX_PASSAGES:
+            oldest = {
+                id(passage)
+                for passage in sorted(
+                    self.passages, key=lambda passage: passage.ingested_at
+                )[: len(self.passages) - NewsIndex.MAX_PASSAGES]
+            }
+            self._remove(lambda passage: id(passage) in oldest)
+        return len(passages)
+
+    def prune(self, ingested_before: dt.datetime) -> int:
+        """
+        Remove the passages ingested before the given time.
+
+        Returns:
+            The number of pruned passages.
+        """
+        return self._remove(lambda passage: passage.ingested_at < ingested_before)
+
+    def search(self, query: str, k: int) -> List[Passage]:
+        """
+        Get the top k passages of the index for the given query.
+
+        Passages are ranked by their BM25 score for the query terms, ties are
+        broken by the most recently ingested passage.
+
+        Args:
+            query: The query to score the passages of the index against.
+            k: The maximum number of passages to return.
+
+        Returns:
+            The top k passages ordered by relevance.
+        """
+        if not self.passages or k <= 0:
+            return []
+        terms = set(tokenize(query))
+        n = len(self.passages)
+        average_length = sum(passage.length for passage in self.passages) / n
+        idfs = {
+            term: math.log(
+                1
+                + (n - self.document_frequencies[term] + 0.5)
+                / (self.document_frequencies[term] + 0.5)
+            )
+            for term in terms
+            if term in self.document_frequencies
+        }
+        scores = [
+            (self._score(passage, idfs, average_length), passage.ingested_at, i)
+            for i, passage in enumerate(self.passages)
+        ]
+        return [self.passages[i] for _, _, i in sorted(scores, reverse=True)[:k]]
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "symbol": self.symbol,
+                "passages": [passage.to_dict() for passage in self.passages],
+            }
+        )
+
+    @staticmethod
+    def from_json(index: str) -> "NewsIndex":
+        index = json.loads(index)
+        news_index = NewsIndex(symbol=index["symbol"])
+        for passage in index["passages"]:
+            news_index._add(Passage.from_dict(passage))
+        return news_index
+
+    def _score(
+        self, passage: Passage, idfs: Dict[str, float], average_length: float
+    ) -> float:
+        score = 0.0
+        for term, idf in idfs.items():
+            frequency = passage.terms.get(term, 0)
+            if frequency:
+                score += (
+                    idf
+                    * frequency
+                    * (NewsIndex.K1 + 1)
+                    / (
+                        frequency
+                        + NewsIndex.K1
+                        * (
+                            1
+                            - NewsIndex.B
+                            + NewsIndex.B * passage.length / average_length
+                        )
+                    )
+                )
+        return score
+
+    def _add(self, passage: Passage) -> None:
+        self.passages.append(passage)
+        for term in passage.terms:
+            self.document_frequencies[term] = self.document_frequencies.get(term, 0) + 1
+
+    def _remove(self, predicate: Callable[[Passage], bool]) -> int:
+        removed = [passage for passage in self.passages if predicate(passage)]
+        if not removed:
+            return 0
+        self.passages = [passage for passage in self.passages if not predicate(passage)]
+        for passage in removed:
+            for term in passage.terms:
+                self.document_frequencies[term] -= 1
+                if self.document_frequencies[term] == 0:
+                    del self.document_frequencies[term]
+        return len(removed)
@@ -0,0 +1,174 @@
+import datetime as dt
+import functools
+import json
+import zlib
+from typing import Dict, List
+
+from src import clients
+from src.config import CONFIG
+from src.events.parser import IngestNewsShardEvent, parse_utc_datetime
+from src.knowledge.base import WalterKnowledgeBase
+from src.knowledge.models import IngestionManifest
+from src.knowledge.queue import IngestNewsShard
+from src.stocks.client import WalterStocksAPI
+from src.utils.log import Logger
+
+log = Logger(__name__).get_logger()
+
+MANIFEST_RETENTION = dt.timedelta(days=365)
+"""(timedelta): The time ingested articles are tracked in the ingestion manifest."""
+
+
+def get_shard(symbol: str, num_shards: int) -> int:
+    """
+    Get the shard of the given symbol.
+
+    Symbols are assigned to shards by a stable hash so that a symbol is always
+    ingested, and checkpointed, in the same shard as long as the number of
+    shards is unchanged.
+    """
+    return zlib.crc32(symbol.upper().encode()) % num_shards
+
+
+def ingest_stock_news(
+    walter_stocks_api: WalterStocksAPI,
+    walter_knowledge_base: WalterKnowledgeBase,
+    manifest: IngestionManifest,
+    symbol: str,
+) -> None:
+    """
+    Ingest the news of the given stock published since it was last ingested.
+
+    Articles already in the manifest for the stock are not scraped again. The
+    manifest is updated with the written articles and the time the stock was
+    ingested. The stock is only checkpointed if a news feed was returned, and
+    never past the oldest article that failed to scrape so that it is retried.
+    """
+    ingested_at = dt.datetime.now(dt.UTC)
+    log.info(f"Getting news for stock '{symbol}'")
+    news = walter_stocks_api.get_news(
+        symbol,
+        time_from=manifest.get_last_ingested(symbol),
+        skip_url=functools.partial(manifest.is_known, symbol),
+    )
+    if news is None:
+        log.info(f"No news feed returned for stock '{symbol}', not checkpointing")
+        return
+    walter_knowledge_base.add_news(news, manifest)
+    if news.failed_since is not None:
+        log.info(
+            f"Checkpointing stock '{symbol}' at '{news.failed_since.isoformat()}' to retry articles that failed to scrape"
+        )
+        ingested_at = min(ingested_at, news.failed_since)
+    manifest.set_last_ingested(symbol, ingested_at)
+
+
+def add_ingest_news_shards_to_queue(event, context) -> dict:
+    """
+    Split all stocks in WalterDB into shards and send them to the IngestNews queue.
+
+    The number of shards defaults to the configured number of shards. Passing
+    the `started_at` time of a previous run resumes that run, i.e. the workers
+    skip the stocks already ingested since the run started. A `started_at` time
+    without an offset is assumed to be in UTC.
+    """
+    num_shards = int(event.get("num_shards", CONFIG.ingest_news_shards))
+    started_at = (
+        parse_utc_datetime(event["started_at"])
+        if "started_at" in event
+        else dt.datetime.now(dt.UTC)
+    )
+    log.info(
+        f"IngestNews coordinator invoked! Splitting stocks into {num_shards} shards for run started at '{started_at.isoformat()}'"
+    )
+
+    symbols: Dict[int, List[str]] = {}
+    for stock in clients.walter_db.get_all_stocks():
+        symbols.setdefault(get_shard(stock.symbol, num_shards), []).append(stock.symbol)
+
+    shards = [
+        IngestNewsShard(
+            shard=shard,
+            num_shards=num_shards,
+            symbols=symbols[shard],
+            started_at=started_at,
+        )
+        for shard in sorted(symbols)
+    ]
+    message_ids = clients.ingest_news_queue.add_shards(shards)
+
+    return {
+        "statusCode": 200,
+        "body": json.dumps(
+            {
+                "started_at": started_at.isoformat(),
+                "shards": len(shards),
+                "queued": len(message_ids),
+            }
+        ),
+    }
+
+
+def ingest_news_shards(event, context) -> dict:
+    """
+    Ingest the news of each shard in the SQS event.
+
+    Each shard is processed independently. The message IDs of shards that
+    failed are returned as a partial batch response, Lambda deletes the other
+    shards from the queue so that only the failed shards are retried.
+    """
+    records = event["Records"]
+    log.info(f"Processing batch of {len(records)} ingest news shards")
+
+    failures = []
+    for record in records:
+        try:
+            shard = clients.walter_event_parser.parse_ingest_news_shard_record(record)
+            ingest_news_shard(shard)
+        except Exception as exception:
+            log.error(
+                f"Unexpected error occurred processing ingest news shard '{record.get('messageId')}'!\n"
+                f"Error: {exception}"
+            )
+            failures.append({"itemIdentifier": record.get("messageId")})
+
+    log.info(
+        f"Processed {len(records) - len(failures)} of {len(records)} ingest news shards successfully"
+    )
+
+    return {"batchItemFailures": failures}
+
+
+def ingest_news_shard(shard: IngestNewsShardEvent) -> int:
+    """
+    Ingest the news of each stock in the shard.
+
+    The shard manifest is checkpointed after each stock. Stocks ingested since
+    the run started are skipped, so a retried or resumed shard picks up where
+    the previous attempt left off.
+
+    Returns:
+        The number of stocks ingested.
+    """
+    log.info(
+        f"Ingesting news for {len(shard.symbols)} stocks in shard {shard.shard} of {shard.num_shards}"
+    )
+    manifest = clients.knowledge_base.get_manifest(shard.shard, shard.num_shards)
+    manifest.prune(dt.datetime.now(dt.UTC) - MANIFEST_RETENTION)
+
+    count = 0
+    for symbol in shard.symbols:
+        last_ingested = manifest.get_last_ingested(symbol)
+        if last_ingested is not None and last_ingested >= shard.started_at:
+            log.info(f"Skipping stock '{symbol}' already ingested in this run")
+            continue
+        ingest_stock_news(
+            clients.walter_stocks_api, clients.knowledge_base, manifest, symbol
+        )
+        clients.knowledge_base.put_manifest(manifest, shard.shard, shard.num_shards)
+        count += 1
+
+    log.info(
+        f"Successfully ingested news for {count} stocks in shard {shard.shard} of {shard.num_shards}!"
+    )
+    return count
@@ -0,0 +1,124 @@
+import datetime as dt
+import json
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+
+@dataclass
+class IngestedArticle:
+    """
+    Ingested Article
+
+    An article dumped to the knowledge base for a symbol, identified by its URL.
+    """
+
+    symbol: str
+    url: str
+    key: str
+    content_hash: str
+    ingested_at: dt.datetime
+
+    def to_dict(self) -> dict:
+        return {
+            "key": self.key,
+            "content_hash": self.content_hash,
+            "ingested_at": self.ingested_at.isoformat(),
+        }
+
+    @staticmethod
+    def from_dict(symbol: str, url: str, article: dict) -> "IngestedArticle":
+        return IngestedArticle(
+            symbol=symbol,
+            url=url,
+            key=article["key"],
+            content_hash=article["content_hash"],
+            ingested_at=dt.datetime.fromisoformat(article["ingested_at"]),
+        )
+
+
+@dataclass
+class IngestionManifest:
+    """
+    Ingestion Manifest
+
+    The index of the news ingested into the knowledge base. The manifest tracks
+    when the news of each symbol was last ingested, so ingestion only requests
+    news published since, and the content hash of each ingested article by
+    symbol and URL, so known articles are not scraped again and unchanged
+    articles are not written again. Articles are tracked per symbol so that an
+    article in the news of several symbols is added to the news index of each.
+    """
+
+    last_ingested: Dict[str, dt.datetime] = field(default_factory=dict)
+    articles: Dict[Tuple[str, str], IngestedArticle] = field(default_factory=dict)
+
+    def get_last_ingested(self, symbol: str) -> Optional[dt.datetime]:
+        return self.last_ingested.get(symbol.upper())
+
+    def set_last_ingested(self, symbol: str, ingested_at: dt.datetime) -> None:
+        self.last_ingested[symbol.upper()] = ingested_at
+
+    def is_known(self, symbol: str, url: str) -> bool:
+        return (symbol.upper(), url) in self.articles
+
+    def is_unchanged(self, symbol: str, url: str, content_hash: str) -> bool:
+        article = self.articles.get((symbol.upper(), url))
+        return article is not None and article.content_hash == content_hash
+
+    def put_article(self, article: IngestedArticle) -> None:
+        self.articles[(article.symbol.upper(), article.url)] = article
+
+    def prune(self, ingested_before: dt.datetime) -> int:
+        """
+        Remove the articles ingested before the given time.
+
+        Articles older than the ingestion window are never returned by the news
+        feed again, so they can be removed to bound the size of the manifest.
+
+        Returns:
+            The number of pruned articles.
+        """
+        pruned = [
+            key
+            for key, article in self.articles.items()
+            if article.ingested_at < ingested_before
+        ]
+        for key in pruned:
+            del self.articles[key]
+        return len(pruned)
+
+    def to_json(self) -> str:
+        articles: Dict[str, Dict[str, dict]] = {}
+        for (symbol, url), article in self.articles.items():
+            articles.setdefault(symbol, {})[url] = article.to_dict()
+        return json.dumps(
+            {
+                "last_ingested": {
+                    symbol: ingested_at.isoformat()
+                    for symbol, ingested_at in self.last_ingested.items()
+                },
+                "articles": articles,
+            }
+        )
+
+    @staticmethod
+    def from_json(manifest: str) -> "IngestionManifest":
+        manifest = json.loads(manifest)
+        articles = {}
+        for symbol, symbol_articles in manifest["articles"].items():
+            if "key" in symbol_articles:
+                # manifests tracking articles by url only, the symbol is the key prefix
+                url, article = symbol, symbol_articles
+                symbol_articles = {url: article}
+                symbol = article["key"].split("/")[0]
+            for url, article in symbol_articles.items():
+                articles[(symbol, url)] = IngestedArticle.from_dict(
+                    symbol, url, article
+                )
+        return IngestionManifest(
+            last_ingested={
+                symbol: dt.datetime.fromisoformat(ingested_at)
+                for symbol, ingested_at in manifest["last_ingested"].items()
+            },
+            articles=articles,
+        )
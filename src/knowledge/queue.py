@@ -0,0 +1,71 @@
+import datetime as dt
+import json
+import os
+from dataclasses import dataclass
+from typing import List
+
+from src.aws.sqs.client import WalterSQSClient
+from src.utils.log import Logger
+
+log = Logger(__name__).get_logger()
+
+
+@dataclass
+class IngestNewsShard:
+    """
+    Ingest News Shard
+
+    A shard of the stock universe to be ingested by a single IngestNews worker.
+    The shards of a run share the time the run started.
+    """
+
+    shard: int
+    num_shards: int
+    symbols: List[str]
+    started_at: dt.datetime
+
+    def to_message(self) -> dict:
+        return self.__dict__()
+
+    def __dict__(self) -> dict:
+        return {
+            "shard": self.shard,
+            "num_shards": self.num_shards,
+            "symbols": self.symbols,
+            "started_at": self.started_at.isoformat(),
+        }
+
+    def __str__(self) -> str:
+        return json.dumps(self.__dict__(), indent=4)
+
+
+@dataclass
+class IngestNewsQueue:
+
+    QUEUE_URL_FORMAT = (
+        "https://sqs.{region}.amazonaws.com/{account_id}/IngestNewsQueue-{domain}"
+    )
+
+    client: WalterSQSClient
+
+    queue_url: str = None
+
+    def __post_init__(self) -> None:
+        self.queue_url = self._get_queue_url()
+        log.debug(f"Creating IngestNewsQueue with queue URL: '{self.queue_url}'")
+
+    def add_shards(self, shards: List[IngestNewsShard]) -> List[str]:
+        log.info(f"Adding {len(shards)} ingest news shards to queue")
+        message_ids = self.client.send_messages(
+            queue_url=self.queue_url,
+            messages=[shard.to_message() for shard in shards],
+        )
+        log.info(f"Added {len(message_ids)} ingest news shards to queue")
+        return message_ids
+
+    def _get_queue_url(self) -> str:
+        return IngestNewsQueue.QUEUE_URL_FORMAT.format(
+            region=self.client.client.meta.region_name,
+            account_id=os.getenv("AWS_ACCOUNT_ID", "010526272437"),
+            domain=self.client.domain.value,
+        )
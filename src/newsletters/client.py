@@ -3,6 +3,7 @@ from dataclasses import dataclass
 from src.database.users.models import User
 from src.aws.s3.client import WalterS3Client
 from src.environment import Domain
+from src.stocks.models import MarketDataSnapshot
 from src.utils.log import Logger
 from datetime import datetime as dt
 
@@ -23,6 +24,9 @@ class NewslettersBucket:
     NEWSLETTERS_DIR = "newsletters"
     NEWSLETTER_KEY = "{newsletters_dir}/{date}/{user}/{template}/index.html"
 
+    SNAPSHOTS_DIR = "snapshots"
+    SNAPSHOT_KEY = "{snapshots_dir}/{date}/market-data.json.gz"
+
     client: WalterS3Client
     domain: Domain
 
@@ -48,6 +52,36 @@ class NewslettersBucket:
         key = NewslettersBucket._get_newsletter_key(user, template)
         self.client.put_object(self.bucket, key, contents)
 
+    def put_market_data_snapshot(self, snapshot: MarketDataSnapshot) -> None:
+        """Write market data snapshot to S3.
+
+        The snapshot is keyed by the end date of its window so that all
+        newsletters created for the same window read the same snapshot.
+
+        Args:
+            snapshot (MarketDataSnapshot): The market data snapshot to put to S3.
+        """
+        log.info("Dumping market data snapshot to S3")
+        key = NewslettersBucket._get_snapshot_key(snapshot.end_date)
+        self.client.put_object(self.bucket, key, snapshot.to_bytes())
+
+    def get_market_data_snapshot(self, end_date: dt) -> MarketDataSnapshot | None:
+        """Get market data snapshot from S3.
+
+        Args:
+            end_date (datetime): The end date of the window of the snapshot.
+
+        Returns:
+            MarketDataSnapshot: The market data snapshot or None if it does not exist.
+        """
+        log.info("Getting market data snapshot from S3")
+        key = NewslettersBucket._get_snapshot_key(end_date)
+        contents = self.client.get_object_if_exists(self.bucket, key, decode=False)
+        if contents is None:
+            log.info("Market data snapshot does not exist!")
+            return None
+        return MarketDataSnapshot.from_bytes(contents)
+
     @staticmethod
     def _get_bucket_name(domain: Domain) -> str:
         return NewslettersBucket.BUCKET.format(domain=domain.value)
@@ -63,3 +97,10 @@ class NewslettersBucket:
             user=user.username,
             template=template,
         )
+
+    @staticmethod
+    def _get_snapshot_key(end_date: dt) -> str:
+        return NewslettersBucket.SNAPSHOT_KEY.format(
+            snapshots_dir=NewslettersBucket.SNAPSHOTS_DIR,
+            date=dt.strftime(end_date, "y=%Y/m=%m/d=%d"),
+        )
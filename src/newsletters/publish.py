@@ -1,12 +1,19 @@
 import json
+from typing import List
 
-from src.clients import walter_db, newsletters_queue
+from src import clients
+from src.aws.sqs.client import SendMessagesError
+from src.config import CONFIG
 from src.newsletters.queue import NewsletterRequest
+from src.newsletters.snapshot import create_market_data_snapshot
 
 from src.utils.log import Logger
 
 log = Logger(__name__).get_logger()
 
+PUBLISH_BATCH_SIZE = 100
+"""(int): The number of newsletter requests buffered before they are sent to the queue."""
+
 
 def add_newsletter_to_queue(event, context) -> dict:
     """
@@ -14,10 +21,21 @@ def add_newsletter_to_queue(event, context) -> dict:
     """
     log.info("WalterNewsletters invoked!")
 
-    # get all users from db
-    users = walter_db.get_users()
+    # pre-warm market data for all newsletters, if this fails the backend
+    # falls back to fetching market data per user
+    try:
+        create_market_data_snapshot(
+            clients.walter_db, clients.walter_stocks_api, clients.newsletters_bucket
+        )
+    except Exception as exception:
+        log.error(
+            f"Unexpected error occurred creating market data snapshot!\nError: {exception}"
+        )
+
+    requests, failed = [], []
 
-    for user in users:
+    # stream all users from db
+    for user in clients.walter_db.get_users():
 
         # ensure user email address is verified
         if not user.verified:
@@ -33,8 +51,42 @@ def add_newsletter_to_queue(event, context) -> dict:
             )
             continue
 
-        log.info(f"Adding newsletter request to the queue for user: '{user.email}'")
-        request = NewsletterRequest(email=user.email)
-        newsletters_queue.add_newsletter_request(request)
+        requests.append(NewsletterRequest(email=user.email))
+
+        # flush buffered requests to the queue in batches
+        if len(requests) >= PUBLISH_BATCH_SIZE:
+            failed.extend(add_newsletter_requests(requests))
+            requests = []
+
+    if requests:
+        failed.extend(add_newsletter_requests(requests))
+
+    # failures are reported rather than raised as a retried invocation would
+    # publish duplicate newsletters to the users whose requests were queued
+    if failed:
+        log.error(f"Failed to add {len(failed)} newsletter requests to queue!")
+
+    if CONFIG.emit_metrics:
+        clients.walter_cw.emit_metric(
+            "WalterNewsletters.NumberOfFailedNewsletterRequests", len(failed)
+        )
+        clients.walter_cw.flush()
 
     return {"statusCode": 200, "body": json.dumps("WalterNewsletters")}
+
+
+def add_newsletter_requests(requests: List[NewsletterRequest]) -> List[dict]:
+    """
+    Add the newsletter requests to the queue.
+
+    Returns:
+        The messages of the newsletter requests that failed to be added to the queue.
+    """
+    try:
+        clients.newsletters_queue.add_newsletter_requests(requests)
+        return []
+    except SendMessagesError as error:
+        log.error(
+            f"Failed to add newsletter requests to queue for {[message['email'] for message in error.failed]}!"
+        )
+        return error.failed
@@ -1,9 +1,10 @@
 import json
 import os
 from dataclasses import dataclass
+from typing import List
 
 from src.aws.sqs.client import WalterSQSClient
-from src.utils.log import Logger
+from src.utils.log import Logger, Payload
 
 log = Logger(__name__).get_logger()
 
@@ -38,13 +39,24 @@ class NewslettersQueue:
         log.debug(f"Creating NewslettersQueue with queue URL: '{self.queue_url}'")
 
     def add_newsletter_request(self, request: NewsletterRequest) -> str:
-        log.info(f"Adding newsletter request to queue:\n{request}")
+        log.info(
+            "Adding newsletter request to queue: %s", Payload(request.to_message())
+        )
         message_id = self.client.send_message(
             queue_url=self.queue_url, message=request.to_message()
         )
         log.info(f"Added newsletter request to queue with message ID: {message_id}")
         return message_id
 
+    def add_newsletter_requests(self, requests: List[NewsletterRequest]) -> List[str]:
+        log.info(f"Adding {len(requests)} newsletter requests to queue")
+        message_ids = self.client.send_messages(
+            queue_url=self.queue_url,
+            messages=[request.to_message() for request in requests],
+        )
+        log.info(f"Added {len(message_ids)} newsletter requests to queue")
+        return message_ids
+
     def delete_newsletter_request(self, receipt_handle: str) -> None:
         log.info(
             f"Deleting newsletter request with the following receipt handle: {receipt_handle}"
@@ -0,0 +1,71 @@
+from datetime import UTC, datetime, timedelta
+from typing import Tuple
+
+from src.database.client import WalterDB
+from src.newsletters.client import NewslettersBucket
+from src.stocks.client import WalterStocksAPI
+from src.stocks.models import MarketDataSnapshot
+from src.utils.log import Logger
+
+log = Logger(__name__).get_logger()
+
+#############
+# ARGUMENTS #
+#############
+
+WINDOW_DAYS = 7
+"""(int): The number of days of market data included in newsletters."""
+
+
+def get_market_data_window() -> Tuple[datetime, datetime]:
+    """
+    Get the market data window included in newsletters.
+
+    The window ends at midnight UTC of the current day. It is computed when
+    called rather than at import so that warm containers do not reuse the
+    window of the day they were created.
+
+    Returns:
+        The start and end date of the market data window.
+    """
+    end_date = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+    return end_date - timedelta(days=WINDOW_DAYS), end_date
+
+
+def create_market_data_snapshot(
+    walter_db: WalterDB,
+    walter_stocks_api: WalterStocksAPI,
+    newsletters_bucket: NewslettersBucket,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+) -> MarketDataSnapshot:
+    """
+    Pre-warm the market data for the newsletter fan-out.
+
+    This stage runs before newsletter requests are added to the queue. It gets
+    the distinct stocks held across all user portfolios, fetches their prices
+    and news once each, and writes a single snapshot to S3 that WalterBackend
+    reads instead of fetching market data per user. This makes the number of
+    external API calls proportional to the number of distinct stocks rather
+    than the number of users times their holdings.
+
+    Args:
+        walter_db: The WalterDB client.
+        walter_stocks_api: The WalterStocksAPI client.
+        newsletters_bucket: The newsletters bucket to write the snapshot.
+        start_date: The start date of the market data window, defaults to the current window.
+        end_date: The end date of the market data window, defaults to the current window.
+
+    Returns:
+        The market data snapshot written to S3.
+    """
+    log.info("Creating market data snapshot for newsletters")
+    if start_date is None or end_date is None:
+        start_date, end_date = get_market_data_window()
+    symbols = sorted(walter_db.get_held_stock_symbols())
+    snapshot = walter_stocks_api.get_market_data_snapshot(symbols, start_date, end_date)
+    newsletters_bucket.put_market_data_snapshot(snapshot)
+    log.info(
+        f"Created market data snapshot with prices for {len(snapshot.prices)} of {len(symbols)} stocks"
+    )
+    return snapshot
@@ -1,13 +1,19 @@
+import contextvars
 import datetime as dt
-import json
+import functools
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from bs4 import BeautifulSoup
+from typing import Callable, Dict, Tuple
+from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from src.stocks.alphavantage.models import CompanyOverview, CompanyNews
-from src.utils.log import Logger
+from src.utils.log import Logger, Payload
+from src.utils.tracing import traced
 
 log = Logger(__name__).get_logger()
 
@@ -15,22 +21,90 @@ ONE_YEAR_AGO = dt.datetime.today() - dt.timedelta(days=365)
 """(datetime): Exactly one year ago from the current date."""
 
 
+@functools.cache
+def get_html_parser() -> str:
+    """
+    Get the fastest available BeautifulSoup HTML parser.
+
+    The lxml parser is several times faster than the pure Python html.parser
+    but is an optional dependency, so fall back to html.parser if not installed.
+    """
+    try:
+        import lxml  # noqa: F401
+
+        return "lxml"
+    except ImportError:
+        return "html.parser"
+
+
+class AlphaVantageError(Exception):
+    """
+    AlphaVantage Error
+
+    Raised when AlphaVantage returns an error payload instead of the requested
+    data, e.g. the rate limit "Information" or "Note" payloads, so that callers
+    do not mistake it for an empty result.
+    """
+
+    def __init__(self, symbol: str, response: dict) -> None:
+        message = (
+            response.get("Information")
+            or response.get("Note")
+            or response.get("Error Message")
+            or f"Unexpected response with keys {sorted(response)}"
+        )
+        super().__init__(
+            f"Failed to get data from AlphaVantage for '{symbol}': {message}"
+        )
+        self.symbol = symbol
+        self.response = response
+
+
 @dataclass
 class AlphaVantageClient:
     """
     AlphaVantage Client
 
+    The articles of the news feed are scraped concurrently over a shared pool
+    of HTTP connections. At most `max_concurrent_requests` articles are scraped
+    at once and at most `max_requests_per_host` of them from the same host, so
+    a feed dominated by one publisher does not hammer it. Each request has a
+    timeout and article bodies larger than `max_article_bytes` are skipped.
+
     docs: https://www.alphavantage.co/documentation/
     """
 
     BASE_URL = "https://www.alphavantage.co"
     METHOD_URL_FORMAT = "{base_url}/query?function={method}{args}{key}"
+    TIME_PUBLISHED_FORMAT = "%Y%m%dT%H%M%S"
 
-    api_key: str
+    DEFAULT_MAX_CONCURRENT_REQUESTS = 16
+    DEFAULT_MAX_REQUESTS_PER_HOST = 4
+    DEFAULT_TIMEOUT_SECONDS = 10
+    DEFAULT_MAX_ARTICLE_BYTES = 2 * 1024 * 1024
+    SCRAPED_CONTENT_TYPES = ("text/html", "text/plain", "application/xhtml+xml")
+
+    get_api_key: Callable[[], str]
+    max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS
+    max_requests_per_host: int = DEFAULT_MAX_REQUESTS_PER_HOST
+    timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS
+    max_article_bytes: int = DEFAULT_MAX_ARTICLE_BYTES
+
+    session: requests.Session = None  # set during post init
 
     def __post_init__(self) -> None:
         log.debug("Initializing AlphaVantage Client")
+        adapter = HTTPAdapter(
+            pool_connections=self.max_concurrent_requests,
+            pool_maxsize=self.max_concurrent_requests,
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._host_limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_limits_lock = threading.Lock()
 
+    @traced("AlphaVantage.CompanyOverview")
     def get_company_overview(self, symbol: str) -> CompanyOverview | None:
         """
         Get the company overview.
@@ -43,7 +117,7 @@ class AlphaVantageClient:
         """
         log.info(f"Getting company overview for '{symbol}'")
         url = self._get_company_overview_url(symbol)
-        response = requests.get(url).json()
+        response = self.session.get(url, timeout=self.timeout_seconds).json()
 
         # if empty dict response from alpha vantage then assume stock does not exist
         if response == {}:
@@ -59,45 +133,161 @@ class AlphaVantageClient:
             official_site=response["OfficialSite"],
         )
         log.info(
-            f"Returned company overview for '{symbol}':\n{json.dumps(overview.to_dict(), indent=4)}"
+            "Returned company overview for '%s': %s",
+            symbol,
+            Payload(overview.to_dict()),
         )
 
         return overview
 
-    def get_news(self, symbol: str) -> CompanyNews | None:
+    @traced("AlphaVantage.NewsSentiment")
+    def get_news(
+        self,
+        symbol: str,
+        time_from: dt.datetime | None = None,
+        skip_url: Callable[[str], bool] | None = None,
+    ) -> CompanyNews | None:
         """
         Get relevant company news.
 
         Args:
             symbol: The stock symbol of the company.
+            time_from: The optional time to get news published since, defaults to one year ago.
+            skip_url: The optional predicate of article URLs to not scrape, e.g. known articles.
 
         Returns:
-            The latest company news or `None` if not found.
+            The latest company news or `None` if not found. The publish time of
+            the oldest article that failed to scrape with a retryable error is
+            included so that callers do not checkpoint past it.
+
+        Raises:
+            AlphaVantageError: If the response does not include a news feed, e.g.
+                the request was rate limited.
         """
         log.info(f"Getting company news for '{symbol}'")
-        url = self._get_news_url(symbol)
-        response = requests.get(url).json()
+        time_from = time_from or ONE_YEAR_AGO
+        url = self._get_news_url(symbol, time_from)
+        response = self.session.get(url, timeout=self.timeout_seconds).json()
 
         if response == {}:
-            log.info("No news found for '{symbol}'")
+            log.info(f"No news found for '{symbol}'")
             return None
 
-        log.info(f"Parsing {len(response['feed'])} articles for '{symbol}'")
+        if "feed" not in response:
+            raise AlphaVantageError(symbol, response)
+
+        articles = response["feed"]
+        if skip_url is not None:
+            articles = [article for article in articles if not skip_url(article["url"])]
+        log.info(f"Scraping {len(articles)} articles for '{symbol}'")
 
         # TODO: Move web scraping to its own class with its own dedicated logic (i.e. a Beautiful Soup wrapper)
 
-        news = {}
-        for article in response["feed"]:
-            title = self._format_title(article["title"])
-            url = article["url"]
-            log.info(f"Parsing '{url}'")
-            response = requests.get(url)
-            soup = BeautifulSoup(response.text, "html.parser")
-            page_text = soup.get_text()
-            cleaned_text = " ".join(page_text.split())
-            news[title] = cleaned_text
+        max_workers = max(1, min(self.max_concurrent_requests, len(articles)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # articles are scraped in a copy of the caller's context so that
+            # their downstream call timers are recorded in the caller's trace
+            pages = list(
+                executor.map(
+                    lambda article: contextvars.copy_context().run(
+                        self._try_scrape_article, article["url"]
+                    ),
+                    articles,
+                )
+            )
+
+        news, urls, failed_since = {}, {}, None
+        for article, (page_text, failed) in zip(articles, pages):
+            if failed:
+                published_at = AlphaVantageClient._get_published_at(article, time_from)
+                failed_since = min(failed_since or published_at, published_at)
+            elif page_text is not None:
+                title = self._format_title(article["title"])
+                news[title] = page_text
+                urls[title] = article["url"]
 
-        return CompanyNews(symbol=symbol, news=news)
+        log.info(f"Scraped {len(news)} of {len(articles)} articles for '{symbol}'")
+
+        return CompanyNews(
+            symbol=symbol, news=news, urls=urls, failed_since=failed_since
+        )
+
+    def _try_scrape_article(self, url: str) -> Tuple[str | None, bool]:
+        """
+        Scrape the text of the article at the given URL.
+
+        Returns:
+            The text of the article, or `None` if it was skipped or failed, and
+            whether the article failed with an error worth retrying later.
+        """
+        try:
+            return self._scrape_article(url), False
+        except requests.RequestException as exception:
+            log.error(
+                f"Unexpected error occurred scraping '{url}'!\nError: {exception}"
+            )
+            return None, AlphaVantageClient._is_retryable(exception)
+
+    @traced("AlphaVantage.ScrapeArticle")
+    def _scrape_article(self, url: str) -> str | None:
+        """
+        Scrape the text of the article at the given URL.
+
+        Args:
+            url: The URL of the article.
+
+        Returns:
+            The whitespace normalized text of the article or `None` if the article
+            is not HTML or is larger than the size cap.
+
+        Raises:
+            RequestException: If the article could not be requested.
+        """
+        # bs4 is only needed to scrape news, import it on first use
+        from bs4 import BeautifulSoup
+
+        log.debug(f"Scraping '{url}'")
+        with self._get_host_limit(url):
+            with self.session.get(
+                url, timeout=self.timeout_seconds, stream=True
+            ) as response:
+                response.raise_for_status()
+                content_type = response.headers.get("Content-Type", "text/html")
+                if not content_type.startswith(
+                    AlphaVantageClient.SCRAPED_CONTENT_TYPES
+                ):
+                    log.debug(f"Skipping '{url}' with content type '{content_type}'")
+                    return None
+                content = self._read_capped(response)
+                if content is None:
+                    log.info(
+                        f"Skipping '{url}' larger than {self.max_article_bytes} bytes"
+                    )
+                    return None
+                text = content.decode(response.encoding or "utf-8", errors="replace")
+
+        soup = BeautifulSoup(text, get_html_parser())
+        return " ".join(soup.get_text().split())
+
+    def _read_capped(self, response: requests.Response) -> bytes | None:
+        content_length = response.headers.get("Content-Length")
+        if content_length is not None and int(content_length) > self.max_article_bytes:
+            return None
+        content = bytearray()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            content.extend(chunk)
+            if len(content) > self.max_article_bytes:
+                return None
+        return bytes(content)
+
+    def _get_host_limit(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc
+        with self._host_limits_lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(
+                    self.max_requests_per_host
+                )
+            return self._host_limits[host]
 
     def _get_company_overview_url(self, symbol: str) -> str:
         return self._get_method_url(method="OVERVIEW", args={"symbol": symbol})
@@ -116,9 +306,26 @@ class AlphaVantageClient:
             base_url=AlphaVantageClient.BASE_URL,
             method=method,
             args=args_str,
-            key=f"&apikey={self.api_key}",
+            key=f"&apikey={self.get_api_key()}",
         )
 
+    @staticmethod
+    def _is_retryable(exception: requests.RequestException) -> bool:
+        # client errors other than throttling, e.g. not found, fail on every retry
+        response = getattr(exception, "response", None)
+        if isinstance(exception, requests.HTTPError) and response is not None:
+            return response.status_code >= 500 or response.status_code == 429
+        return True
+
+    @staticmethod
+    def _get_published_at(article: dict, default: dt.datetime) -> dt.datetime:
+        try:
+            return dt.datetime.strptime(
+                article["time_published"], AlphaVantageClient.TIME_PUBLISHED_FORMAT
+            ).replace(tzinfo=dt.UTC)
+        except (KeyError, ValueError):
+            return default if default.tzinfo else default.replace(tzinfo=dt.UTC)
+
     @staticmethod
     def _format_title(title: str) -> str:
         cleaned_title = re.sub(r"[^a-zA-Z0-9\s]", "", title)
@@ -1,4 +1,5 @@
-from dataclasses import dataclass
+import datetime as dt
+from dataclasses import dataclass, field
 from typing import Dict
 
 
@@ -34,7 +35,13 @@ class CompanyOverview:
 class CompanyNews:
     """
     Company News
+
+    The scraped text of each news article indexed by formatted title, along
+    with the URL of each article indexed by the same title. The publish time of
+    the oldest article that failed to scrape, if any, is kept as `failed_since`.
     """
 
     symbol: str
     news: Dict[str, str]
+    urls: Dict[str, str] = field(default_factory=dict)
+    failed_since: dt.datetime | None = None
@@ -0,0 +1,151 @@
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from src.aws.s3.client import WalterS3Client
+from src.utils.log import Logger
+
+log = Logger(__name__).get_logger()
+
+
+class MarketDataCacheBackend(ABC):
+    """
+    Market Data Cache Backend
+
+    The storage tier of the market data cache. Backends store serialized
+    market data under a string key until the given time-to-live expires.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> str | None:
+        """
+        Get the value stored under the given key.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            The stored value or None if the key is missing or expired.
+        """
+        pass
+
+    @abstractmethod
+    def put(self, key: str, value: str, ttl_seconds: int) -> None:
+        """
+        Store the value under the given key for the given time-to-live.
+
+        Args:
+            key: The cache key.
+            value: The serialized value to store.
+            ttl_seconds: The number of seconds the value is valid.
+        """
+        pass
+
+
+@dataclass
+class InMemoryBackend(MarketDataCacheBackend):
+    """
+    In-Memory Backend
+
+    A least recently used (LRU) cache that lives for the life of the
+    process, i.e. the Lambda container.
+    """
+
+    max_entries: int = 1024
+
+    entries: OrderedDict = field(default_factory=OrderedDict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def get(self, key: str) -> str | None:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.time():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: str, ttl_seconds: int) -> None:
+        with self.lock:
+            self.entries[key] = (time.time() + ttl_seconds, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+
+@dataclass
+class LocalFileBackend(MarketDataCacheBackend):
+    """
+    Local File Backend
+
+    Stores each entry as a file in the given directory, e.g. `/tmp` in Lambda,
+    so that entries survive across processes on the same host.
+    """
+
+    directory: str = "/tmp/walter-market-data"
+
+    def __post_init__(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+
+    def get(self, key: str) -> str | None:
+        path = self._get_path(key)
+        try:
+            with open(path) as f:
+                expires_at = float(f.readline())
+                value = f.read()
+        except (FileNotFoundError, ValueError):
+            return None
+        if expires_at <= time.time():
+            return None
+        return value
+
+    def put(self, key: str, value: str, ttl_seconds: int) -> None:
+        path = self._get_path(key)
+        # write to a temporary file and rename so readers never see partial entries
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(f"{time.time() + ttl_seconds}\n")
+            f.write(value)
+        os.replace(tmp_path, path)
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.directory, key.replace("/", "_"))
+
+
+@dataclass
+class S3Backend(MarketDataCacheBackend):
+    """
+    S3 Backend
+
+    A shared tier that stores entries as objects in S3 so that all Lambda
+    containers reuse market data fetched by any one of them.
+    """
+
+    KEY_FORMAT = "{prefix}/{key}.json"
+
+    client: WalterS3Client
+    bucket: str
+    prefix: str = "market-data"
+
+    def get(self, key: str) -> str | None:
+        contents = self.client.get_object_if_exists(self.bucket, self._get_key(key))
+        if contents is None:
+            return None
+        expires_at, _, value = contents.partition("\n")
+        if float(expires_at) <= time.time():
+            return None
+        return value
+
+    def put(self, key: str, value: str, ttl_seconds: int) -> None:
+        self.client.put_object(
+            self.bucket, self._get_key(key), f"{time.time() + ttl_seconds}\n{value}"
+        )
+
+    def _get_key(self, key: str) -> str:
+        return S3Backend.KEY_FORMAT.format(prefix=self.prefix, key=key)
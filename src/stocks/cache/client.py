@@ -0,0 +1,118 @@
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List
+
+from src.stocks.cache.backends import InMemoryBackend, MarketDataCacheBackend
+from src.stocks.polygon.models import StockNews, StockPrice, StockPrices
+from src.utils.log import Logger
+
+log = Logger(__name__).get_logger()
+
+
+@dataclass
+class MarketDataCache:
+    """
+    Market Data Cache
+
+    Caches stock prices and news keyed by stock symbol and query window so
+    that market data shared by many portfolios, e.g. popular stocks over the
+    same week, is fetched from Polygon once per time-to-live rather than once
+    per user. The storage tier is pluggable, see `MarketDataCacheBackend`.
+    """
+
+    PRICES_KEY_FORMAT = "prices/{symbol}/{start_date}/{end_date}"
+    NEWS_KEY_FORMAT = "news/{symbol}/{start_date}"
+    DEFAULT_TTL_SECONDS = 60 * 60
+
+    backend: MarketDataCacheBackend = field(default_factory=InMemoryBackend)
+    ttl_seconds: int = DEFAULT_TTL_SECONDS
+
+    def __post_init__(self) -> None:
+        log.debug(
+            f"Creating MarketDataCache with backend '{type(self.backend).__name__}'"
+        )
+
+    def get_prices(
+        self, symbol: str, start_date: datetime, end_date: datetime
+    ) -> StockPrices | None:
+        value = self.backend.get(
+            MarketDataCache._get_prices_key(symbol, start_date, end_date)
+        )
+        if value is None:
+            return None
+        return StockPrices(
+            prices=[
+                StockPrice(
+                    symbol=price["symbol"],
+                    price=price["price"],
+                    timestamp=datetime.fromisoformat(price["timestamp"]),
+                )
+                for price in json.loads(value)
+            ]
+        )
+
+    def put_prices(
+        self,
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime,
+        prices: StockPrices,
+    ) -> None:
+        self.backend.put(
+            MarketDataCache._get_prices_key(symbol, start_date, end_date),
+            json.dumps([price.to_dict() for price in prices.prices]),
+            self.ttl_seconds,
+        )
+
+    def get_news(self, symbol: str, start_date: datetime) -> StockNews | None:
+        value = self.backend.get(MarketDataCache._get_news_key(symbol, start_date))
+        if value is None:
+            return None
+        return StockNews(symbol=symbol, descriptions=json.loads(value))
+
+    def put_news(self, symbol: str, start_date: datetime, news: StockNews) -> None:
+        self.backend.put(
+            MarketDataCache._get_news_key(symbol, start_date),
+            json.dumps(news.descriptions),
+            self.ttl_seconds,
+        )
+
+    def batch_get_prices(
+        self, symbols: List[str], start_date: datetime, end_date: datetime
+    ) -> Dict[str, StockPrices]:
+        prices = {}
+        for symbol in symbols:
+            cached = self.get_prices(symbol, start_date, end_date)
+            if cached is not None:
+                prices[symbol] = cached
+        log.info(
+            f"Market data cache hit for prices of {len(prices)}/{len(symbols)} stocks"
+        )
+        return prices
+
+    def batch_get_news(
+        self, symbols: List[str], start_date: datetime
+    ) -> Dict[str, StockNews]:
+        news = {}
+        for symbol in symbols:
+            cached = self.get_news(symbol, start_date)
+            if cached is not None:
+                news[symbol] = cached
+        log.info(f"Market data cache hit for news of {len(news)}/{len(symbols)} stocks")
+        return news
+
+    @staticmethod
+    def _get_prices_key(symbol: str, start_date: datetime, end_date: datetime) -> str:
+        # polygon queries are issued at daily granularity so the window is keyed by date
+        return MarketDataCache.PRICES_KEY_FORMAT.format(
+            symbol=symbol,
+            start_date=start_date.strftime("%Y-%m-%d"),
+            end_date=end_date.strftime("%Y-%m-%d"),
+        )
+
+    @staticmethod
+    def _get_news_key(symbol: str, start_date: datetime) -> str:
+        return MarketDataCache.NEWS_KEY_FORMAT.format(
+            symbol=symbol, start_date=start_date.strftime("%Y-%m-%d")
+        )
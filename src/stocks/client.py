@@ -1,14 +1,15 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict
+from typing import Callable, Dict, List
 
 from src.database.stocks.models import Stock
 from src.database.userstocks.models import UserStock
 from src.stocks.alphavantage.client import AlphaVantageClient
 from src.stocks.alphavantage.models import CompanyOverview, CompanyNews
-from src.stocks.models import Portfolio
-from src.stocks.polygon.client import PolygonClient
-from src.stocks.polygon.models import StockPrices
+from src.stocks.cache.client import MarketDataCache
+from src.stocks.models import MarketDataSnapshot, Portfolio
+from src.stocks.polygon.client import PolygonBatchError, PolygonClient
+from src.stocks.polygon.models import StockNews, StockPrices
 from src.utils.log import Logger
 
 log = Logger(__name__).get_logger()
@@ -18,10 +19,15 @@ log = Logger(__name__).get_logger()
 class WalterStocksAPI:
     """
     WalterStocksAPI
+
+    Portfolio market data is read through the optional market data cache so
+    that prices and news for stocks held by many users are only fetched from
+    Polygon once per cache time-to-live.
     """
 
     polygon: PolygonClient
     alpha_vantage: AlphaVantageClient
+    cache: MarketDataCache = None
 
     def __post_init__(self) -> None:
         log.debug("Creating WalterStocksAPI")
@@ -32,10 +38,59 @@ class WalterStocksAPI:
         stocks: Dict[str, Stock],
         start_date: datetime,
         end_date: datetime,
+        snapshot: MarketDataSnapshot = None,
     ) -> Portfolio:
-        prices = self.polygon.batch_get_prices(user_stocks, start_date, end_date)
-        news = self.polygon.batch_get_news(user_stocks, start_date)
-        return Portfolio(stocks, user_stocks, prices, news)
+        # serve market data from the pre-warmed snapshot where possible and
+        # only fetch stocks missing from the snapshot
+        snapshot_prices, snapshot_news = {}, {}
+        if snapshot is not None and snapshot.covers(start_date, end_date):
+            snapshot_prices = WalterStocksAPI._order_by(user_stocks, snapshot.prices)
+            snapshot_news = WalterStocksAPI._order_by(user_stocks, snapshot.news)
+
+        prices = snapshot_prices
+        misses = WalterStocksAPI._get_misses(user_stocks, snapshot_prices)
+        if misses:
+            prices.update(self._get_prices(misses, start_date, end_date))
+
+        news = snapshot_news
+        misses = WalterStocksAPI._get_misses(user_stocks, snapshot_news)
+        if misses:
+            news.update(self._get_news(misses, start_date))
+
+        return Portfolio(
+            stocks,
+            user_stocks,
+            WalterStocksAPI._order_by(user_stocks, prices),
+            WalterStocksAPI._order_by(user_stocks, news),
+        )
+
+    def get_market_data_snapshot(
+        self, symbols: List[str], start_date: datetime, end_date: datetime
+    ) -> MarketDataSnapshot:
+        """
+        Get the prices and news for the given stocks over the given window.
+
+        Args:
+            symbols: The distinct stock symbols to include in the snapshot.
+            start_date: The start date of the window.
+            end_date: The end date of the window.
+
+        Returns:
+            The market data snapshot for the given stocks.
+        """
+        log.info(f"Creating market data snapshot for {len(symbols)} stocks")
+        # stocks missing from the snapshot are fetched per user by WalterBackend
+        try:
+            prices = self.polygon.batch_get_stock_prices(symbols, start_date, end_date)
+        except PolygonBatchError as error:
+            prices = error.results
+        try:
+            news = self.polygon.batch_get_stock_news(symbols, start_date)
+        except PolygonBatchError as error:
+            news = error.results
+        return MarketDataSnapshot(
+            start_date=start_date, end_date=end_date, prices=prices, news=news
+        )
 
     def get_stock(self, symbol: str) -> Stock | None:
         log.info(f"Getting stock '{symbol}'")
@@ -46,13 +101,81 @@ class WalterStocksAPI:
             else None
         )
 
-    def get_news(self, symbol: str) -> CompanyNews | None:
+    def get_news(
+        self,
+        symbol: str,
+        time_from: datetime | None = None,
+        skip_url: Callable[[str], bool] | None = None,
+    ) -> CompanyNews | None:
         log.info(f"Getting news '{symbol}'")
-        return self.alpha_vantage.get_news(symbol)
+        return self.alpha_vantage.get_news(symbol, time_from, skip_url)
 
     def get_prices(self, stock: str) -> StockPrices:
         return self.polygon.get_stock_prices(stock)
 
+    def _get_prices(
+        self,
+        user_stocks: Dict[str, UserStock],
+        start_date: datetime,
+        end_date: datetime,
+    ) -> Dict[str, StockPrices]:
+        if self.cache is None:
+            return self.polygon.batch_get_prices(user_stocks, start_date, end_date)
+
+        prices = self.cache.batch_get_prices(
+            list(user_stocks.keys()), start_date, end_date
+        )
+        misses = WalterStocksAPI._get_misses(user_stocks, prices)
+        if misses:
+            fetched = self.polygon.batch_get_prices(misses, start_date, end_date)
+            for symbol, stock_prices in fetched.items():
+                self.cache.put_prices(symbol, start_date, end_date, stock_prices)
+            prices.update(fetched)
+        return WalterStocksAPI._order_by(user_stocks, prices)
+
+    def _get_news(
+        self, user_stocks: Dict[str, UserStock], start_date: datetime
+    ) -> Dict[str, StockNews]:
+        if self.cache is None:
+            return self._batch_get_news(user_stocks, start_date)
+
+        news = self.cache.batch_get_news(list(user_stocks.keys()), start_date)
+        misses = WalterStocksAPI._get_misses(user_stocks, news)
+        if misses:
+            fetched = self._batch_get_news(misses, start_date)
+            for symbol, stock_news in fetched.items():
+                # news is None for stocks that do not exist in polygon
+                if stock_news is not None:
+                    self.cache.put_news(symbol, start_date, stock_news)
+            news.update(fetched)
+        return WalterStocksAPI._order_by(user_stocks, news)
+
+    def _batch_get_news(
+        self, user_stocks: Dict[str, UserStock], start_date: datetime
+    ) -> Dict[str, StockNews | None]:
+        # news is optional for a newsletter, so stocks whose news could not be
+        # fetched have no news rather than failing the whole portfolio
+        try:
+            return self.polygon.batch_get_news(user_stocks, start_date)
+        except PolygonBatchError as error:
+            news = {symbol: None for symbol in error.failures}
+            news.update(error.results)
+            return WalterStocksAPI._order_by(user_stocks, news)
+
+    @staticmethod
+    def _get_misses(
+        user_stocks: Dict[str, UserStock], cached: dict
+    ) -> Dict[str, UserStock]:
+        return {
+            symbol: stock
+            for symbol, stock in user_stocks.items()
+            if symbol not in cached
+        }
+
+    @staticmethod
+    def _order_by(user_stocks: Dict[str, UserStock], results: dict) -> dict:
+        return {symbol: results[symbol] for symbol in user_stocks if symbol in results}
+
     @staticmethod
     def _get_stock_from_company_overview(overview: CompanyOverview) -> Stock:
         return Stock(
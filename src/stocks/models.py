@@ -1,9 +1,12 @@
+import gzip
+import json
 from dataclasses import dataclass
+from datetime import datetime
 from typing import Dict, List
 
 from src.database.stocks.models import Stock
 from src.database.userstocks.models import UserStock
-from src.stocks.polygon.models import StockPrices, StockNews
+from src.stocks.polygon.models import StockPrice, StockPrices, StockNews
 
 
 @dataclass(frozen=True)
@@ -73,3 +76,75 @@ class Portfolio:
             equity = self.get_equity(stock)
             stock_equities.append(StockEquity(stock, company, price, quantity, equity))
         return stock_equities
+
+
+@dataclass(frozen=True)
+class MarketDataSnapshot:
+    """
+    Market Data Snapshot
+
+    The prices and news for a set of stocks over a single query window. The
+    snapshot is serialized as gzip-compressed JSON with prices stored column
+    by column, i.e. one list per field rather than one object per price, to
+    keep the payload compact.
+    """
+
+    start_date: datetime
+    end_date: datetime
+    prices: Dict[str, StockPrices]  # indexed by stock symbol
+    news: Dict[str, StockNews]  # indexed by stock symbol
+
+    def covers(self, start_date: datetime, end_date: datetime) -> bool:
+        return self.start_date == start_date and self.end_date == end_date
+
+    def to_bytes(self) -> bytes:
+        symbols, prices, timestamps = [], [], []
+        for stock_prices in self.prices.values():
+            for price in stock_prices.prices:
+                symbols.append(price.symbol)
+                prices.append(price.price)
+                timestamps.append(price.timestamp.isoformat())
+        return gzip.compress(
+            json.dumps(
+                {
+                    "start_date": self.start_date.isoformat(),
+                    "end_date": self.end_date.isoformat(),
+                    "prices": {
+                        "symbol": symbols,
+                        "price": prices,
+                        "timestamp": timestamps,
+                    },
+                    "news": {
+                        symbol: news.descriptions
+                        for symbol, news in self.news.items()
+                        if news is not None
+                    },
+                },
+                separators=(",", ":"),
+            ).encode()
+        )
+
+    @staticmethod
+    def from_bytes(contents: bytes) -> "MarketDataSnapshot":
+        snapshot = json.loads(gzip.decompress(contents))
+        columns = snapshot["prices"]
+        prices = {}
+        for symbol, price, timestamp in zip(
+            columns["symbol"], columns["price"], columns["timestamp"]
+        ):
+            prices.setdefault(symbol, StockPrices(prices=[])).prices.append(
+                StockPrice(
+                    symbol=symbol,
+                    price=price,
+                    timestamp=datetime.fromisoformat(timestamp),
+                )
+            )
+        return MarketDataSnapshot(
+            start_date=datetime.fromisoformat(snapshot["start_date"]),
+            end_date=datetime.fromisoformat(snapshot["end_date"]),
+            prices=prices,
+            news={
+                symbol: StockNews(symbol=symbol, descriptions=descriptions)
+                for symbol, descriptions in snapshot["news"].items()
+            },
+        )
@@ -1,18 +1,38 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime, timedelta, UTC
-from typing import Dict, List
-
-import polygon.exceptions
-from polygon import RESTClient
-from polygon.rest.models.aggs import Agg
+from typing import TYPE_CHECKING, Callable, Dict, List, TypeVar
 
 from src.database.userstocks.models import UserStock
 from src.environment import Domain
 from src.stocks.polygon.models import StockPrice, StockPrices, StockNews, PolygonStock
 from src.utils.log import Logger
+from src.utils.tracing import traced
+
+if TYPE_CHECKING:
+    from polygon import RESTClient
+    from polygon.rest.models.aggs import Agg
 
 log = Logger(__name__).get_logger()
 
+T = TypeVar("T")
+
+
+class PolygonBatchError(Exception):
+    """
+    Polygon Batch Error
+
+    Raised when a batch request to Polygon failed for one or more stock
+    symbols. The results of the symbols that succeeded are kept so that callers
+    that can tolerate missing symbols may still use them.
+    """
+
+    def __init__(self, failures: Dict[str, Exception], results: Dict) -> None:
+        super().__init__(f"Failed to get data from Polygon for {sorted(failures)}!")
+        self.failures = failures
+        self.results = results
+
 
 @dataclass
 class PolygonClient:
@@ -24,22 +44,37 @@ class PolygonClient:
     current news as well. The data returned from Polygon is included
     in the context given to the LLMs to help write tailored newsletters
     for users with the latest prices and relevant news.
+
+    Batch methods fan out one request per stock symbol across a bounded
+    thread pool so that a portfolio costs roughly one round trip rather
+    than one per stock. Every symbol is requested even if some fail, and the
+    failed symbols are then raised together as a PolygonBatchError that also
+    carries the results of the symbols that succeeded.
     """
 
     MAX_AGGREGATE_DATA_LIMIT = 50000
+    DEFAULT_MAX_CONCURRENT_REQUESTS = 8
 
-    api_key: str
-    client: RESTClient = None  # lazy init
+    get_api_key: Callable[[], str]
+    client: "RESTClient" = None  # lazy init
+    max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS
+
+    client_api_key: str = None  # the api key of the rest client
 
     def __post_init__(self) -> None:
         log.debug(f"Creating {Domain.PRODUCTION.value} Polygon client")
+        if self.client is not None:
+            self.client_api_key = self.get_api_key()
 
+    @traced("Polygon.GetTickerDetails")
     def get_stock(self, symbol: str) -> PolygonStock | None:
+        from polygon.exceptions import BadResponse
+
         self._init_rest_client()
         try:
             details = self.client.get_ticker_details(ticker=symbol)
             return PolygonStock(symbol=details.ticker, company=details.name)
-        except polygon.BadResponse:
+        except BadResponse:
             log.info(f"{symbol} does not exist in Polygon!")
             return None
 
@@ -59,58 +94,31 @@ class PolygonClient:
         Returns:
             The prices over the given timeframe for the batch of stocks.
         """
-        self._init_rest_client()
-
-        prices = {}
-        for stock in stocks.values():
-            prices[stock.stock_symbol] = self.get_prices(stock, start_date, end_date)
-
-        return prices
+        return self.batch_get_stock_prices(list(stocks.keys()), start_date, end_date)
 
-    def get_prices(
-        self, stock: UserStock, start_date: datetime, end_date: datetime
-    ) -> StockPrices:
+    def batch_get_stock_prices(
+        self, symbols: List[str], start_date: datetime, end_date: datetime
+    ) -> Dict[str, StockPrices]:
         """
-        This method gets prices from Polygon for a single stock over the given timeframe.
-
-        https://polygon.io/docs/stocks/get_v2_aggs_ticker__stocksticker__range__multiplier___timespan___from___to
+        This method gets prices from Polygon for a batch of stock symbols over the given timeframe.
 
         Args:
-            stock: The stock to get pricing data from Polygon.
-            start_date: The start date of the query to get pricing data.
-            end_date: The end date of the query to get pricing data.
+            symbols: The stock symbols to get pricing data from Polygon.
+            start_date: The start date of the query.
+            end_date: The end date of the query.
 
         Returns:
-            The prices for the stock over the given timeframe.
+            The prices over the given timeframe indexed by stock symbol.
         """
         self._init_rest_client()
+        PolygonClient._validate_date_range(start_date, end_date)
 
-        log.info(
-            f"Getting aggregate data for '{stock.stock_symbol}' from '{start_date}' to '{end_date}'"
+        return self._fan_out(
+            symbols,
+            lambda symbol: self.get_stock_prices(symbol, start_date, end_date),
         )
 
-        if start_date >= end_date:
-            raise ValueError(
-                f"start date '{start_date}' is after end date '{end_date}'!"
-            )
-
-        prices = []
-        for agg in self.client.list_aggs(
-            ticker=stock.stock_symbol,
-            multiplier=1,
-            timespan="hour",
-            from_=PolygonClient._convert_date_to_string(start_date),
-            to=PolygonClient._convert_date_to_string(end_date),
-            limit=PolygonClient.MAX_AGGREGATE_DATA_LIMIT,
-        ):
-            prices.append(
-                PolygonClient._convert_agg_to_stock_price(stock.stock_symbol, agg)
-            )
-
-        log.info(f"Successfully returned {len(prices)} prices")
-
-        return StockPrices(prices)
-
+    @traced("Polygon.GetAggregates")
     def get_stock_prices(
         self,
         stock: str,
@@ -133,11 +141,7 @@ class PolygonClient:
         log.info(
             f"Getting pricing data for '{stock}' from '{start_date}' to '{end_date}'"
         )
-
-        if start_date >= end_date:
-            raise ValueError(
-                f"start date '{start_date}' is after end date '{end_date}'!"
-            )
+        PolygonClient._validate_date_range(start_date, end_date)
 
         prices = []
         for agg in self.client.list_aggs(
@@ -157,13 +161,38 @@ class PolygonClient:
     def batch_get_news(
         self, stocks: Dict[str, UserStock], latest_published_date: datetime
     ) -> Dict[str, List[StockNews]]:
-        news = {}
-        for stock in stocks.values():
-            news[stock.stock_symbol] = self.get_news(
-                stock.stock_symbol, latest_published_date
-            )
-        return news
+        """
+        This method gets news from Polygon for a batch of stocks.
+
+        Args:
+            stocks: The stocks to get news from Polygon.
+            latest_published_date: The oldest published date of news returned for the stocks.
+
+        Returns:
+            The news for the batch of stocks.
+        """
+        return self.batch_get_stock_news(list(stocks.keys()), latest_published_date)
+
+    def batch_get_stock_news(
+        self, symbols: List[str], latest_published_date: datetime
+    ) -> Dict[str, StockNews]:
+        """
+        This method gets news from Polygon for a batch of stock symbols.
+
+        Args:
+            symbols: The stock symbols to get news from Polygon.
+            latest_published_date: The oldest published date of news returned for the stocks.
+
+        Returns:
+            The news indexed by stock symbol.
+        """
+        self._init_rest_client()
+        return self._fan_out(
+            symbols,
+            lambda symbol: self.get_news(symbol, latest_published_date),
+        )
 
+    @traced("Polygon.ListTickerNews")
     def get_news(self, stock: str, oldest_published_date: datetime) -> StockNews | None:
         """
         Get relevant news for the given stock over the timeframe.
@@ -177,6 +206,8 @@ class PolygonClient:
         Returns:
             Market news for the given stock.
         """
+        from polygon.exceptions import BadResponse
+
         self._init_rest_client()
         log.info(
             f"Getting news for '{stock}' with a latest published date of '{oldest_published_date}'"
@@ -193,22 +224,80 @@ class PolygonClient:
             ):
                 descriptions.append(n.description)
             return StockNews(symbol=stock, descriptions=descriptions)
-        except polygon.BadResponse:
+        except BadResponse:
             log.info(f"{stock} does not exist in Polygon!")
             return None
 
-    def _init_rest_client(self) -> RESTClient:
-        # lazy init polygon rest client
-        if self.client is None:
-            self.client = RESTClient(api_key=self.api_key)
+    def _fan_out(self, symbols: List[str], request: Callable[[str], T]) -> Dict[str, T]:
+        """
+        Execute the given request for each stock symbol concurrently.
+
+        At most `max_concurrent_requests` requests are in flight at once. A
+        failed request does not cancel the requests of the other symbols.
+
+        Args:
+            symbols: The stock symbols to execute the request for.
+            request: The request to execute for each stock symbol.
+
+        Returns:
+            The request results indexed by stock symbol in the order of the given symbols.
+
+        Raises:
+            PolygonBatchError: If the request failed for any of the symbols.
+        """
+        if not symbols:
+            return {}
+
+        results, failures = {}, {}
+        max_workers = max(1, min(self.max_concurrent_requests, len(symbols)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # requests run in a copy of the caller's context so that their
+            # downstream call timers are recorded in the caller's trace
+            futures = {
+                executor.submit(contextvars.copy_context().run, request, symbol): symbol
+                for symbol in symbols
+            }
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    results[symbol] = future.result()
+                except Exception as exception:
+                    log.error(
+                        f"Unexpected error occurred getting data for '{symbol}' from Polygon!\n"
+                        f"Error: {exception}"
+                    )
+                    failures[symbol] = exception
+
+        results = {symbol: results[symbol] for symbol in symbols if symbol in results}
+        if failures:
+            raise PolygonBatchError(failures=failures, results=results)
+        return results
+
+    def _init_rest_client(self) -> "RESTClient":
+        # lazy init polygon rest client, the polygon package is imported on first
+        # use as it is expensive to import and most entrypoints never call polygon
+        # the rest client is recreated if the api key has been rotated since
+        api_key = self.get_api_key()
+        if self.client is None or api_key != self.client_api_key:
+            from polygon import RESTClient
+
+            self.client = RESTClient(api_key=api_key)
+            self.client_api_key = api_key
         return self.client
 
+    @staticmethod
+    def _validate_date_range(start_date: datetime, end_date: datetime) -> None:
+        if start_date >= end_date:
+            raise ValueError(
+                f"start date '{start_date}' is after end date '{end_date}'!"
+            )
+
     @staticmethod
     def _convert_date_to_string(date: datetime) -> str:
         return date.strftime("%Y-%m-%d")
 
     @staticmethod
-    def _convert_agg_to_stock_price(symbol: str, agg: Agg) -> StockPrice:
+    def _convert_agg_to_stock_price(symbol: str, agg: "Agg") -> StockPrice:
         return StockPrice(
             symbol=symbol,
             price=agg.open,
@@ -1,4 +1,7 @@
+import threading
+import time
 from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
 
 from src.aws.s3.client import WalterS3Client
 from src.environment import Domain
@@ -8,6 +11,18 @@ from src.utils.log import Logger
 log = Logger(__name__).get_logger()
 
 
+@dataclass
+class CachedTemplateAssets:
+    """
+    Cached Template Assets
+
+    The assets of a template and when they were last validated against S3.
+    """
+
+    assets: TemplateAssets
+    validated_at: float
+
+
 @dataclass
 class TemplatesBucket:
     """
@@ -24,13 +39,20 @@ class TemplatesBucket:
     TEMPLATE_SPEC = "templatespec.jinja"
     TEMPLATE = "template.jinja"
 
+    DEFAULT_REVALIDATE_ASSETS_AFTER_SECONDS = 300
+
     client: WalterS3Client
     domain: Domain
 
+    revalidate_assets_after_seconds: int = DEFAULT_REVALIDATE_ASSETS_AFTER_SECONDS
+
     bucket: str = None  # set during post init
+    cached_assets: Dict[str, CachedTemplateAssets] = None  # set during post init
 
     def __post_init__(self) -> None:
         self.bucket = TemplatesBucket._get_bucket_name(self.domain)
+        self.cached_assets = {}
+        self._assets_lock = threading.Lock()
         log.debug(
             f"Creating '{self.domain.value}' TemplatesBucket S3 client with bucket '{self.bucket}'"
         )
@@ -71,6 +93,41 @@ class TemplatesBucket:
             name=template, contents=self.client.get_object(self.bucket, key)
         )
 
+    def get_template_spec_if_modified(
+        self, template: str = DEFAULT_TEMPLATE, etag: Optional[str] = None
+    ) -> Tuple[Optional[str], str]:
+        """Get template spec from S3 if it has been modified since the given ETag.
+
+        Args:
+            template (str, optional): The name of the template to get the template spec.
+            etag (str, optional): The ETag of the template spec held by the caller.
+
+        Returns:
+            Tuple[Optional[str], str]: The template spec, or None if not modified, and its ETag.
+        """
+        log.info(f"Revalidating '{template}' template spec from S3")
+        key = TemplatesBucket._get_template_spec_key(template)
+        return self.client.get_object_if_modified(self.bucket, key, etag)
+
+    def get_template_if_modified(
+        self, template: str = DEFAULT_TEMPLATE, etag: Optional[str] = None
+    ) -> Tuple[Optional[Template], str]:
+        """Get Jinja template from S3 if it has been modified since the given ETag.
+
+        Args:
+            template (str, optional): The name of the template to get the Jinja template.
+            etag (str, optional): The ETag of the Jinja template held by the caller.
+
+        Returns:
+            Tuple[Optional[Template], str]: The Jinja template, or None if not modified, and its ETag.
+        """
+        log.info(f"Revalidating '{template}' template from S3")
+        key = TemplatesBucket._get_template_key(template)
+        contents, etag = self.client.get_object_if_modified(self.bucket, key, etag)
+        if contents is None:
+            return None, etag
+        return Template(name=template, contents=contents), etag
+
     def get_template_assets(self, template: str = DEFAULT_TEMPLATE) -> TemplateAssets:
         """Get template assets from S3.
 
@@ -79,27 +136,55 @@ class TemplatesBucket:
         template. Templates that reference external assets must have their assets in S3
         in order to generate the emails successfully.
 
+        Assets are cached per template for the life of the bucket client. Once the cached
+        assets are older than the revalidation interval, the assets prefix is listed and
+        only the assets whose ETags changed are downloaded again.
+
         Args:
             template_name (str, optional): The name of the template to get assets from S3.
 
         Returns:
             TemplateAssets: The assets of the given template from S3.
         """
-        log.info(f"Getting '{template}' template assets from S3")
-        prefix = TemplatesBucket._get_assets_prefix(template)
-
-        # for each key get asset name and download object to memory
-        assets = {}
-        for key in self.client.list_objects(self.bucket, prefix):
-            asset_name = key.split("/")[-1]
-
-            # if asset name is empty skip, weird S3 list behavior
-            if asset_name == "":
-                continue
-
-            assets[asset_name] = self.client.download_object(self.bucket, key)
-
-        return TemplateAssets(template, assets)
+        with self._assets_lock:
+            cached = self.cached_assets.get(template)
+            now = time.monotonic()
+
+            if (
+                cached is not None
+                and now - cached.validated_at < self.revalidate_assets_after_seconds
+            ):
+                log.debug(f"Using cached '{template}' template assets")
+                return cached.assets
+
+            log.info(f"Getting '{template}' template assets from S3")
+            prefix = TemplatesBucket._get_assets_prefix(template)
+            previous = cached.assets if cached is not None else None
+
+            # for each key get asset name and download object to memory if modified
+            assets, etags = {}, {}
+            for key, etag in self.client.list_object_etags(self.bucket, prefix).items():
+                asset_name = key.split("/")[-1]
+
+                # if asset name is empty skip, weird S3 list behavior
+                if asset_name == "":
+                    continue
+
+                etags[asset_name] = etag
+                if previous is not None and previous.etags.get(asset_name) == etag:
+                    assets[asset_name] = previous.assets[asset_name]
+                else:
+                    assets[asset_name] = self.client.download_object(self.bucket, key)
+
+            template_assets = (
+                previous
+                if previous is not None and previous.etags == etags
+                else TemplateAssets(template, assets, etags)
+            )
+            self.cached_assets[template] = CachedTemplateAssets(
+                assets=template_assets, validated_at=now
+            )
+            return template_assets
 
     @staticmethod
     def _get_bucket_name(domain: Domain) -> str:
@@ -1,7 +1,11 @@
+import threading
+import time
 from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
 
 import yaml
 from jinja2 import Environment, BaseLoader
+from jinja2 import Template as JinjaTemplate
 from src.templates.models import TemplateSpec, template_spec_from_dict
 
 from src.templates.bucket import TemplatesBucket
@@ -10,27 +14,66 @@ from src.utils.log import Logger
 log = Logger(__name__).get_logger()
 
 
+@dataclass
+class CompiledTemplate:
+    """
+    Compiled Template
+
+    A compiled Jinja template and the S3 ETag of the source it was compiled from.
+    """
+
+    etag: str
+    template: JinjaTemplate
+    validated_at: float
+
+
 @dataclass
 class TemplatesEngine:
     """
     Templates Engine
+
+    Compiled templates are cached for the life of the engine keyed by template
+    name and source file. Once a cached template is older than the revalidation
+    interval, its source is revalidated against S3 with a conditional GET on its
+    ETag and only recompiled if it has been modified.
     """
 
+    DEFAULT_REVALIDATE_AFTER_SECONDS = 300
+
     templates_bucket: TemplatesBucket
+    revalidate_after_seconds: int = DEFAULT_REVALIDATE_AFTER_SECONDS
+
+    environment: Environment = None  # set during post init
+    compiled_templates: Dict[Tuple[str, str], CompiledTemplate] = (
+        None  # set during post init
+    )
+
+    def __post_init__(self) -> None:
+        self.environment = Environment(loader=BaseLoader, auto_reload=False)
+        self.compiled_templates = {}
+        self._lock = threading.Lock()
 
     def get_template_spec(
         self, template_name: str, template_spec_args: dict
     ) -> TemplateSpec:
-        log.info(f"Rendering template spec for '{template_name}' template")
-        template_spec = self.templates_bucket.get_template_spec(template_name)
-        rendered_template_spec = (
-            Environment(loader=BaseLoader)
-            .from_string(template_spec)
-            .render(**template_spec_args)
+        """
+        Render and return the template spec of the given template with the template spec arguments injected.
+
+        Args:
+            template_name: The name of the template to render the template spec.
+            template_spec_args: The dictionary of arguments to inject into the template spec.
+
+        Returns:
+            The rendered template spec.
+        """
+        template_spec = self._get_compiled_template(
+            template_name,
+            TemplatesBucket.TEMPLATE_SPEC,
+            self.templates_bucket.get_template_spec_if_modified,
+        )
+        return self._render_template_spec(
+            template_name, template_spec, template_spec_args
         )
-        spec = template_spec_from_dict(yaml.safe_load(rendered_template_spec))
-        log.info(f"Finished rendering template spec for '{template_name}' template")
-        return spec
 
     def get_template(
         self,
@@ -47,14 +90,94 @@ class TemplatesEngine:
         Returns:
             The rendered template as a string.
         """
+        template = self._get_compiled_template(
+            template_name,
+            TemplatesBucket.TEMPLATE,
+            self._get_template_source_if_modified,
+        )
+        return self._render_template(template_name, template, template_args)
+
+    def _render_template_spec(
+        self,
+        template_name: str,
+        template_spec: JinjaTemplate,
+        template_spec_args: dict,
+    ) -> TemplateSpec:
+        log.info(f"Rendering template spec for '{template_name}' template")
+        rendered_template_spec = template_spec.render(**template_spec_args)
+        spec = template_spec_from_dict(yaml.safe_load(rendered_template_spec))
+        log.info(f"Finished rendering template spec for '{template_name}' template")
+        return spec
+
+    def _render_template(
+        self, template_name: str, template: JinjaTemplate, template_args: dict
+    ) -> str:
         log.info(
             f"Rendering '{template_name}' template with {len(template_args)} arguments"
         )
-        template = self.templates_bucket.get_template(template_name)
-        rendered_template = (
-            Environment(loader=BaseLoader)
-            .from_string(template.contents)
-            .render(**template_args)
-        )
+        rendered_template = template.render(**template_args)
         log.info(f"Finished rendering '{template_name}' template")
         return rendered_template
+
+    def _get_template_source_if_modified(
+        self, template_name: str, etag: Optional[str]
+    ) -> Tuple[Optional[str], str]:
+        template, etag = self.templates_bucket.get_template_if_modified(
+            template_name, etag
+        )
+        return (template.contents if template is not None else None), etag
+
+    def _get_compiled_template(
+        self,
+        template_name: str,
+        source_name: str,
+        get_source_if_modified: Callable[
+            [str, Optional[str]], Tuple[Optional[str], str]
+        ],
+    ) -> JinjaTemplate:
+        """
+        Get the compiled template for the given template source file.
+
+        Args:
+            template_name: The name of the template.
+            source_name: The name of the template source file, e.g. the template spec.
+            get_source_if_modified: Conditionally gets the source given the cached ETag.
+
+        Returns:
+            The compiled Jinja template.
+        """
+        key = (template_name, source_name)
+        with self._lock:
+            cached = self.compiled_templates.get(key)
+            now = time.monotonic()
+
+            if (
+                cached is not None
+                and now - cached.validated_at < self.revalidate_after_seconds
+            ):
+                log.debug(
+                    f"Using cached '{source_name}' for '{template_name}' template"
+                )
+                return cached.template
+
+            source, etag = get_source_if_modified(
+                template_name, cached.etag if cached is not None else None
+            )
+
+            if source is None:
+                log.debug(
+                    f"Cached '{source_name}' for '{template_name}' template not modified"
+                )
+                cached.validated_at = now
+                return cached.template
+
+            log.info(
+                f"Compiling '{source_name}' for '{template_name}' template with ETag {etag}"
+            )
+            compiled = CompiledTemplate(
+                etag=etag,
+                template=self.environment.from_string(source),
+                validated_at=now,
+            )
+            self.compiled_templates[key] = compiled
+            return compiled.template
@@ -1,5 +1,5 @@
 import datetime as dt
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from io import BytesIO
 from typing import Dict
 from typing import List
@@ -15,6 +15,7 @@ class Template:
 class TemplateAssets:
     name: str
     assets: Dict[str, BytesIO]
+    etags: Dict[str, str] = field(default_factory=dict)
 
 
 @dataclass(frozen=True)
@@ -32,7 +33,13 @@ class TemplateContext:
     stocks: list
     news: str
 
-    def get_context(self) -> str:
+    def get_context(self, news: str | None = None) -> str:
+        """
+        Get the context of the template.
+
+        Args:
+            news: The optional news to provide instead of the news of the template spec.
+        """
         return f"""
 The current user is {self.user} and the date is {self.datestamp}. The total value of the user's portfolio as of this
 date is ${self.portfolio_value:.2f} and the stocks owned by the user are {self.stocks}. When analyzing stocks, focus on 
@@ -42,7 +49,7 @@ Also, read the following market news about the stocks in the user's portfolio to
 the user's stocks. Remember to focus specifically on the stocks owned by the user as to avoid telling the user about stocks
 they do not own. Feel free to throw in some jokes too.
 
-{self.news}
+{self.news if news is None else news}
 """
 
 
@@ -88,8 +95,8 @@ class TemplateSpec:
     keys: List[TemplateKey]
     prompts: List[TemplatePrompt]
 
-    def get_context(self) -> str:
-        return self.context.get_context()
+    def get_context(self, news: str | None = None) -> str:
+        return self.context.get_context(news)
 
     def get_prompts(self) -> List[TemplatePrompt]:
         return self.prompts
@@ -0,0 +1,55 @@
+import functools
+import time
+from typing import Callable
+
+from src import clients
+from src.utils.log import Logger
+
+log = Logger(__name__).get_logger()
+
+
+def measure_cold_start(entrypoint: Callable[[dict, dict], dict]) -> Callable:
+    """
+    Measure the cold start of the given Lambda entrypoint.
+
+    The first invocation of the entrypoint in a container logs the duration of
+    the invocation and the clients it initialized, along with the time spent
+    creating each of them. Warm invocations are not measured.
+
+    Args:
+        entrypoint: The Lambda entrypoint to measure.
+
+    Returns:
+        The wrapped entrypoint.
+    """
+    cold = True
+
+    @functools.wraps(entrypoint)
+    def wrapper(event, context) -> dict:
+        nonlocal cold
+        if not cold:
+            return entrypoint(event, context)
+        cold = False
+
+        initialized = clients.get_initialization_durations()
+        start = time.perf_counter()
+        try:
+            return entrypoint(event, context)
+        finally:
+            duration = (time.perf_counter() - start) * 1000
+            durations = {
+                name: initialization
+                for name, initialization in clients.get_initialization_durations().items()
+                if name not in initialized
+            }
+            log.info(
+                f"Cold start of '{entrypoint.__name__}' took {duration:.2f}ms, "
+                f"of which {sum(durations.values()):.2f}ms was spent initializing "
+                f"{len(durations)} clients: "
+                + ", ".join(
+                    f"{name}={initialization:.2f}ms"
+                    for name, initialization in durations.items()
+                )
+            )
+
+    return wrapper
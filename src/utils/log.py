@@ -1,11 +1,178 @@
+import atexit
+import functools
+import json
 import os
 import sys
+import threading
 from dataclasses import dataclass
-from logging import FileHandler, Formatter, Handler, Logger, StreamHandler, getLogger
+from datetime import UTC, datetime
+from logging import Formatter, Handler, Logger, LogRecord, StreamHandler, getLogger
+from logging.handlers import QueueHandler, QueueListener
+from queue import Queue
+from typing import Any, Callable
 
-import coloredlogs
+LOG_FORMAT = "%(asctime)s :: %(levelname)s :: %(name)s :: %(message)s"
 
-LOG_FILE = os.getenv("LOGS_WORKING_DIR", "./") + "logs.log"
+LOG_OUTPUT = os.getenv(
+    "LOG_OUTPUT", "json" if "AWS_LAMBDA_FUNCTION_NAME" in os.environ else "text"
+)
+"""(str): The format of log lines, either "json" (the default in Lambda) or "text"."""
+
+MAX_PAYLOAD_CHARS = int(os.getenv("LOG_MAX_PAYLOAD_CHARS", "2048"))
+"""(int): The maximum number of characters of a payload included in a log record."""
+
+REDACTED = "<redacted>"
+
+SENSITIVE_KEYS = frozenset(
+    {
+        "authorization",
+        "cookie",
+        "set-cookie",
+        "x-api-key",
+        "password",
+        "new_password",
+        "password_hash",
+        "token",
+        "access_token",
+        "refresh_token",
+        "id_token",
+        "secret",
+        "api_key",
+    }
+)
+"""(frozenset): The case-insensitive keys whose values are redacted from log payloads."""
+
+
+class Payload:
+    """
+    Log Payload
+
+    A payload, e.g. an API Gateway event or a DDB item, passed as a log argument
+    rather than formatted into the log message:
+
+        log.debug("Invoking API with event: %s", Payload(event))
+
+    The payload is only serialized if the log record is emitted, i.e. if the
+    log level is enabled. Values of sensitive keys are redacted, including
+    within JSON encoded strings such as request bodies, and the serialized
+    payload is truncated to at most `max_chars` characters.
+    """
+
+    __slots__ = ("value", "max_chars")
+
+    def __init__(self, value: Any, max_chars: int = MAX_PAYLOAD_CHARS) -> None:
+        self.value = value
+        self.max_chars = max_chars
+
+    def __str__(self) -> str:
+        serialized = json.dumps(
+            Payload._redact(self.value), default=str, separators=(",", ":")
+        )
+        if len(serialized) > self.max_chars:
+            truncated = len(serialized) - self.max_chars
+            serialized = (
+                f"{serialized[:self.max_chars]}...<truncated {truncated} chars>"
+            )
+        return serialized
+
+    @staticmethod
+    def _redact(value: Any) -> Any:
+        if isinstance(value, dict):
+            return {
+                key: (
+                    REDACTED
+                    if str(key).lower() in SENSITIVE_KEYS
+                    else Payload._redact(item)
+                )
+                for key, item in value.items()
+            }
+        if isinstance(value, (list, tuple)):
+            return [Payload._redact(item) for item in value]
+        if isinstance(value, str) and value[:1] in ("{", "["):
+            # request bodies are JSON encoded strings that may contain credentials
+            try:
+                return Payload._redact(json.loads(value))
+            except ValueError:
+                return value
+        return value
+
+
+class JSONFormatter(Formatter):
+    """
+    JSON Formatter
+
+    Formats each log record as a single line JSON document so that log lines
+    can be queried by field in CloudWatch Logs Insights.
+    """
+
+    def format(self, record: LogRecord) -> str:
+        document = {
+            "timestamp": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            document["exception"] = self.formatException(record.exc_info)
+        return json.dumps(document, default=str)
+
+
+_lock = threading.Lock()
+_queue: Queue | None = None
+_handler: Handler | None = None
+_listener: QueueListener | None = None
+
+
+def _get_formatter() -> Formatter:
+    if LOG_OUTPUT == "json":
+        return JSONFormatter()
+    if sys.stdout.isatty():
+        # coloredlogs is only needed for interactive terminals, import it on first use
+        import coloredlogs
+
+        return coloredlogs.ColoredFormatter(fmt=LOG_FORMAT)
+    return Formatter(LOG_FORMAT)
+
+
+def _get_shared_handler() -> Handler:
+    """
+    Get the process-wide log handler shared by all Walter loggers.
+
+    Log records are put on a queue by the logging thread and formatted and
+    written to stdout by a single background listener so that callers do not
+    block on I/O. The handler stack is created once, on first use.
+    """
+    global _queue, _handler, _listener
+    with _lock:
+        if _handler is None:
+            console_handler = StreamHandler(sys.stdout)
+            console_handler.setFormatter(_get_formatter())
+            _queue = Queue()
+            _listener = QueueListener(_queue, console_handler)
+            _listener.start()
+            atexit.register(_listener.stop)
+            _handler = QueueHandler(_queue)
+        return _handler
+
+
+def flush_logs(entrypoint: Callable[[dict, dict], dict]) -> Callable:
+    """
+    Wait for the log records of each invocation of the decorated entrypoint to be written.
+
+    Lambda freezes the container once the entrypoint returns, so log records
+    still on the queue would otherwise only be written on the next invocation,
+    or lost if the container is shut down.
+    """
+
+    @functools.wraps(entrypoint)
+    def wrapper(event, context) -> dict:
+        try:
+            return entrypoint(event, context)
+        finally:
+            if _queue is not None:
+                _queue.join()
+
+    return wrapper
 
 
 @dataclass
@@ -13,30 +180,20 @@ class Logger:
 
     name: str
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
-    formatter: Formatter = Formatter(
-        "%(asctime)s :: %(levelname)s :: %(name)s :: %(message)s"
-    )
-
-    def _get_console_handler(self) -> Handler:
-        console_handler = StreamHandler(sys.stdout)
-        console_handler.setLevel(self.log_level)
-        console_handler.setFormatter(self.formatter)
-        return console_handler
-
-    def _get_file_handler(self, filename: str) -> Handler:
-        file_handler = FileHandler(filename, mode="a+")
-        file_handler.setLevel(self.log_level)
-        file_handler.setFormatter(self.formatter)
-        return file_handler
 
     def get_logger(self) -> Logger:
+        """
+        Get the named logger with the shared Walter handler.
+
+        This method is idempotent, i.e. calling it more than once for the same
+        name returns the same logger without adding another handler. Records are
+        not propagated to the root logger as the Lambda runtime installs its own
+        handler there, which would write each record twice.
+        """
         logger = getLogger(self.name)
         logger.setLevel(self.log_level)
-        logger.addHandler(self._get_console_handler())
-        # logger.addHandler(self._get_file_handler(filename=LOG_FILE))
-        coloredlogs.install(
-            fmt="%(asctime)s :: %(levelname)s :: %(name)s :: %(message)s",
-            level=self.log_level,
-            logger=logger,
-        )
+        handler = _get_shared_handler()
+        if handler not in logger.handlers:
+            logger.addHandler(handler)
+        logger.propagate = False
         return logger
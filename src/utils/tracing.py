@@ -0,0 +1,165 @@
+import functools
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from src.config import CONFIG
+
+
+class SpanKind(Enum):
+    """
+    Span Kind
+
+    STAGE: A stage of the API pipeline, e.g. request validation.
+    DOWNSTREAM: A call to a downstream dependency, e.g. DynamoDB or Polygon.
+    """
+
+    STAGE = "Stage"
+    DOWNSTREAM = "Downstream"
+
+
+@dataclass(frozen=True)
+class Span:
+    """
+    Span
+
+    A timed unit of work within a trace.
+    """
+
+    name: str
+    kind: SpanKind
+    duration_ms: float
+
+
+@dataclass
+class Trace:
+    """
+    Trace
+
+    The spans recorded during a single invocation. Spans may be recorded
+    concurrently from worker threads that copied the invocation context.
+    """
+
+    spans: List[Span] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+
+    def record(self, name: str, kind: SpanKind, duration_ms: float) -> None:
+        with self._lock:
+            self.spans.append(Span(name, kind, duration_ms))
+
+    def get_totals(self) -> Dict[Tuple[SpanKind, str], Tuple[float, int]]:
+        """
+        Get the total duration in milliseconds and count of the spans of each name.
+        """
+        totals = {}
+        with self._lock:
+            for span in self.spans:
+                duration_ms, count = totals.get((span.kind, span.name), (0.0, 0))
+                totals[(span.kind, span.name)] = (
+                    duration_ms + span.duration_ms,
+                    count + 1,
+                )
+        return totals
+
+    def to_server_timing(self) -> str:
+        """
+        Format the trace as a Server-Timing header value.
+
+        See for more info: https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/Server-Timing
+        """
+        return ", ".join(
+            f'{name.replace(".", "-").lower()};dur={duration_ms:.2f};desc="{kind.value} x{count}"'
+            for (kind, name), (duration_ms, count) in self.get_totals().items()
+        )
+
+
+_trace: ContextVar[Trace | None] = ContextVar("trace", default=None)
+
+
+@contextmanager
+def start_trace() -> Iterator[Trace]:
+    """
+    Start a trace that collects the spans recorded within the enclosed block.
+    """
+    trace = Trace()
+    token = _trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _trace.reset(token)
+
+
+@contextmanager
+def span(name: str, kind: SpanKind = SpanKind.STAGE) -> Iterator[None]:
+    """
+    Time the enclosed block as a span of the current trace, if any.
+    """
+    trace = _trace.get()
+    if trace is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.record(name, kind, (time.perf_counter() - start) * 1000)
+
+
+def traced(name: str) -> Callable[[Callable], Callable]:
+    """
+    Time calls to the decorated downstream call as spans of the current trace.
+
+    Downstream call timers are opt-in via the `trace_downstream_calls` config
+    and are a no-op outside of a trace. Generator functions are timed for the
+    time spent producing items rather than the time to create the generator.
+
+    Args:
+        name: The name of the downstream call, e.g. "DynamoDB.GetItem".
+    """
+
+    def decorator(func: Callable) -> Callable:
+        if inspect.isgeneratorfunction(func):
+
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                trace = _trace.get()
+                if trace is None or not CONFIG.trace_downstream_calls:
+                    yield from func(*args, **kwargs)
+                    return
+
+                duration_ms = 0.0
+                generator = func(*args, **kwargs)
+                try:
+                    while True:
+                        start = time.perf_counter()
+                        try:
+                            item = next(generator)
+                        except StopIteration:
+                            return
+                        finally:
+                            duration_ms += (time.perf_counter() - start) * 1000
+                        yield item
+                finally:
+                    generator.close()
+                    trace.record(name, SpanKind.DOWNSTREAM, duration_ms)
+
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not CONFIG.trace_downstream_calls:
+                return func(*args, **kwargs)
+            with span(name, SpanKind.DOWNSTREAM):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
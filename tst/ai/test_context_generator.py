@@ -0,0 +1,85 @@
+from src.ai.context.generator import ContextGenerator
+from src.database.stocks.models import Stock
+from src.database.userstocks.models import UserStock
+from src.knowledge.base import WalterKnowledgeBase
+from src.stocks.alphavantage.models import CompanyNews
+from src.stocks.models import Portfolio
+from src.stocks.polygon.models import StockNews
+
+PORTFOLIO = Portfolio(
+    stocks={
+        "AAPL": Stock(symbol="AAPL", company="Apple"),
+        "META": Stock(symbol="META", company="Meta"),
+    },
+    user_stocks={
+        "AAPL": UserStock(
+            user_email="walter@gmail.com", stock_symbol="AAPL", quantity=1
+        ),
+        "META": UserStock(
+            user_email="walter@gmail.com", stock_symbol="META", quantity=1
+        ),
+    },
+    prices={},
+    news={
+        "AAPL": StockNews(symbol="AAPL", descriptions=["Apple description"]),
+        "META": StockNews(
+            symbol="META", descriptions=["Meta one", "Meta two", "Meta three"]
+        ),
+    },
+)
+
+
+def test_get_news_context_retrieves_top_k_passages(
+    walter_knowledge_base: WalterKnowledgeBase,
+) -> None:
+    walter_knowledge_base.add_news(
+        CompanyNews(
+            symbol="AAPL",
+            news={
+                "apple-earnings": "Apple beats earnings estimates",
+                "apple-campus": "Apple opens a new campus in Austin",
+            },
+            urls={},
+        )
+    )
+    context_generator = ContextGenerator(knowledge_base=walter_knowledge_base, top_k=1)
+    assert (
+        context_generator.get_news_context(PORTFOLIO)
+        == "AAPL:\nApple beats earnings estimates\n\nMETA:\nMeta one"
+    )
+
+
+def test_get_news_context_caches_news_indexes(
+    walter_knowledge_base: WalterKnowledgeBase, mocker
+) -> None:
+    get_news_index = mocker.spy(walter_knowledge_base, "get_news_index")
+    context_generator = ContextGenerator(knowledge_base=walter_knowledge_base)
+    context_generator.get_news_context(PORTFOLIO)
+    context_generator.get_news_context(PORTFOLIO)
+    assert get_news_index.call_count == 2
+
+
+def test_get_news_context_without_news(
+    walter_knowledge_base: WalterKnowledgeBase,
+) -> None:
+    portfolio = Portfolio(
+        stocks=PORTFOLIO.stocks,
+        user_stocks=PORTFOLIO.user_stocks,
+        prices={},
+        news={"AAPL": None, "META": PORTFOLIO.news["META"]},
+    )
+    context_generator = ContextGenerator(knowledge_base=walter_knowledge_base, top_k=1)
+    assert context_generator.get_news_context(portfolio) == "META:\nMeta one"
+
+
+def test_get_news_context_index_cache_is_bounded(
+    walter_knowledge_base: WalterKnowledgeBase, mocker
+) -> None:
+    get_news_index = mocker.spy(walter_knowledge_base, "get_news_index")
+    context_generator = ContextGenerator(
+        knowledge_base=walter_knowledge_base, index_cache_max_size=1
+    )
+    context_generator.get_news_context(PORTFOLIO)
+    assert list(context_generator.indexes) == ["META"]
+    context_generator.get_news_context(PORTFOLIO)
+    assert get_news_index.call_count == 4
@@ -1,8 +1,11 @@
+import json
+
 import pytest
 
 from src.api.auth_user import AuthUser
 from src.api.common.methods import Status, HTTPStatus
 from src.auth.authenticator import WalterAuthenticator
+from src.auth.passwords import get_password_hashing_service
 from src.aws.cloudwatch.client import WalterCloudWatchClient
 from src.aws.secretsmanager.client import WalterSecretsManagerClient
 from src.database.client import WalterDB
@@ -39,3 +42,20 @@ def test_auth_user_failure_user_does_not_exist(auth_user_api: AuthUser) -> None:
         message="User not found!",
     )
     assert expected_response == auth_user_api.invoke(event)
+
+
+def test_auth_user_rehashes_stale_password_hash(
+    auth_user_api: AuthUser, walter_db: WalterDB
+) -> None:
+    walter_db.authenticator.passwords = get_password_hashing_service("bcrypt", 4)
+    walter_db.create_user("sally@gmail.com", "sally", "password")
+    walter_db.authenticator.passwords = get_password_hashing_service("scrypt", 10)
+
+    response = auth_user_api.invoke(
+        get_auth_user_event(email="sally@gmail.com", password="password")
+    )
+
+    assert json.loads(response["body"])["Status"] == Status.SUCCESS.value
+    password_hash = walter_db.get_user("sally@gmail.com").password_hash
+    assert password_hash.startswith("$scrypt$ln=10,")
+    assert walter_db.authenticator.check_password("password", password_hash)
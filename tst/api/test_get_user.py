@@ -1,11 +1,13 @@
 import pytest
 
+from src.api.common import methods
 from src.api.get_user import GetUser
 from src.api.common.methods import HTTPStatus, Status
 from src.auth.authenticator import WalterAuthenticator
 from src.aws.cloudwatch.client import WalterCloudWatchClient
 from src.aws.secretsmanager.client import WalterSecretsManagerClient
 from src.database.client import WalterDB
+from src.environment import Domain
 from tst.api.utils import get_get_user_event, get_expected_response
 
 
@@ -40,3 +42,65 @@ def test_get_user_failure_user_does_not_exist(get_user_api: GetUser) -> None:
         message="Not authenticated!",
     )
     assert expected_response == get_user_api.invoke(event)
+
+
+def test_get_user_flushes_metrics_once(
+    get_user_api: GetUser, jwt_walter: str, mocker
+) -> None:
+    put_metric_data = mocker.spy(get_user_api.metrics.client, "put_metric_data")
+    get_user_api.invoke(get_get_user_event(token=jwt_walter))
+    put_metric_data.assert_called_once()
+    assert [
+        metric["MetricName"]
+        for metric in put_metric_data.call_args.kwargs["MetricData"]
+    ] == [
+        "GetUser.SuccessCount",
+        "GetUser.FailureCount",
+        "GetUser.TotalCount",
+        "GetUser.Latency",
+        "GetUser.StageLatency",
+        "GetUser.StageLatency",
+        "GetUser.StageLatency",
+    ]
+
+
+def test_get_user_stage_latency_dimensions(
+    get_user_api: GetUser, jwt_walter: str, mocker
+) -> None:
+    put_metric_data = mocker.spy(get_user_api.metrics.client, "put_metric_data")
+    get_user_api.invoke(get_get_user_event(token=jwt_walter))
+    assert [
+        metric["Dimensions"]
+        for metric in put_metric_data.call_args.kwargs["MetricData"]
+        if metric["MetricName"] == "GetUser.StageLatency"
+    ] == [
+        [{"Name": "Stage", "Value": stage}]
+        for stage in ["Validate", "Authenticate", "Execute"]
+    ]
+
+
+def test_get_user_debug_header(get_user_api: GetUser, jwt_walter: str) -> None:
+    event = get_get_user_event(token=jwt_walter)
+    event["headers"]["X-Walter-Debug"] = "true"
+    response = get_user_api.invoke(event)
+    server_timing = response["headers"]["Server-Timing"]
+    assert server_timing.startswith("validate;dur=")
+    assert "authenticate;dur=" in server_timing
+    assert "execute;dur=" in server_timing
+    assert response["headers"]["Access-Control-Expose-Headers"] == "Server-Timing"
+    assert (
+        "Server-Timing"
+        not in get_user_api.invoke(get_get_user_event(token=jwt_walter))["headers"]
+    )
+
+
+def test_get_user_debug_header_ignored_in_production(
+    get_user_api: GetUser, jwt_walter: str, monkeypatch
+) -> None:
+    monkeypatch.setattr(methods, "DOMAIN", Domain.PRODUCTION)
+    # copy the shared test event so the debug header does not leak into other tests
+    event = dict(get_get_user_event(token=jwt_walter))
+    event["headers"] = {**event["headers"], "X-Walter-Debug": "true"}
+    response = get_user_api.invoke(event)
+    assert "Server-Timing" not in response["headers"]
+    assert "Access-Control-Expose-Headers" not in response["headers"]
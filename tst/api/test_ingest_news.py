@@ -0,0 +1,109 @@
+import pytest
+
+from src.api.common.methods import HTTPStatus, Status
+from src.api.ingest_news import IngestNews
+from src.auth.authenticator import WalterAuthenticator
+from src.aws.cloudwatch.client import WalterCloudWatchClient
+from src.database.client import WalterDB
+from src.knowledge.base import WalterKnowledgeBase
+from src.stocks.alphavantage.client import AlphaVantageError
+from src.stocks.alphavantage.models import CompanyNews
+from tst.api.utils import get_expected_response, get_ingest_news_event
+
+
+@pytest.fixture
+def walter_stocks_api(mocker):
+    walter_stocks_api = mocker.Mock()
+
+    def get_news(symbol: str, time_from=None, skip_url=None) -> CompanyNews:
+        url = "https://news.com/shared"
+        if skip_url(url):
+            return CompanyNews(symbol=symbol, news={})
+        return CompanyNews(
+            symbol=symbol, news={"shared": "Shared article"}, urls={"shared": url}
+        )
+
+    walter_stocks_api.get_news.side_effect = get_news
+    return walter_stocks_api
+
+
+@pytest.fixture
+def ingest_news_api(
+    walter_authenticator: WalterAuthenticator,
+    walter_cw: WalterCloudWatchClient,
+    walter_db: WalterDB,
+    walter_stocks_api,
+    walter_knowledge_base: WalterKnowledgeBase,
+) -> IngestNews:
+    return IngestNews(
+        walter_authenticator,
+        walter_cw,
+        walter_db,
+        walter_stocks_api,
+        walter_knowledge_base,
+    )
+
+
+def test_ingest_news_incremental(
+    ingest_news_api: IngestNews, walter_stocks_api, mocker
+) -> None:
+    put_object = mocker.spy(ingest_news_api.walter_knowledge_base.s3, "put_object")
+    expected_response = get_expected_response(
+        api_name=IngestNews.API_NAME,
+        status_code=HTTPStatus.OK,
+        status=Status.SUCCESS,
+        message="Ingested news!",
+    )
+    assert expected_response == ingest_news_api.invoke(get_ingest_news_event())
+
+    # the shared article is written and indexed for each stock, followed by the manifest
+    assert put_object.call_args.args[1] == WalterKnowledgeBase.MANIFEST_KEY
+    assert (
+        put_object.call_count == 2 * len(walter_stocks_api.get_news.call_args_list) + 1
+    )
+    assert all(
+        call.kwargs["time_from"] is None
+        for call in walter_stocks_api.get_news.call_args_list
+    )
+
+    walter_stocks_api.get_news.reset_mock()
+    put_object.reset_mock()
+    assert expected_response == ingest_news_api.invoke(get_ingest_news_event())
+
+    # the second run only requests news since the first run and writes nothing but the manifest
+    assert put_object.call_count == 1
+    assert all(
+        call.kwargs["time_from"] is not None
+        for call in walter_stocks_api.get_news.call_args_list
+    )
+
+
+def test_ingest_news_skips_failed_stocks(
+    ingest_news_api: IngestNews, walter_stocks_api, mocker
+) -> None:
+    get_news = walter_stocks_api.get_news.side_effect
+    failed = []
+
+    def mock_get_news(symbol: str, time_from=None, skip_url=None) -> CompanyNews:
+        if not failed:
+            failed.append(symbol)
+            raise AlphaVantageError(symbol, {"Information": "Rate limit exceeded"})
+        return get_news(symbol, time_from=time_from, skip_url=skip_url)
+
+    walter_stocks_api.get_news.side_effect = mock_get_news
+    expected_response = get_expected_response(
+        api_name=IngestNews.API_NAME,
+        status_code=HTTPStatus.OK,
+        status=Status.SUCCESS,
+        message="Ingested news!",
+    )
+    assert expected_response == ingest_news_api.invoke(get_ingest_news_event())
+
+    # the stocks after the failed stock are still ingested
+    assert walter_stocks_api.get_news.call_count > 1
+    manifest = ingest_news_api.walter_knowledge_base.get_manifest()
+    assert manifest.get_last_ingested(failed[0]) is None
+    assert all(
+        manifest.get_last_ingested(call.args[0]) is not None
+        for call in walter_stocks_api.get_news.call_args_list[1:]
+    )
@@ -1,17 +1,17 @@
+import datetime as dt
+
+import jwt
+
 from src.auth.authenticator import WalterAuthenticator
 
 
 def test_check_password(walter_authenticator: WalterAuthenticator) -> None:
     incorrect_password = "incorrect"
     password = "password"
-    salt, hashed_password = walter_authenticator.hash_password(password)
+    hashed_password = walter_authenticator.hash_password(password)
+    assert walter_authenticator.check_password(password, hashed_password) is True
     assert (
-        walter_authenticator.check_password(password, hashed_password.decode()) is True
-    )
-    assert (
-        walter_authenticator.check_password(
-            incorrect_password, hashed_password.decode()
-        )
+        walter_authenticator.check_password(incorrect_password, hashed_password)
         is False
     )
 
@@ -22,3 +22,76 @@ def test_validate_user_token(walter_authenticator: WalterAuthenticator) -> None:
     decoded_token = walter_authenticator.decode_user_token(token)
     assert decoded_token["sub"] == "walter@gmail.com"
     assert walter_authenticator.decode_user_token("test-token") is None
+
+
+def test_decode_user_token_cached(
+    walter_authenticator: WalterAuthenticator, mocker
+) -> None:
+    token = walter_authenticator.generate_user_token("walter@gmail.com")
+    decode = mocker.spy(jwt, "decode")
+    first = walter_authenticator.decode_user_token(token)
+    first["sub"] = "modified"
+    assert walter_authenticator.decode_user_token(token)["sub"] == "walter@gmail.com"
+    assert decode.call_count == 1
+
+
+def test_decode_user_token_cache_respects_expiry(
+    walter_authenticator: WalterAuthenticator, mocker
+) -> None:
+    token = walter_authenticator.generate_user_token("walter@gmail.com")
+    claims = walter_authenticator.decode_user_token(token)
+    mocker.patch("src.auth.authenticator.time.time", return_value=claims["exp"])
+    decode = mocker.spy(jwt, "decode")
+    walter_authenticator.decode_user_token(token)
+    assert decode.call_count == 1
+
+
+def test_decode_user_token_expired_not_cached(
+    walter_authenticator: WalterAuthenticator,
+) -> None:
+    token = jwt.encode(
+        {"sub": "walter@gmail.com", "exp": dt.datetime.now(dt.UTC)},
+        walter_authenticator.walter_sm.get_jwt_secret_key(),
+        algorithm="HS256",
+    )
+    assert walter_authenticator.decode_user_token(token) is None
+    assert len(walter_authenticator.verified_tokens) == 0
+
+
+def test_decode_user_token_revoked(walter_authenticator: WalterAuthenticator) -> None:
+    revoked = set()
+    walter_authenticator.is_token_revoked = lambda claims: claims["sub"] in revoked
+    token = walter_authenticator.generate_user_token("walter@gmail.com")
+    assert walter_authenticator.decode_user_token(token) is not None
+    revoked.add("walter@gmail.com")
+    assert walter_authenticator.decode_user_token(token) is None
+
+
+def test_decode_user_token_cache_is_bounded(
+    walter_authenticator: WalterAuthenticator,
+) -> None:
+    walter_authenticator.token_cache_max_size = 2
+    for email in ["walter@gmail.com", "walrus@gmail.com", "wally@gmail.com"]:
+        walter_authenticator.decode_user_token(
+            walter_authenticator.generate_user_token(email)
+        )
+    assert [
+        verified.claims["sub"]
+        for verified in walter_authenticator.verified_tokens.values()
+    ] == ["walrus@gmail.com", "wally@gmail.com"]
+
+
+def test_decode_user_token_cache_misses_rotated_secret(
+    walter_authenticator: WalterAuthenticator, mocker
+) -> None:
+    token = walter_authenticator.generate_user_token("walter@gmail.com")
+    assert walter_authenticator.decode_user_token(token) is not None
+    mocker.patch.object(
+        walter_authenticator.walter_sm,
+        "get_jwt_secret_key",
+        return_value="test-rotated-jwt-secret-key",
+    )
+    decode = mocker.spy(jwt, "decode")
+    # the token is verified again with the rotated secret and is no longer valid
+    assert walter_authenticator.decode_user_token(token) is None
+    assert decode.call_count == 1
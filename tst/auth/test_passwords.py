@@ -0,0 +1,60 @@
+import time
+
+import pytest
+
+from src.auth.passwords import (
+    BcryptHasher,
+    PasswordHasher,
+    ScryptHasher,
+    get_password_hashing_service,
+)
+
+BENCHMARK_ITERATIONS = 3
+
+BENCHMARK_HASHERS = [BcryptHasher(rounds) for rounds in [4, 6, 8, 10, 12]] + [
+    ScryptHasher(log_n) for log_n in [10, 12, 14]
+]
+
+
+@pytest.mark.parametrize("hasher", [BcryptHasher(4), ScryptHasher(10)])
+def test_hash_and_verify(hasher: PasswordHasher) -> None:
+    password_hash = hasher.hash("password")
+    assert hasher.identifies(password_hash)
+    assert hasher.verify("password", password_hash)
+    assert not hasher.verify("incorrect", password_hash)
+    assert password_hash != hasher.hash("password")
+
+
+def test_needs_rehash() -> None:
+    assert not BcryptHasher(4).needs_rehash(BcryptHasher(4).hash("password"))
+    assert BcryptHasher(5).needs_rehash(BcryptHasher(4).hash("password"))
+    assert not ScryptHasher(10).needs_rehash(ScryptHasher(10).hash("password"))
+    assert ScryptHasher(11).needs_rehash(ScryptHasher(10).hash("password"))
+
+
+def test_service_verifies_legacy_hashes() -> None:
+    service = get_password_hashing_service("scrypt", 10)
+    bcrypt_hash = BcryptHasher(4).hash("password")
+    assert service.verify("password", bcrypt_hash)
+    assert service.needs_rehash(bcrypt_hash)
+    assert not service.needs_rehash(service.hash("password"))
+    assert not service.verify("password", "unknown")
+
+
+@pytest.mark.benchmark
+def test_benchmark_password_hashing(capsys) -> None:
+    """
+    Report the password hashes per second of each hashing scheme and cost to
+    size the memory, and so the CPU, of the Lambda functions that hash passwords.
+    """
+    results = []
+    for hasher in BENCHMARK_HASHERS:
+        start = time.perf_counter()
+        for _ in range(BENCHMARK_ITERATIONS):
+            hasher.hash("password")
+        results.append((hasher, BENCHMARK_ITERATIONS / (time.perf_counter() - start)))
+
+    with capsys.disabled():
+        print("\nPassword hashes per second:")
+        for hasher, hashes_per_second in results:
+            print(f"  {hasher}: {hashes_per_second:.1f}")
@@ -0,0 +1,123 @@
+import json
+
+from src.aws.cloudwatch.client import MetricsMode, WalterCloudWatchClient
+from src.environment import Domain
+
+
+def test_emit_metric_buffered_until_flush(
+    walter_cw: WalterCloudWatchClient, mocker
+) -> None:
+    put_metric_data = mocker.spy(walter_cw.client, "put_metric_data")
+
+    walter_cw.emit_metric("Test.SuccessCount", 1)
+    walter_cw.emit_metric("Test.SuccessCount", 1)
+    walter_cw.emit_metric("Test.FailureCount", 0)
+    assert put_metric_data.call_count == 0
+
+    walter_cw.flush()
+    walter_cw.flush()
+
+    put_metric_data.assert_called_once_with(
+        Namespace="WalterBackend/unittest",
+        MetricData=[
+            {
+                "MetricName": "Test.SuccessCount",
+                "Unit": "Count",
+                "Dimensions": [],
+                "Values": [1],
+                "Counts": [2],
+            },
+            {
+                "MetricName": "Test.FailureCount",
+                "Unit": "Count",
+                "Dimensions": [],
+                "Values": [0],
+                "Counts": [1],
+            },
+        ],
+    )
+
+
+def test_put_metric_with_dimensions(walter_cw: WalterCloudWatchClient, mocker) -> None:
+    put_metric_data = mocker.spy(walter_cw.client, "put_metric_data")
+
+    walter_cw.emit_metric("Test.TotalCount", 1, {"API": "GetUser"})
+    walter_cw.emit_metric("Test.TotalCount", 1, {"API": "AddStock"})
+    walter_cw.flush()
+
+    metric_data = put_metric_data.call_args.kwargs["MetricData"]
+    assert [metric["Dimensions"] for metric in metric_data] == [
+        [{"Name": "API", "Value": "GetUser"}],
+        [{"Name": "API", "Value": "AddStock"}],
+    ]
+
+
+def test_timer(walter_cw: WalterCloudWatchClient, mocker) -> None:
+    put_metric_data = mocker.spy(walter_cw.client, "put_metric_data")
+
+    with walter_cw.timer("Test.Latency"):
+        pass
+    walter_cw.flush()
+
+    (metric,) = put_metric_data.call_args.kwargs["MetricData"]
+    assert metric["MetricName"] == "Test.Latency"
+    assert metric["Unit"] == "Milliseconds"
+    assert metric["Counts"] == [1]
+
+
+def test_flush_error_does_not_raise(walter_cw: WalterCloudWatchClient, mocker) -> None:
+    mocker.patch.object(
+        walter_cw.client, "put_metric_data", side_effect=Exception("Error")
+    )
+    walter_cw.emit_metric("Test.TotalCount", 1)
+    walter_cw.flush()
+
+
+def test_flush_emf(cloud_watch_client, capsys, mocker) -> None:
+    walter_cw = WalterCloudWatchClient(
+        client=cloud_watch_client, domain=Domain.TESTING, mode=MetricsMode.EMF
+    )
+    put_metric_data = mocker.spy(walter_cw.client, "put_metric_data")
+
+    walter_cw.emit_metric("Test.TotalCount", 1, {"API": "GetUser"})
+    walter_cw.emit_metric("Test.TotalCount", 1, {"API": "GetUser"})
+    walter_cw.put_metric("Test.Latency", 12.5, "Milliseconds", {"API": "GetUser"})
+    walter_cw.flush()
+
+    (line,) = capsys.readouterr().out.splitlines()
+    document = json.loads(line)
+    assert document["_aws"]["CloudWatchMetrics"] == [
+        {
+            "Namespace": "WalterBackend/unittest",
+            "Dimensions": [["API"]],
+            "Metrics": [
+                {"Name": "Test.TotalCount", "Unit": "Count"},
+                {"Name": "Test.Latency", "Unit": "Milliseconds"},
+            ],
+        }
+    ]
+    assert document["API"] == "GetUser"
+    assert document["Test.TotalCount"] == [1, 1]
+    assert document["Test.Latency"] == 12.5
+    assert put_metric_data.call_count == 0
+
+
+def test_flush_emf_splits_documents_at_limits(cloud_watch_client, capsys) -> None:
+    walter_cw = WalterCloudWatchClient(
+        client=cloud_watch_client, domain=Domain.TESTING, mode=MetricsMode.EMF
+    )
+    for i in range(WalterCloudWatchClient.MAX_METRICS_PER_EMF_DOCUMENT + 1):
+        walter_cw.emit_metric(f"Test.Metric{i}", 1)
+    for _ in range(WalterCloudWatchClient.MAX_VALUES_PER_EMF_METRIC + 1):
+        walter_cw.emit_metric("Test.Metric0", 1)
+    walter_cw.flush()
+
+    documents = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [
+        len(document["_aws"]["CloudWatchMetrics"][0]["Metrics"])
+        for document in documents
+    ] == [100, 1, 1]
+    values = [
+        document["Test.Metric0"] for document in documents if "Test.Metric0" in document
+    ]
+    assert [len(value) for value in values] == [100, 2]
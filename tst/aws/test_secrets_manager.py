@@ -1,4 +1,8 @@
+import json
+import time
+
 import pytest
+from botocore.exceptions import ClientError
 
 from src.aws.secretsmanager.client import WalterSecretsManagerClient
 from src.environment import Domain
@@ -31,3 +35,117 @@ def test_get_jwt_secret_key(
         walter_secrets_manager_client.get_jwt_secret_key()
         == SECRETS_MANAGER_JWT_SECRET_KEY_SECRET_VALUE
     )
+
+
+def test_prefetch_secrets_in_one_call(
+    walter_secrets_manager_client: WalterSecretsManagerClient, mocker
+) -> None:
+    batch_get_secret_value = mocker.spy(
+        walter_secrets_manager_client.client, "batch_get_secret_value"
+    )
+    get_secret_value = mocker.spy(
+        walter_secrets_manager_client.client, "get_secret_value"
+    )
+
+    walter_secrets_manager_client.prefetch(
+        WalterSecretsManagerClient.USER_TOKEN_SECRET_IDS
+        + WalterSecretsManagerClient.CHANGE_PASSWORD_SECRET_IDS
+        + [WalterSecretsManagerClient.POLYGON_API_KEY_SECRET_ID]
+    )
+    walter_secrets_manager_client.prefetch(
+        WalterSecretsManagerClient.USER_TOKEN_SECRET_IDS
+    )
+
+    assert (
+        walter_secrets_manager_client.get_jwt_secret_key()
+        == SECRETS_MANAGER_JWT_SECRET_KEY_SECRET_VALUE
+    )
+    assert (
+        walter_secrets_manager_client.get_polygon_api_key()
+        == SECRETS_MANAGER_POLYGON_API_KEY_VALUE
+    )
+    assert batch_get_secret_value.call_count == 1
+    assert get_secret_value.call_count == 0
+
+
+def test_prefetch_skips_missing_secrets(
+    walter_secrets_manager_client: WalterSecretsManagerClient,
+) -> None:
+    walter_secrets_manager_client.prefetch(
+        WalterSecretsManagerClient.MARKET_DATA_SECRET_IDS
+    )
+    assert list(walter_secrets_manager_client.secrets) == [
+        WalterSecretsManagerClient.POLYGON_API_KEY_SECRET_ID
+    ]
+
+
+def test_get_secret_refetches_expired_secret(
+    walter_secrets_manager_client: WalterSecretsManagerClient, mocker
+) -> None:
+    walter_secrets_manager_client.get_jwt_secret_key()
+    walter_secrets_manager_client.client.put_secret_value(
+        SecretId=WalterSecretsManagerClient.JWT_SECRET_KEY_SECRET_ID,
+        SecretString=json.dumps({"JWT_SECRET_KEY": "rotated-jwt-secret-key"}),
+    )
+    assert (
+        walter_secrets_manager_client.get_jwt_secret_key()
+        == SECRETS_MANAGER_JWT_SECRET_KEY_SECRET_VALUE
+    )
+
+    mocker.patch(
+        "src.aws.secretsmanager.client.time.monotonic",
+        return_value=time.monotonic() + WalterSecretsManagerClient.DEFAULT_TTL_SECONDS,
+    )
+    assert (
+        walter_secrets_manager_client.get_jwt_secret_key() == "rotated-jwt-secret-key"
+    )
+
+
+def test_get_secret_refreshes_ahead_of_expiry(
+    walter_secrets_manager_client: WalterSecretsManagerClient, mocker
+) -> None:
+    walter_secrets_manager_client.get_jwt_secret_key()
+    walter_secrets_manager_client.client.put_secret_value(
+        SecretId=WalterSecretsManagerClient.JWT_SECRET_KEY_SECRET_ID,
+        SecretString=json.dumps({"JWT_SECRET_KEY": "rotated-jwt-secret-key"}),
+    )
+    thread = mocker.patch("src.aws.secretsmanager.client.threading.Thread")
+    mocker.patch(
+        "src.aws.secretsmanager.client.time.monotonic",
+        return_value=time.monotonic()
+        + WalterSecretsManagerClient.DEFAULT_TTL_SECONDS
+        - WalterSecretsManagerClient.DEFAULT_REFRESH_AHEAD_SECONDS,
+    )
+
+    # the cached secret is served while it is refreshed in the background
+    assert (
+        walter_secrets_manager_client.get_jwt_secret_key()
+        == SECRETS_MANAGER_JWT_SECRET_KEY_SECRET_VALUE
+    )
+    thread.return_value.start.assert_called_once()
+    thread.call_args.kwargs["target"]()
+    assert (
+        walter_secrets_manager_client.get_jwt_secret_key() == "rotated-jwt-secret-key"
+    )
+
+
+def test_get_secret_uses_expired_secret_on_error(
+    walter_secrets_manager_client: WalterSecretsManagerClient, mocker
+) -> None:
+    walter_secrets_manager_client.get_jwt_secret_key()
+    mocker.patch.object(
+        walter_secrets_manager_client.client,
+        "get_secret_value",
+        side_effect=ClientError(
+            {"Error": {"Code": "InternalServiceError", "Message": "Error"}},
+            "GetSecretValue",
+        ),
+    )
+    mocker.patch(
+        "src.aws.secretsmanager.client.time.monotonic",
+        return_value=time.monotonic() + WalterSecretsManagerClient.DEFAULT_TTL_SECONDS,
+    )
+    assert (
+        walter_secrets_manager_client.get_jwt_secret_key()
+        == SECRETS_MANAGER_JWT_SECRET_KEY_SECRET_VALUE
+    )
@@ -0,0 +1,48 @@
+from email.mime.image import MIMEImage
+from io import BytesIO
+
+from src.aws.ses.client import WalterSESClient
+from src.templates.models import TemplateAssets
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n"
+
+
+def get_assets(contents: bytes, etag: str) -> TemplateAssets:
+    return TemplateAssets(
+        name="default",
+        assets={"logo.png": BytesIO(PNG_HEADER + contents)},
+        etags={"logo.png": etag},
+    )
+
+
+def test_create_email(walter_ses: WalterSESClient) -> None:
+    email = walter_ses._create_email(
+        "walter@gmail.com", "Walter", "<p>Hello</p>", get_assets(b"logo", "etag")
+    )
+    assert "To: walter@gmail.com" in email
+    assert "Content-ID: <logo>" in email
+
+
+def test_create_email_reuses_encoded_assets(
+    walter_ses: WalterSESClient, mocker
+) -> None:
+    encode = mocker.patch("src.aws.ses.client.MIMEImage", wraps=MIMEImage)
+    assets = get_assets(b"logo", "etag")
+
+    first = walter_ses._create_email("walter@gmail.com", "Walter", "<p>A</p>", assets)
+    second = walter_ses._create_email("sally@gmail.com", "Walter", "<p>B</p>", assets)
+
+    assert encode.call_count == 1
+    assert first.split("Content-ID: <logo>")[1].split("--")[0] == (
+        second.split("Content-ID: <logo>")[1].split("--")[0]
+    )
+
+
+def test_create_email_reencodes_modified_assets(
+    walter_ses: WalterSESClient,
+) -> None:
+    walter_ses._create_email(
+        "walter@gmail.com", "Walter", "<p>A</p>", get_assets(b"logo", "v1")
+    )
+    attachments = walter_ses._get_encoded_assets(get_assets(b"new logo", "v2"))
+    assert attachments[0].get_payload(decode=True) == PNG_HEADER + b"new logo"
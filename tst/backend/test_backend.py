@@ -0,0 +1,69 @@
+import datetime as dt
+import json
+
+from src import clients
+from src.backend import backend
+from src.events.parser import WalterEventParser
+from src.stocks.models import MarketDataSnapshot
+
+
+def get_record(i: int) -> dict:
+    return {
+        "messageId": f"test-message-id-{i}",
+        "receiptHandle": f"test-receipt-handle-{i}",
+        "body": json.dumps({"email": f"walter{i}@gmail.com"}),
+    }
+
+
+def test_create_newsletter_and_send_reports_failed_records(monkeypatch, mocker) -> None:
+    # set the clients directly as module attributes so that their factories are not invoked
+    monkeypatch.setitem(vars(clients), "walter_event_parser", WalterEventParser())
+    monkeypatch.setitem(vars(clients), "walter_cw", mocker.Mock())
+    newsletters_queue = mocker.Mock()
+    monkeypatch.setitem(vars(clients), "newsletters_queue", newsletters_queue)
+    mocker.patch.object(backend, "get_newsletter_batch_resources")
+
+    def mock_create_newsletter_and_send_request(request, resources) -> None:
+        if request.email == "walter1@gmail.com":
+            raise Exception("Failed to send newsletter!")
+
+    create_newsletter_and_send_request = mocker.patch.object(
+        backend,
+        "create_newsletter_and_send_request",
+        side_effect=mock_create_newsletter_and_send_request,
+    )
+
+    response = backend.create_newsletter_and_send(
+        {"Records": [get_record(i) for i in range(3)]}, None
+    )
+
+    assert {"batchItemFailures": [{"itemIdentifier": "test-message-id-1"}]} == response
+    assert 3 == create_newsletter_and_send_request.call_count
+    # successful records are deleted by Lambda from the partial batch response
+    newsletters_queue.delete_newsletter_request.assert_not_called()
+
+
+def test_get_market_data_snapshot_reloads_new_window(monkeypatch, mocker) -> None:
+    def mock_get_market_data_snapshot(end_date: dt.datetime) -> MarketDataSnapshot:
+        return MarketDataSnapshot(
+            start_date=end_date - dt.timedelta(days=7),
+            end_date=end_date,
+            prices={},
+            news={},
+        )
+
+    newsletters_bucket = mocker.Mock()
+    newsletters_bucket.get_market_data_snapshot.side_effect = (
+        mock_get_market_data_snapshot
+    )
+    monkeypatch.setitem(vars(clients), "newsletters_bucket", newsletters_bucket)
+    monkeypatch.setattr(backend, "market_data_snapshot", None)
+
+    today = dt.datetime(year=2024, month=10, day=1, tzinfo=dt.UTC)
+    tomorrow = today + dt.timedelta(days=1)
+
+    assert today == backend.get_market_data_snapshot(today).end_date
+    assert today == backend.get_market_data_snapshot(today).end_date
+    # a warm container reloads the snapshot once the window moves on
+    assert tomorrow == backend.get_market_data_snapshot(tomorrow).end_date
+    assert 2 == newsletters_bucket.get_market_data_snapshot.call_count
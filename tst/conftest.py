@@ -27,6 +27,8 @@ from src.database.stocks.models import Stock
 from src.database.users.models import User
 from src.database.userstocks.models import UserStock
 from src.environment import Domain
+from src.knowledge.base import WalterKnowledgeBase
+from src.knowledge.queue import IngestNewsQueue
 from src.newsletters.queue import NewslettersQueue
 from src.stocks.alphavantage.models import CompanyOverview
 from src.stocks.client import WalterStocksAPI
@@ -57,11 +59,35 @@ USERS_TABLE_NAME = "Users-unittest"
 USERS_STOCKS_TABLE_NAME = "UsersStocks-unittest"
 
 NEWSLETTERS_QUEUE_NAME = "NewslettersQueue-unittest"
+INGEST_NEWS_QUEUE_NAME = "IngestNewsQueue-unittest"
 
 STOCKS_TEST_FILE = "tst/database/data/stocks.jsonl"
 USERS_TEST_FILE = "tst/database/data/users.jsonl"
 USERS_STOCKS_TEST_FILE = "tst/database/data/usersstocks.jsonl"
 
+##############
+# BENCHMARKS #
+##############
+
+BENCHMARKS_ENV = "WALTER_BENCHMARKS"
+"""Benchmarks are skipped unless this environment variable is set, e.g. `WALTER_BENCHMARKS=1 pytest -m benchmark`."""
+
+
+def pytest_configure(config) -> None:
+    config.addinivalue_line(
+        "markers", f"benchmark: opt-in benchmark, runs only if {BENCHMARKS_ENV} is set"
+    )
+
+
+def pytest_collection_modifyitems(config, items) -> None:
+    if os.getenv(BENCHMARKS_ENV):
+        return
+    skip = pytest.mark.skip(reason=f"benchmarks only run if {BENCHMARKS_ENV} is set")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
 ###################
 # GLOBAL FIXTURES #
 ###################
@@ -182,6 +208,7 @@ def sqs_client() -> SQSClient:
     with mock_aws():
         mock_sqs = boto3.client("sqs", region_name=AWS_REGION)
         mock_sqs.create_queue(QueueName=NEWSLETTERS_QUEUE_NAME)
+        mock_sqs.create_queue(QueueName=INGEST_NEWS_QUEUE_NAME)
         yield mock_sqs
 
 
@@ -190,6 +217,7 @@ def s3_client() -> S3Client:
     with mock_aws():
         mock_s3 = boto3.client("s3", region_name=AWS_REGION)
         mock_s3.create_bucket(Bucket="walterai-templates-unittest")
+        mock_s3.create_bucket(Bucket="walter-knowledge-base-unittest")
         mock_s3.put_object(
             Bucket="walterai-templates-unittest",
             Key="templates/default/templatespec.jinja",
@@ -383,7 +411,7 @@ def walter_stocks_api(mocker) -> WalterStocksAPI:
 
     return WalterStocksAPI(
         polygon=PolygonClient(
-            api_key=SECRETS_MANAGER_POLYGON_API_KEY_VALUE,
+            get_api_key=lambda: SECRETS_MANAGER_POLYGON_API_KEY_VALUE,
             client=mock_polygon_rest_client,
         ),
         alpha_vantage=MockAlphaVantageClient(),
@@ -404,6 +432,11 @@ def walter_s3(s3_client: S3Client) -> WalterS3Client:
     return WalterS3Client(client=s3_client, domain=Domain.TESTING)
 
 
+@pytest.fixture
+def walter_knowledge_base(walter_s3: WalterS3Client) -> WalterKnowledgeBase:
+    return WalterKnowledgeBase(walter_s3)
+
+
 @pytest.fixture
 def walter_ses(ses_client: SESClient) -> WalterSESClient:
     return WalterSESClient(client=ses_client, domain=Domain.TESTING)
@@ -447,6 +480,13 @@ def newsletters_queue(sqs_client) -> NewslettersQueue:
     )
 
 
+@pytest.fixture
+def ingest_news_queue(sqs_client) -> IngestNewsQueue:
+    return IngestNewsQueue(
+        client=WalterSQSClient(client=sqs_client, domain=Domain.TESTING)
+    )
+
+
 @pytest.fixture
 def jwt_walter(walter_authenticator: WalterAuthenticator) -> str:
     return walter_authenticator.generate_user_token("walter@gmail.com")
@@ -1,6 +1,13 @@
+import logging
+
+import pytest
+from botocore.exceptions import ClientError
+
+from src.aws.dynamodb.client import UnprocessedKeysError
 from src.database.client import WalterDB
 from src.database.users.models import User
 from src.database.userstocks.models import UserStock
+from src.database.userstocks.table import UsersStocksTable
 
 WALTER = User(email="walter@gmail.com", username="walter", password_hash="walter")
 WALRUS = User(
@@ -30,3 +37,164 @@ def test_get_user(walter_db: WalterDB):
 def test_get_stocks_for_user(walter_db: WalterDB):
     assert set(WALTER_STOCKS) == set(walter_db.get_stocks_for_user(WALTER).values())
     assert set(WALRUS_STOCKS) == set(walter_db.get_stocks_for_user(WALRUS).values())
+
+
+def test_get_stocks(walter_db: WalterDB) -> None:
+    stocks = walter_db.get_stocks(["MSFT", "AAPL", "INVALID", "AAPL"])
+    assert ["MSFT", "AAPL"] == list(stocks.keys())
+    assert "Apple" == stocks["AAPL"].company
+
+
+def test_get_stocks_retries_unprocessed_keys(walter_db: WalterDB, mocker) -> None:
+    ddb = walter_db.ddb
+    batch_get_item = ddb.client.batch_get_item
+    calls = []
+
+    def mock_batch_get_item(RequestItems: dict) -> dict:
+        calls.append(RequestItems)
+        if len(calls) == 1:
+            table, request = next(iter(RequestItems.items()))
+            response = batch_get_item(
+                RequestItems={table: {"Keys": request["Keys"][:1]}}
+            )
+            response["UnprocessedKeys"] = {table: {"Keys": request["Keys"][1:]}}
+            return response
+        return batch_get_item(RequestItems=RequestItems)
+
+    mocker.patch.object(ddb.client, "batch_get_item", side_effect=mock_batch_get_item)
+    mocker.patch("src.aws.dynamodb.client.time.sleep")
+
+    stocks = walter_db.get_stocks(["AAPL", "AMZN", "NFLX"])
+
+    assert 2 == len(calls)
+    assert ["AAPL", "AMZN", "NFLX"] == list(stocks.keys())
+
+
+def test_get_stocks_raises_unprocessed_keys(walter_db: WalterDB, mocker) -> None:
+    ddb = walter_db.ddb
+
+    def mock_batch_get_item(RequestItems: dict) -> dict:
+        return {"Responses": {}, "UnprocessedKeys": RequestItems}
+
+    mocker.patch.object(ddb.client, "batch_get_item", side_effect=mock_batch_get_item)
+    mocker.patch("src.aws.dynamodb.client.time.sleep")
+
+    with pytest.raises(UnprocessedKeysError) as error:
+        walter_db.get_stocks(["AAPL", "AMZN"])
+    assert 2 == len(error.value.keys)
+
+
+def test_get_all_stocks(walter_db: WalterDB) -> None:
+    symbols = {"AAPL", "AMZN", "MSFT", "NFLX", "PYPL", "META"}
+    assert symbols == {stock.symbol for stock in walter_db.get_all_stocks()}
+    assert symbols == {stock.symbol for stock in walter_db.get_all_stocks(segments=3)}
+
+
+def test_scan_table_follows_pagination(walter_db: WalterDB, mocker) -> None:
+    ddb = walter_db.ddb
+    scan = ddb.client.scan
+    mocker.patch.object(
+        ddb.client, "scan", side_effect=lambda **kwargs: scan(Limit=2, **kwargs)
+    )
+    items = list(ddb.scan_table(walter_db.stocks_table.table))
+    assert 6 == len(items)
+    assert ddb.client.scan.call_count >= 3
+
+
+def test_scan_table_projection_and_filter(walter_db: WalterDB) -> None:
+    items = list(
+        walter_db.ddb.scan_table(
+            walter_db.stocks_table.table,
+            projection_expression="symbol",
+            filter_expression="company = :company",
+            expression_attribute_values={":company": {"S": "Apple"}},
+        )
+    )
+    assert [{"symbol": {"S": "AAPL"}}] == items
+
+
+def test_get_stocks_for_user_follows_pagination(walter_db: WalterDB, mocker) -> None:
+    query = mocker.spy(walter_db.ddb.client, "query")
+    mocker.patch.object(UsersStocksTable, "QUERY_PAGE_SIZE", 2)
+    assert set(WALTER_STOCKS) == set(walter_db.get_stocks_for_user(WALTER).values())
+    assert query.call_count >= 3
+
+
+def test_get_user_cache_disabled_by_default(walter_db: WalterDB, mocker) -> None:
+    get_item = mocker.spy(walter_db.ddb, "get_item")
+    walter_db.get_user(WALTER.email)
+    walter_db.get_user(WALTER.email)
+    assert get_item.call_count == 2
+
+
+def test_get_user_cached(walter_db: WalterDB, mocker) -> None:
+    walter_db.user_cache_ttl_seconds = 30
+    get_item = mocker.spy(walter_db.ddb, "get_item")
+    user = walter_db.get_user(WALTER.email)
+    user.username = "modified"
+    assert WALTER == walter_db.get_user(WALTER.email)
+    assert get_item.call_count == 1
+
+
+def test_get_user_cache_expires(walter_db: WalterDB, mocker) -> None:
+    walter_db.user_cache_ttl_seconds = 30
+    monotonic = mocker.patch("src.database.client.time.monotonic", return_value=0)
+    get_item = mocker.spy(walter_db.ddb, "get_item")
+    walter_db.get_user(WALTER.email)
+    monotonic.return_value = 31
+    walter_db.get_user(WALTER.email)
+    assert get_item.call_count == 2
+
+
+def test_get_user_cache_write_through(walter_db: WalterDB, mocker) -> None:
+    walter_db.user_cache_ttl_seconds = 30
+    user = walter_db.get_user(WALTER.email)
+    get_item = mocker.spy(walter_db.ddb, "get_item")
+
+    walter_db.verify_user(user)
+    assert walter_db.get_user(WALTER.email).verified
+
+    walter_db.delete_user(WALTER.email)
+    assert walter_db.get_user(WALTER.email) is None
+    assert get_item.call_count == 1
+
+
+def test_create_user_does_not_log_password_hash(walter_db: WalterDB, caplog) -> None:
+    with caplog.at_level(logging.DEBUG):
+        walter_db.create_user("walrus2@gmail.com", "walrus2", "password")
+    password_hash = walter_db.get_user("walrus2@gmail.com").password_hash
+    messages = [
+        record.getMessage()
+        for record in caplog.records
+        if record.name.startswith("src.")
+    ]
+    assert any("walrus2@gmail.com" in message for message in messages)
+    assert not any(password_hash in message for message in messages)
+
+
+def test_get_user_without_cache(walter_db: WalterDB, mocker) -> None:
+    walter_db.user_cache_ttl_seconds = 30
+    walter_db.get_user(WALTER.email)
+    get_item = mocker.spy(walter_db.ddb, "get_item")
+    assert WALTER == walter_db.get_user(WALTER.email, use_cache=False)
+    assert get_item.call_count == 1
+
+
+def test_get_user_cache_not_written_on_failed_write(
+    walter_db: WalterDB, mocker
+) -> None:
+    walter_db.user_cache_ttl_seconds = 30
+    user = walter_db.get_user(WALRUS.email)
+    mocker.patch.object(
+        walter_db.ddb.client,
+        "put_item",
+        side_effect=ClientError(
+            {"Error": {"Code": "InternalServerError", "Message": "Internal error"}},
+            "PutItem",
+        ),
+    )
+
+    walter_db.verify_user(user)
+
+    # the failed write evicts the cached user rather than caching the unwritten user
+    assert not walter_db.get_user(WALRUS.email).verified
@@ -1,12 +1,19 @@
+import datetime as dt
+import json
+
 import pytest
 
-from src.events.parser import WalterEventParser, CreateNewsletterAndSendEvent
+from src.events.parser import (
+    CreateNewsletterAndSendEvent,
+    IngestNewsShardEvent,
+    WalterEventParser,
+)
 from tst.events.utils import get_walter_backend_event
 
 EMAIL = "walter@gmail.com"
 EVENT = get_walter_backend_event(email=EMAIL)
 PARSED_EVENT = CreateNewsletterAndSendEvent(
-    receipt_handle="test-receipt-handle", email=EMAIL
+    receipt_handle="test-receipt-handle", email=EMAIL, message_id="test-message-id"
 )
 
 
@@ -18,4 +25,44 @@ def walter_event_parser() -> WalterEventParser:
 def test_parse_create_newsletter_and_send_event(
     walter_event_parser: WalterEventParser,
 ) -> None:
-    PARSED_EVENT == walter_event_parser.parse_create_newsletter_and_send_event(EVENT)
+    assert PARSED_EVENT == walter_event_parser.parse_create_newsletter_and_send_event(
+        EVENT
+    )
+
+
+def test_parse_create_newsletter_and_send_record(
+    walter_event_parser: WalterEventParser,
+) -> None:
+    record = {
+        "messageId": "test-message-id-1",
+        "receiptHandle": "test-receipt-handle-1",
+        "body": json.dumps({"email": "walter1@gmail.com"}),
+    }
+    assert CreateNewsletterAndSendEvent(
+        receipt_handle="test-receipt-handle-1",
+        email="walter1@gmail.com",
+        message_id="test-message-id-1",
+    ) == walter_event_parser.parse_create_newsletter_and_send_record(record)
+
+
+def test_parse_ingest_news_shard_record(walter_event_parser: WalterEventParser) -> None:
+    record = {
+        "messageId": "test-message-id",
+        "receiptHandle": "test-receipt-handle",
+        "body": json.dumps(
+            {
+                "shard": 1,
+                "num_shards": 4,
+                "symbols": ["AAPL"],
+                "started_at": "2024-10-01T00:00:00+00:00",
+            }
+        ),
+    }
+    assert IngestNewsShardEvent(
+        receipt_handle="test-receipt-handle",
+        shard=1,
+        num_shards=4,
+        symbols=["AAPL"],
+        started_at=dt.datetime(2024, 10, 1, tzinfo=dt.UTC),
+        message_id="test-message-id",
+    ) == walter_event_parser.parse_ingest_news_shard_record(record)
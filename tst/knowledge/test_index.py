@@ -0,0 +1,64 @@
+import datetime as dt
+
+from src.knowledge.index import NewsIndex, tokenize
+
+NOW = dt.datetime(2024, 10, 1, tzinfo=dt.UTC)
+
+
+def get_index() -> NewsIndex:
+    index = NewsIndex(symbol="AAPL")
+    index.add_article(
+        "earnings", None, "Apple beats earnings estimates as iPhone revenue grows", NOW
+    )
+    index.add_article(
+        "campus", None, "Apple opens a new campus in Austin", NOW - dt.timedelta(days=1)
+    )
+    index.add_article("vision", None, "Apple Vision Pro sales are slow", NOW)
+    return index
+
+
+def test_tokenize() -> None:
+    assert tokenize("The iPhone-16 is HERE!") == ["iphone", "16", "here"]
+
+
+def test_search_ranks_by_relevance() -> None:
+    index = get_index()
+    assert [passage.title for passage in index.search("iphone revenue", 2)] == [
+        "earnings",
+        "vision",
+    ]
+
+
+def test_search_without_matches_returns_most_recent() -> None:
+    index = get_index()
+    assert {passage.title for passage in index.search("dividend", 2)} == {
+        "earnings",
+        "vision",
+    }
+
+
+def test_add_article_splits_passages_and_replaces_by_title() -> None:
+    index = NewsIndex(symbol="AAPL")
+    contents = " ".join(f"word{i}" for i in range(NewsIndex.PASSAGE_WORDS + 1))
+    assert index.add_article("long", None, contents, NOW) == 2
+    assert index.add_article("long", None, "Apple stock soars", NOW) == 1
+    assert len(index.passages) == 1
+    assert index.document_frequencies == {"apple": 1, "stock": 1, "soars": 1}
+
+
+def test_add_article_keeps_most_recent_passages(mocker) -> None:
+    mocker.patch.object(NewsIndex, "MAX_PASSAGES", 2)
+    index = get_index()
+    assert {passage.title for passage in index.passages} == {"earnings", "vision"}
+    assert "austin" not in index.document_frequencies
+
+
+def test_prune() -> None:
+    index = get_index()
+    assert index.prune(NOW) == 1
+    assert "campus" not in index.document_frequencies
+
+
+def test_to_json_and_from_json() -> None:
+    index = get_index()
+    assert NewsIndex.from_json(index.to_json()) == index
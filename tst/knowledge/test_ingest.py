@@ -0,0 +1,197 @@
+import datetime as dt
+import json
+
+import pytest
+
+from src import clients
+from src.database.client import WalterDB
+from src.events.parser import IngestNewsShardEvent, WalterEventParser
+from src.knowledge.base import WalterKnowledgeBase
+from src.knowledge.ingest import (
+    add_ingest_news_shards_to_queue,
+    get_shard,
+    ingest_news_shard,
+    ingest_news_shards,
+)
+from src.knowledge.queue import IngestNewsQueue
+from src.stocks.alphavantage.models import CompanyNews
+
+STARTED_AT = dt.datetime(2024, 10, 1, tzinfo=dt.UTC)
+
+
+@pytest.fixture
+def walter_stocks_api(mocker):
+    walter_stocks_api = mocker.Mock()
+
+    def get_news(symbol: str, time_from=None, skip_url=None) -> CompanyNews:
+        url = f"https://news.com/{symbol.lower()}"
+        return CompanyNews(symbol=symbol, news={symbol: "Article"}, urls={symbol: url})
+
+    walter_stocks_api.get_news.side_effect = get_news
+    return walter_stocks_api
+
+
+@pytest.fixture
+def ingest_clients(
+    monkeypatch,
+    walter_db: WalterDB,
+    walter_stocks_api,
+    walter_knowledge_base: WalterKnowledgeBase,
+    ingest_news_queue: IngestNewsQueue,
+) -> None:
+    # set the clients directly as module attributes so that their factories are not invoked
+    for name, value in {
+        "walter_db": walter_db,
+        "walter_stocks_api": walter_stocks_api,
+        "knowledge_base": walter_knowledge_base,
+        "ingest_news_queue": ingest_news_queue,
+        "walter_event_parser": WalterEventParser(),
+    }.items():
+        monkeypatch.setitem(vars(clients), name, value)
+
+
+def get_shard_event(
+    symbols: list, shard: int = 0, num_shards: int = 1
+) -> IngestNewsShardEvent:
+    return IngestNewsShardEvent(
+        receipt_handle="test-receipt-handle",
+        shard=shard,
+        num_shards=num_shards,
+        symbols=symbols,
+        started_at=STARTED_AT,
+    )
+
+
+def test_get_shard_is_stable() -> None:
+    assert get_shard("AAPL", 16) == get_shard("aapl", 16)
+    assert all(0 <= get_shard(symbol, 4) < 4 for symbol in ["AAPL", "META", "MSFT"])
+
+
+def test_add_ingest_news_shards_to_queue(
+    ingest_clients, walter_db: WalterDB, sqs_client, ingest_news_queue: IngestNewsQueue
+) -> None:
+    response = add_ingest_news_shards_to_queue({"num_shards": 2}, None)
+    body = json.loads(response["body"])
+
+    symbols = []
+    while True:
+        messages = sqs_client.receive_message(
+            QueueUrl=ingest_news_queue.queue_url, MaxNumberOfMessages=10
+        )
+        if "Messages" not in messages:
+            break
+        for message in messages["Messages"]:
+            shard = json.loads(message["Body"])
+            assert shard["num_shards"] == 2
+            assert shard["started_at"] == body["started_at"]
+            assert all(get_shard(s, 2) == shard["shard"] for s in shard["symbols"])
+            symbols.extend(shard["symbols"])
+            sqs_client.delete_message(
+                QueueUrl=ingest_news_queue.queue_url,
+                ReceiptHandle=message["ReceiptHandle"],
+            )
+
+    assert body["queued"] == body["shards"]
+    assert sorted(symbols) == sorted(
+        stock.symbol for stock in walter_db.get_all_stocks()
+    )
+
+
+def test_add_ingest_news_shards_to_queue_resumes_run(ingest_clients) -> None:
+    response = add_ingest_news_shards_to_queue(
+        {"started_at": STARTED_AT.isoformat()}, None
+    )
+    assert json.loads(response["body"])["started_at"] == STARTED_AT.isoformat()
+
+    # a naive start time is assumed to be in UTC
+    response = add_ingest_news_shards_to_queue(
+        {"started_at": STARTED_AT.replace(tzinfo=None).isoformat()}, None
+    )
+    assert json.loads(response["body"])["started_at"] == STARTED_AT.isoformat()
+
+
+def test_ingest_news_shard_checkpoints_each_stock(
+    ingest_clients, walter_knowledge_base: WalterKnowledgeBase
+) -> None:
+    assert ingest_news_shard(get_shard_event(["AAPL", "META"])) == 2
+
+    manifest = walter_knowledge_base.get_manifest(0, 1)
+    assert manifest.get_last_ingested("AAPL") >= STARTED_AT
+    assert manifest.get_last_ingested("META") >= STARTED_AT
+    assert manifest.is_known("AAPL", "https://news.com/aapl")
+
+    # the global manifest of single invocation ingestion is left untouched
+    assert walter_knowledge_base.get_manifest().last_ingested == {}
+
+
+def test_ingest_news_shard_resumes_from_checkpoint(
+    ingest_clients, walter_stocks_api
+) -> None:
+    walter_stocks_api.get_news.side_effect = [
+        CompanyNews(symbol="AAPL", news={}),
+        Exception("Throttled!"),
+    ]
+    with pytest.raises(Exception):
+        ingest_news_shard(get_shard_event(["AAPL", "META"]))
+
+    walter_stocks_api.get_news.reset_mock(side_effect=True)
+    walter_stocks_api.get_news.return_value = CompanyNews(symbol="META", news={})
+
+    # the retried shard skips the stock checkpointed by the failed attempt
+    assert ingest_news_shard(get_shard_event(["AAPL", "META"])) == 1
+    assert walter_stocks_api.get_news.call_args.args[0] == "META"
+
+
+def test_ingest_news_shard_does_not_checkpoint_without_feed(
+    ingest_clients, walter_stocks_api, walter_knowledge_base: WalterKnowledgeBase
+) -> None:
+    walter_stocks_api.get_news.side_effect = None
+    walter_stocks_api.get_news.return_value = None
+    assert ingest_news_shard(get_shard_event(["AAPL"])) == 1
+    assert walter_knowledge_base.get_manifest(0, 1).get_last_ingested("AAPL") is None
+
+
+def test_ingest_news_shard_checkpoints_before_failed_articles(
+    ingest_clients, walter_stocks_api, walter_knowledge_base: WalterKnowledgeBase
+) -> None:
+    failed_since = STARTED_AT - dt.timedelta(hours=1)
+    walter_stocks_api.get_news.side_effect = None
+    walter_stocks_api.get_news.return_value = CompanyNews(
+        symbol="AAPL", news={}, failed_since=failed_since
+    )
+    assert ingest_news_shard(get_shard_event(["AAPL"])) == 1
+    assert (
+        walter_knowledge_base.get_manifest(0, 1).get_last_ingested("AAPL")
+        == failed_since
+    )
+
+
+def test_ingest_news_shards_reports_failed_shards(
+    ingest_clients, ingest_news_queue: IngestNewsQueue, mocker
+) -> None:
+    delete_event = mocker.spy(ingest_news_queue.client, "delete_event")
+    shard = {
+        "shard": 0,
+        "num_shards": 1,
+        "symbols": ["AAPL"],
+        "started_at": STARTED_AT.isoformat(),
+    }
+    event = {
+        "Records": [
+            {
+                "messageId": "test-message-id-0",
+                "receiptHandle": "test-receipt-handle-0",
+                "body": json.dumps(shard),
+            },
+            {
+                "messageId": "test-message-id-1",
+                "receiptHandle": "test-receipt-handle-1",
+                "body": "invalid",
+            },
+        ]
+    }
+    assert ingest_news_shards(event, None) == {
+        "batchItemFailures": [{"itemIdentifier": "test-message-id-1"}]
+    }
+    # successful shards are deleted by Lambda from the partial batch response
+    delete_event.assert_not_called()
@@ -0,0 +1,194 @@
+import datetime as dt
+import gzip
+import json
+
+from botocore.exceptions import ClientError
+
+from src.knowledge.base import WalterKnowledgeBase
+from src.knowledge.models import IngestedArticle, IngestionManifest
+from src.stocks.alphavantage.models import CompanyNews
+
+NEWS = CompanyNews(
+    symbol="AAPL",
+    news={"apple-stock-soars": "Apple stock soars", "apple-stock-falls": "Falls"},
+    urls={
+        "apple-stock-soars": "https://news.com/soars",
+        "apple-stock-falls": "https://news.com/falls",
+    },
+)
+
+
+def get_article_puts(put_object) -> list:
+    return [
+        call
+        for call in put_object.call_args_list
+        if not (call.kwargs.get("key") or call.args[1]).startswith("indexes/")
+    ]
+
+
+def test_get_manifest_empty(walter_knowledge_base: WalterKnowledgeBase) -> None:
+    assert walter_knowledge_base.get_manifest() == IngestionManifest()
+
+
+def test_put_and_get_manifest(walter_knowledge_base: WalterKnowledgeBase) -> None:
+    manifest = IngestionManifest()
+    walter_knowledge_base.add_news(NEWS, manifest)
+    manifest.set_last_ingested("aapl", dt.datetime(2024, 1, 1, tzinfo=dt.UTC))
+    walter_knowledge_base.put_manifest(manifest)
+
+    saved = walter_knowledge_base.get_manifest()
+    assert saved == manifest
+    assert saved.get_last_ingested("AAPL") == dt.datetime(2024, 1, 1, tzinfo=dt.UTC)
+    assert saved.is_known("aapl", "https://news.com/soars")
+    assert not saved.is_known("MSFT", "https://news.com/soars")
+
+
+def test_add_news_writes_only_changed_articles(
+    walter_knowledge_base: WalterKnowledgeBase, mocker
+) -> None:
+    manifest = IngestionManifest()
+    put_object = mocker.spy(walter_knowledge_base.s3, "put_object")
+    assert walter_knowledge_base.add_news(NEWS, manifest) == 2
+
+    changed = CompanyNews(
+        symbol="AAPL",
+        news={**NEWS.news, "apple-stock-falls": "Apple stock falls"},
+        urls=NEWS.urls,
+    )
+    assert walter_knowledge_base.add_news(changed, manifest) == 1
+    article_puts = get_article_puts(put_object)
+    assert len(article_puts) == 3
+    assert article_puts[-1].args[2] == "Apple stock falls"
+
+
+def test_add_news_shared_article_to_each_symbol(
+    walter_knowledge_base: WalterKnowledgeBase,
+) -> None:
+    manifest = IngestionManifest()
+    walter_knowledge_base.add_news(NEWS, manifest)
+    shared = CompanyNews(
+        symbol="MSFT",
+        news={"apple-stock-soars": NEWS.news["apple-stock-soars"]},
+        urls={"apple-stock-soars": NEWS.urls["apple-stock-soars"]},
+    )
+
+    # an article known for another symbol is still added to the index of this symbol
+    assert walter_knowledge_base.add_news(shared, manifest) == 1
+    assert manifest.is_known("MSFT", "https://news.com/soars")
+    assert [
+        passage.url for passage in walter_knowledge_base.get_news_index("MSFT").passages
+    ] == ["https://news.com/soars"]
+
+
+def test_manifest_from_json_by_url() -> None:
+    manifest = IngestionManifest.from_json(
+        json.dumps(
+            {
+                "last_ingested": {},
+                "articles": {
+                    "https://news.com/soars": {
+                        "key": "AAPL/year=2024/apple-stock-soars",
+                        "content_hash": "hash",
+                        "ingested_at": "2024-10-01T00:00:00+00:00",
+                    }
+                },
+            }
+        )
+    )
+    assert manifest.is_known("AAPL", "https://news.com/soars")
+
+
+def test_manifest_prune() -> None:
+    now = dt.datetime.now(dt.UTC)
+    manifest = IngestionManifest()
+    manifest.put_article(
+        IngestedArticle("AAPL", "old", "key", "hash", now - dt.timedelta(days=400))
+    )
+    manifest.put_article(IngestedArticle("AAPL", "new", "key", "hash", now))
+    assert manifest.prune(now - dt.timedelta(days=365)) == 1
+    assert list(manifest.articles) == [("AAPL", "new")]
+
+
+def test_add_news_isolates_failed_writes(
+    walter_knowledge_base: WalterKnowledgeBase, mocker
+) -> None:
+    put_object = walter_knowledge_base.s3.put_object
+
+    def mock_put_object(bucket: str, key: str, contents: str) -> None:
+        if key.endswith("apple-stock-falls"):
+            raise ClientError({"Error": {"Code": "500"}}, "PutObject")
+        put_object(bucket, key, contents)
+
+    mocker.patch.object(
+        walter_knowledge_base.s3, "put_object", side_effect=mock_put_object
+    )
+    manifest = IngestionManifest()
+    assert walter_knowledge_base.add_news(NEWS, manifest) == 1
+    assert list(manifest.articles) == [("AAPL", "https://news.com/soars")]
+
+
+def test_add_news_packed(walter_knowledge_base: WalterKnowledgeBase, mocker) -> None:
+    walter_knowledge_base.packed = True
+    put_object = mocker.spy(walter_knowledge_base.s3, "put_object")
+    manifest = IngestionManifest()
+    walter_knowledge_base.add_news(NEWS, manifest)
+    walter_knowledge_base.add_news(
+        CompanyNews(
+            symbol="AAPL",
+            news={"apple-stock-flat": "Flat"},
+            urls={"apple-stock-flat": "https://news.com/flat"},
+        ),
+        manifest,
+    )
+
+    article_puts = get_article_puts(put_object)
+    assert len(article_puts) == 2
+    key = article_puts[-1].kwargs["key"]
+    assert key.startswith("AAPL/year=") and key.endswith("/news.ndjson.gz")
+    assert {article.key for article in manifest.articles.values()} == {key}
+    packed = gzip.decompress(
+        walter_knowledge_base.s3.get_object_if_exists(
+            walter_knowledge_base.bucket, key, decode=False
+        )
+    ).decode()
+    assert [json.loads(line)["title"] for line in packed.splitlines()] == [
+        "apple-stock-soars",
+        "apple-stock-falls",
+        "apple-stock-flat",
+    ]
+
+
+def test_add_news_updates_news_index(
+    walter_knowledge_base: WalterKnowledgeBase,
+) -> None:
+    walter_knowledge_base.add_news(
+        CompanyNews(
+            symbol="aapl",
+            news={
+                "apple-earnings": "Apple beats earnings estimates on iPhone sales",
+                "apple-campus": "Apple opens a new campus in Austin",
+            },
+            urls={},
+        )
+    )
+    index = walter_knowledge_base.get_news_index("AAPL")
+    assert len(index.passages) == 2
+    assert index.search("earnings", 1)[0].title == "apple-earnings"
+
+    # articles replaced by title are reindexed rather than duplicated
+    walter_knowledge_base.add_news(
+        CompanyNews(
+            symbol="AAPL",
+            news={"apple-campus": "Apple delays its new campus in Austin"},
+            urls={},
+        )
+    )
+    index = walter_knowledge_base.get_news_index("AAPL")
+    assert len(index.passages) == 2
+    assert "delays" in index.search("campus", 1)[0].text
+
+
+def test_get_news_index_empty(walter_knowledge_base: WalterKnowledgeBase) -> None:
+    index = walter_knowledge_base.get_news_index("msft")
+    assert index.symbol == "MSFT"
+    assert index.passages == []
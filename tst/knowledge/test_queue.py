@@ -0,0 +1,28 @@
+import datetime as dt
+import json
+
+from mypy_boto3_sqs import SQSClient
+
+from src.knowledge.queue import IngestNewsQueue, IngestNewsShard
+
+INGEST_NEWS_QUEUE_URL = (
+    "https://sqs.us-east-1.amazonaws.com/012345678901/IngestNewsQueue-unittest"
+)
+
+SHARD = IngestNewsShard(
+    shard=0,
+    num_shards=2,
+    symbols=["AAPL", "META"],
+    started_at=dt.datetime(2024, 10, 1, tzinfo=dt.UTC),
+)
+
+
+def test_get_queue_url(ingest_news_queue: IngestNewsQueue) -> None:
+    assert INGEST_NEWS_QUEUE_URL == ingest_news_queue._get_queue_url()
+
+
+def test_add_shards(ingest_news_queue: IngestNewsQueue, sqs_client: SQSClient) -> None:
+    message_ids = ingest_news_queue.add_shards([SHARD])
+    messages = sqs_client.receive_message(QueueUrl=INGEST_NEWS_QUEUE_URL)
+    assert 1 == len(message_ids)
+    assert json.loads(messages["Messages"][0]["Body"]) == SHARD.to_message()
@@ -0,0 +1,97 @@
+import datetime as dt
+
+import pytest
+from botocore.exceptions import ClientError
+from mypy_boto3_s3 import S3Client
+
+from src.aws.s3.client import WalterS3Client
+from src.database.client import WalterDB
+from src.environment import Domain
+from src.newsletters.client import NewslettersBucket
+from src.newsletters.snapshot import (
+    create_market_data_snapshot,
+    get_market_data_window,
+)
+from src.stocks.client import WalterStocksAPI
+
+START_DATE = dt.datetime(year=2024, month=10, day=1, hour=0)
+END_DATE = dt.datetime(year=2024, month=10, day=1, hour=2)
+
+
+@pytest.fixture
+def newsletters_bucket(s3_client: S3Client) -> NewslettersBucket:
+    s3_client.create_bucket(Bucket="walterai-newsletters-unittest")
+    return NewslettersBucket(
+        client=WalterS3Client(client=s3_client, domain=Domain.TESTING),
+        domain=Domain.TESTING,
+    )
+
+
+def test_create_market_data_snapshot(
+    walter_db: WalterDB,
+    walter_stocks_api: WalterStocksAPI,
+    newsletters_bucket: NewslettersBucket,
+) -> None:
+    snapshot = create_market_data_snapshot(
+        walter_db, walter_stocks_api, newsletters_bucket, START_DATE, END_DATE
+    )
+
+    # each distinct held stock is fetched once even though AAPL is held twice
+    assert 6 == walter_stocks_api.polygon.client.list_aggs.call_count
+    assert ["AAPL", "META"] == list(snapshot.prices.keys())
+    assert snapshot == newsletters_bucket.get_market_data_snapshot(END_DATE)
+
+
+def test_get_portfolio_from_market_data_snapshot(
+    walter_db: WalterDB,
+    walter_stocks_api: WalterStocksAPI,
+    newsletters_bucket: NewslettersBucket,
+) -> None:
+    snapshot = create_market_data_snapshot(
+        walter_db, walter_stocks_api, newsletters_bucket, START_DATE, END_DATE
+    )
+    rest_client = walter_stocks_api.polygon.client
+    rest_client.reset_mock()
+
+    user = walter_db.get_user("walrus@gmail.com")
+    user_stocks = walter_db.get_stocks_for_user(user)
+    stocks = walter_db.get_stocks(list(user_stocks.keys()))
+    portfolio = walter_stocks_api.get_portfolio(
+        user_stocks, stocks, START_DATE, END_DATE, snapshot
+    )
+
+    assert 35_000.0 == portfolio.get_total_equity()
+    assert 0 == rest_client.list_aggs.call_count
+    assert 0 == rest_client.list_ticker_news.call_count
+
+
+def test_get_market_data_snapshot_does_not_exist(
+    newsletters_bucket: NewslettersBucket,
+) -> None:
+    assert newsletters_bucket.get_market_data_snapshot(END_DATE) is None
+
+
+def test_get_market_data_snapshot_raises_access_denied(
+    newsletters_bucket: NewslettersBucket, mocker
+) -> None:
+    # access denied is not a missing snapshot and must not fall back silently
+    mocker.patch.object(
+        newsletters_bucket.client.client,
+        "get_object",
+        side_effect=ClientError(
+            {"Error": {"Code": "AccessDenied", "Message": "Access Denied"}},
+            "GetObject",
+        ),
+    )
+
+    with pytest.raises(ClientError):
+        newsletters_bucket.get_market_data_snapshot(END_DATE)
+
+
+def test_get_market_data_window() -> None:
+    start_date, end_date = get_market_data_window()
+    assert dt.UTC == end_date.tzinfo
+    assert end_date == dt.datetime.now(dt.UTC).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    assert dt.timedelta(days=7) == end_date - start_date
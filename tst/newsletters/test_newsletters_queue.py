@@ -1,9 +1,10 @@
 import json
 
 import pytest
+from botocore.exceptions import ClientError
 from mypy_boto3_sqs import SQSClient
 
-from src.aws.sqs.client import WalterSQSClient
+from src.aws.sqs.client import SendMessagesError, WalterSQSClient
 from src.database.users.models import User
 from src.environment import Domain
 from src.newsletters.queue import NewslettersQueue, NewsletterRequest
@@ -53,3 +54,134 @@ def test_delete_newsletter_request(
     messages = sqs_client.receive_message(QueueUrl=NEWSLETTER_QUEUE_URL)
     assert message_id is not None
     assert "Messages" not in messages
+
+
+def test_add_newsletter_requests(
+    newsletters_queue: NewslettersQueue, sqs_client: SQSClient
+) -> None:
+    requests = [NewsletterRequest(email=f"walter{i}@gmail.com") for i in range(25)]
+    message_ids = newsletters_queue.add_newsletter_requests(requests)
+    emails = set()
+    while True:
+        messages = sqs_client.receive_message(
+            QueueUrl=NEWSLETTER_QUEUE_URL, MaxNumberOfMessages=10
+        )
+        if "Messages" not in messages:
+            break
+        for message in messages["Messages"]:
+            emails.add(json.loads(message["Body"])["email"])
+            sqs_client.delete_message(
+                QueueUrl=NEWSLETTER_QUEUE_URL, ReceiptHandle=message["ReceiptHandle"]
+            )
+    assert 25 == len(message_ids)
+    assert {request.email for request in requests} == emails
+
+
+def test_add_newsletter_requests_retries_failed_messages(
+    newsletters_queue: NewslettersQueue, sqs_client: SQSClient, mocker
+) -> None:
+    send_message_batch = sqs_client.send_message_batch
+    calls = []
+
+    def mock_send_message_batch(QueueUrl: str, Entries: list) -> dict:
+        calls.append(Entries)
+        response = send_message_batch(QueueUrl=QueueUrl, Entries=Entries[:1])
+        response["Failed"] = [
+            {"Id": entry["Id"], "SenderFault": False, "Code": "", "Message": ""}
+            for entry in Entries[1:]
+        ]
+        return response
+
+    mocker.patch.object(
+        sqs_client, "send_message_batch", side_effect=mock_send_message_batch
+    )
+    mocker.patch("src.aws.sqs.client.time.sleep")
+
+    requests = [NewsletterRequest(email=f"walter{i}@gmail.com") for i in range(3)]
+    message_ids = newsletters_queue.add_newsletter_requests(requests)
+
+    assert 3 == len(calls)
+    assert 3 == len(message_ids)
+
+
+def test_add_newsletter_requests_raises_failed_messages(
+    newsletters_queue: NewslettersQueue, sqs_client: SQSClient, mocker
+) -> None:
+    send_message_batch = sqs_client.send_message_batch
+
+    def mock_send_message_batch(QueueUrl: str, Entries: list) -> dict:
+        response = send_message_batch(QueueUrl=QueueUrl, Entries=Entries[:1])
+        response["Failed"] = [
+            {"Id": entry["Id"], "SenderFault": False, "Code": "", "Message": ""}
+            for entry in Entries[1:]
+        ]
+        return response
+
+    mocker.patch.object(
+        sqs_client, "send_message_batch", side_effect=mock_send_message_batch
+    )
+    mocker.patch("src.aws.sqs.client.time.sleep")
+
+    requests = [NewsletterRequest(email=f"walter{i}@gmail.com") for i in range(5)]
+    with pytest.raises(SendMessagesError) as error:
+        newsletters_queue.add_newsletter_requests(requests)
+
+    # one message is sent per attempt, so the last message is never sent
+    assert [{"email": "walter4@gmail.com"}] == error.value.failed
+    assert 4 == len(error.value.message_ids)
+
+
+def test_add_newsletter_requests_retries_throttled_batches(
+    newsletters_queue: NewslettersQueue, sqs_client: SQSClient, mocker
+) -> None:
+    send_message_batch = sqs_client.send_message_batch
+    calls = []
+
+    def mock_send_message_batch(QueueUrl: str, Entries: list) -> dict:
+        calls.append(Entries)
+        if len(calls) == 1:
+            raise ClientError(
+                {"Error": {"Code": "RequestThrottled", "Message": "Throttled"}},
+                "SendMessageBatch",
+            )
+        return send_message_batch(QueueUrl=QueueUrl, Entries=Entries)
+
+    mocker.patch.object(
+        sqs_client, "send_message_batch", side_effect=mock_send_message_batch
+    )
+    mocker.patch("src.aws.sqs.client.time.sleep")
+
+    requests = [NewsletterRequest(email=f"walter{i}@gmail.com") for i in range(3)]
+    message_ids = newsletters_queue.add_newsletter_requests(requests)
+
+    assert 2 == len(calls)
+    assert 3 == len(message_ids)
+
+
+def test_add_newsletter_requests_reports_failed_batches(
+    newsletters_queue: NewslettersQueue, sqs_client: SQSClient, mocker
+) -> None:
+    send_message_batch = sqs_client.send_message_batch
+    calls = []
+
+    def mock_send_message_batch(QueueUrl: str, Entries: list) -> dict:
+        calls.append(Entries)
+        if Entries[0]["MessageBody"] == json.dumps({"email": "walter0@gmail.com"}):
+            raise ClientError(
+                {"Error": {"Code": "AccessDenied", "Message": "Access denied"}},
+                "SendMessageBatch",
+            )
+        return send_message_batch(QueueUrl=QueueUrl, Entries=Entries)
+
+    mocker.patch.object(
+        sqs_client, "send_message_batch", side_effect=mock_send_message_batch
+    )
+
+    requests = [NewsletterRequest(email=f"walter{i}@gmail.com") for i in range(15)]
+    with pytest.raises(SendMessagesError) as error:
+        newsletters_queue.add_newsletter_requests(requests)
+
+    # non-retryable batch errors are not retried and the other batches are still sent
+    assert 2 == len(calls)
+    assert [request.to_message() for request in requests[:10]] == error.value.failed
+    assert 5 == len(error.value.message_ids)
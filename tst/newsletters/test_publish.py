@@ -0,0 +1,45 @@
+import pytest
+
+from src import clients
+from src.aws.sqs.client import SendMessagesError
+from src.database.client import WalterDB
+from src.newsletters.publish import add_newsletter_to_queue
+from src.newsletters.queue import NewslettersQueue
+
+
+@pytest.fixture
+def publish_clients(
+    monkeypatch, walter_db: WalterDB, newsletters_queue: NewslettersQueue, mocker
+) -> None:
+    # set the clients directly as module attributes so that their factories are not invoked
+    monkeypatch.setitem(vars(clients), "walter_db", walter_db)
+    monkeypatch.setitem(vars(clients), "newsletters_queue", newsletters_queue)
+    monkeypatch.setitem(vars(clients), "walter_cw", mocker.Mock())
+    mocker.patch("src.newsletters.publish.create_market_data_snapshot")
+
+
+def test_add_newsletter_to_queue(
+    publish_clients, newsletters_queue: NewslettersQueue, mocker
+) -> None:
+    add_newsletter_requests = mocker.spy(newsletters_queue, "add_newsletter_requests")
+    assert 200 == add_newsletter_to_queue({}, None)["statusCode"]
+    assert add_newsletter_requests.call_count == 1
+
+
+def test_add_newsletter_to_queue_reports_failed_requests(
+    publish_clients, newsletters_queue: NewslettersQueue, mocker
+) -> None:
+    mocker.patch.object(
+        newsletters_queue,
+        "add_newsletter_requests",
+        side_effect=SendMessagesError(
+            newsletters_queue.queue_url,
+            failed=[{"email": "walter@gmail.com"}],
+            message_ids=[],
+        ),
+    )
+    # failures are not raised as a retried invocation would send duplicate newsletters
+    assert 200 == add_newsletter_to_queue({}, None)["statusCode"]
+    clients.walter_cw.emit_metric.assert_called_once_with(
+        "WalterNewsletters.NumberOfFailedNewsletterRequests", 1
+    )
@@ -0,0 +1,160 @@
+import datetime as dt
+import threading
+import time
+
+import pytest
+import requests
+
+from src.stocks.alphavantage.client import AlphaVantageClient, AlphaVantageError
+
+FEED = {
+    "feed": [
+        {"title": "Apple Stock Soars!", "url": "https://news.com/apple"},
+        {"title": "Apple Report (PDF)", "url": "https://news.com/report.pdf"},
+        {"title": "Apple Stock Falls", "url": "https://other.com/apple"},
+        {"title": "Apple Huge Article", "url": "https://other.com/huge"},
+        {
+            "title": "Apple Broken Link",
+            "url": "https://other.com/broken",
+            "time_published": "20241001T093000",
+        },
+    ]
+}
+
+
+class MockResponse:
+
+    def __init__(
+        self,
+        content: bytes = b"",
+        content_type: str = "text/html",
+        json: dict = None,
+        error: Exception = None,
+    ) -> None:
+        self.content = content
+        self.headers = {"Content-Type": content_type}
+        self.encoding = "utf-8"
+        self._json = json
+        self._error = error
+
+    def __enter__(self) -> "MockResponse":
+        return self
+
+    def __exit__(self, *args) -> None:
+        pass
+
+    def json(self) -> dict:
+        return self._json
+
+    def raise_for_status(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def iter_content(self, chunk_size: int):
+        for start in range(0, len(self.content), chunk_size):
+            end = start + chunk_size
+            yield self.content[start:end]
+
+
+PAGES = {
+    "https://news.com/apple": MockResponse(
+        b"<html><body><p>Apple   stock\nsoars</p></body></html>"
+    ),
+    "https://news.com/report.pdf": MockResponse(b"%PDF", "application/pdf"),
+    "https://other.com/apple": MockResponse(
+        b"<html><body><p>Apple stock falls</p></body></html>"
+    ),
+    "https://other.com/huge": MockResponse(b"<p>" + b"a" * 2048 + b"</p>"),
+    "https://other.com/broken": MockResponse(
+        error=requests.HTTPError("404 Client Error")
+    ),
+}
+
+
+@pytest.fixture
+def alpha_vantage() -> AlphaVantageClient:
+    return AlphaVantageClient(
+        get_api_key=lambda: "test-api-key", max_article_bytes=1024
+    )
+
+
+def mock_get(url: str, **kwargs) -> MockResponse:
+    return PAGES.get(url, MockResponse(json=FEED))
+
+
+def test_get_news(alpha_vantage: AlphaVantageClient, mocker) -> None:
+    get = mocker.patch.object(alpha_vantage.session, "get", side_effect=mock_get)
+    news = alpha_vantage.get_news("AAPL")
+    assert news.news == {
+        "apple-stock-soars": "Apple stock soars",
+        "apple-stock-falls": "Apple stock falls",
+    }
+    assert all(
+        call.kwargs["timeout"] == AlphaVantageClient.DEFAULT_TIMEOUT_SECONDS
+        for call in get.call_args_list
+    )
+
+
+def test_get_news_raises_error_payloads(
+    alpha_vantage: AlphaVantageClient, mocker
+) -> None:
+    mocker.patch.object(
+        alpha_vantage.session,
+        "get",
+        return_value=MockResponse(json={"Information": "Rate limit reached!"}),
+    )
+    with pytest.raises(AlphaVantageError, match="Rate limit reached!"):
+        alpha_vantage.get_news("AAPL")
+
+
+def test_get_news_failed_since(alpha_vantage: AlphaVantageClient, mocker) -> None:
+    mocker.patch.object(alpha_vantage.session, "get", side_effect=mock_get)
+    # the broken link is retryable as the error has no response
+    assert alpha_vantage.get_news("AAPL").failed_since == dt.datetime(
+        2024, 10, 1, 9, 30, tzinfo=dt.UTC
+    )
+
+    def mock_get_not_found(url: str, **kwargs) -> MockResponse:
+        if url == "https://other.com/broken":
+            return MockResponse(
+                error=requests.HTTPError(
+                    "404 Client Error", response=mocker.Mock(status_code=404)
+                )
+            )
+        return mock_get(url)
+
+    # articles that are not found are skipped rather than retried
+    mocker.patch.object(alpha_vantage.session, "get", side_effect=mock_get_not_found)
+    assert alpha_vantage.get_news("AAPL").failed_since is None
+
+
+def test_get_news_limits_requests_per_host(
+    alpha_vantage: AlphaVantageClient, mocker
+) -> None:
+    alpha_vantage.max_requests_per_host = 2
+    lock = threading.Lock()
+    in_flight, max_in_flight = {}, {}
+
+    def mock_slow_get(url: str, **kwargs) -> MockResponse:
+        if "query" in url:
+            return MockResponse(
+                json={
+                    "feed": [
+                        {"title": f"Article {i}", "url": f"https://news.com/{i}"}
+                        for i in range(8)
+                    ]
+                }
+            )
+        with lock:
+            in_flight[url[:16]] = in_flight.get(url[:16], 0) + 1
+            max_in_flight[url[:16]] = max(
+                max_in_flight.get(url[:16], 0), in_flight[url[:16]]
+            )
+        time.sleep(0.01)
+        with lock:
+            in_flight[url[:16]] -= 1
+        return MockResponse(b"<p>Article</p>")
+
+    mocker.patch.object(alpha_vantage.session, "get", side_effect=mock_slow_get)
+    assert len(alpha_vantage.get_news("AAPL").news) == 8
+    assert max_in_flight == {"https://news.com": 2}
@@ -0,0 +1,95 @@
+import datetime as dt
+
+import pytest
+
+from src.database.stocks.models import Stock
+from src.database.users.models import User
+from src.database.userstocks.models import UserStock
+from src.stocks.cache.backends import InMemoryBackend, LocalFileBackend, S3Backend
+from src.stocks.cache.client import MarketDataCache
+from src.stocks.client import WalterStocksAPI
+from src.stocks.polygon.models import StockNews, StockPrice, StockPrices
+
+WALTER = User(email="walter@gmail.com", username="walter", password_hash="password")
+
+START_DATE = dt.datetime(year=2024, month=10, day=1, hour=0)
+END_DATE = dt.datetime(year=2024, month=10, day=1, hour=2)
+
+AAPL = Stock(symbol="AAPL", company="Apple")
+META = Stock(symbol="META", company="Facebook")
+
+USER_STOCKS = {
+    AAPL.symbol: UserStock(
+        user_email=WALTER.email, stock_symbol=AAPL.symbol, quantity=1.0
+    ),
+    META.symbol: UserStock(
+        user_email=WALTER.email, stock_symbol=META.symbol, quantity=2.0
+    ),
+}
+
+STOCKS = {AAPL.symbol: AAPL, META.symbol: META}
+
+PRICES = StockPrices(
+    prices=[StockPrice(symbol=AAPL.symbol, price=90.0, timestamp=START_DATE)]
+)
+NEWS = StockNews(symbol=AAPL.symbol, descriptions=["It is much bigger than Atlantis!"])
+
+
+def test_in_memory_backend_evicts_least_recently_used() -> None:
+    backend = InMemoryBackend(max_entries=2)
+    backend.put("a", "1", 60)
+    backend.put("b", "2", 60)
+    backend.get("a")
+    backend.put("c", "3", 60)
+    assert "1" == backend.get("a")
+    assert backend.get("b") is None
+    assert "3" == backend.get("c")
+
+
+def test_in_memory_backend_expires_entries() -> None:
+    backend = InMemoryBackend()
+    backend.put("a", "1", 0)
+    assert backend.get("a") is None
+
+
+def test_local_file_backend(tmp_path) -> None:
+    backend = LocalFileBackend(directory=str(tmp_path))
+    backend.put("prices/AAPL/2024-10-01", "1", 60)
+    assert "1" == backend.get("prices/AAPL/2024-10-01")
+    assert backend.get("prices/META/2024-10-01") is None
+
+
+def test_s3_backend(walter_s3) -> None:
+    backend = S3Backend(client=walter_s3, bucket="walterai-templates-unittest")
+    backend.put("news/AAPL/2024-10-01", '["news"]', 60)
+    assert '["news"]' == backend.get("news/AAPL/2024-10-01")
+    assert backend.get("news/META/2024-10-01") is None
+
+
+@pytest.mark.parametrize(
+    "create_backend",
+    [
+        lambda tmp_path: InMemoryBackend(),
+        lambda tmp_path: LocalFileBackend(directory=str(tmp_path)),
+    ],
+)
+def test_market_data_cache_round_trip(create_backend, tmp_path) -> None:
+    cache = MarketDataCache(backend=create_backend(tmp_path))
+    cache.put_prices(AAPL.symbol, START_DATE, END_DATE, PRICES)
+    cache.put_news(AAPL.symbol, START_DATE, NEWS)
+    assert PRICES == cache.get_prices(AAPL.symbol, START_DATE, END_DATE)
+    assert NEWS == cache.get_news(AAPL.symbol, START_DATE)
+
+
+def test_get_portfolio_reads_through_cache(
+    walter_stocks_api: WalterStocksAPI,
+) -> None:
+    walter_stocks_api.cache = MarketDataCache(backend=InMemoryBackend())
+    rest_client = walter_stocks_api.polygon.client
+
+    first = walter_stocks_api.get_portfolio(USER_STOCKS, STOCKS, START_DATE, END_DATE)
+    second = walter_stocks_api.get_portfolio(USER_STOCKS, STOCKS, START_DATE, END_DATE)
+
+    assert first == second
+    assert 2 == rest_client.list_aggs.call_count
+    assert 2 == rest_client.list_ticker_news.call_count
@@ -1,16 +1,23 @@
 import datetime as dt
 
+import pytest
+
 from src.database.stocks.models import Stock
 from src.database.users.models import User
 from src.database.userstocks.models import UserStock
 from src.stocks.client import WalterStocksAPI
 from src.stocks.models import Portfolio
+from src.stocks.polygon.client import PolygonBatchError, PolygonClient
 from src.stocks.polygon.models import StockPrices, StockPrice, StockNews
 
 WALTER = User(email="walter@gmail.com", username="walter", password_hash="password")
 
-START_DATE = dt.datetime(year=2024, month=10, day=1, hour=0, minute=0, second=0, microsecond=0)
-END_DATE = dt.datetime(year=2024, month=10, day=1, hour=2, minute=0, second=0, microsecond=0)
+START_DATE = dt.datetime(
+    year=2024, month=10, day=1, hour=0, minute=0, second=0, microsecond=0
+)
+END_DATE = dt.datetime(
+    year=2024, month=10, day=1, hour=2, minute=0, second=0, microsecond=0
+)
 
 
 AAPL = Stock(symbol="AAPL", company="Apple")
@@ -117,3 +124,61 @@ def test_get_equity() -> None:
 
 def test_get_total_equity() -> None:
     assert 600.0 == PORTFOLIO.get_total_equity()
+
+
+def test_batch_get_prices_raises_failed_symbols(
+    walter_stocks_api: WalterStocksAPI,
+) -> None:
+    user_stocks = {
+        **USER_STOCKS,
+        "INVALID": UserStock(
+            user_email=WALTER.email, stock_symbol="INVALID", quantity=1.0
+        ),
+    }
+    with pytest.raises(PolygonBatchError) as error:
+        walter_stocks_api.polygon.batch_get_prices(user_stocks, START_DATE, END_DATE)
+    assert ["INVALID"] == list(error.value.failures.keys())
+    assert PRICES == error.value.results
+
+
+def test_get_portfolio_raises_failed_prices(
+    walter_stocks_api: WalterStocksAPI,
+) -> None:
+    user_stocks = {
+        **USER_STOCKS,
+        "INVALID": UserStock(
+            user_email=WALTER.email, stock_symbol="INVALID", quantity=1.0
+        ),
+    }
+    with pytest.raises(PolygonBatchError):
+        walter_stocks_api.get_portfolio(
+            user_stocks, {AAPL.symbol: AAPL, META.symbol: META}, START_DATE, END_DATE
+        )
+
+
+def test_get_news_without_failed_symbols(walter_stocks_api: WalterStocksAPI) -> None:
+    user_stocks = {
+        **USER_STOCKS,
+        "INVALID": UserStock(
+            user_email=WALTER.email, stock_symbol="INVALID", quantity=1.0
+        ),
+    }
+    news = walter_stocks_api._get_news(user_stocks, START_DATE)
+    assert [AAPL.symbol, META.symbol, "INVALID"] == list(news.keys())
+    assert news["INVALID"] is None
+
+
+def test_polygon_client_uses_rotated_api_key(mocker) -> None:
+    rest_client = mocker.patch("polygon.RESTClient")
+    api_keys = iter(["test-api-key", "test-api-key", "test-rotated-api-key"])
+    polygon = PolygonClient(get_api_key=lambda: next(api_keys))
+
+    polygon._init_rest_client()
+    polygon._init_rest_client()
+    polygon._init_rest_client()
+
+    # the rest client is only recreated once the api key is rotated
+    assert [
+        mocker.call(api_key="test-api-key"),
+        mocker.call(api_key="test-rotated-api-key"),
+    ] == rest_client.call_args_list
@@ -14,3 +14,57 @@ def test_get_template_spec(template_engine: TemplatesEngine) -> None:
     template_engine.get_template_spec(
         template_name=TEMPLATE_NAME, template_spec_args=template_spec_args
     )
+
+
+def test_get_template_compiles_once(template_engine: TemplatesEngine, mocker) -> None:
+    get_template_if_modified = mocker.spy(
+        template_engine.templates_bucket, "get_template_if_modified"
+    )
+    compile = mocker.spy(template_engine.environment, "from_string")
+
+    first = template_engine.get_template(TEMPLATE_NAME, {})
+    second = template_engine.get_template(TEMPLATE_NAME, {})
+
+    assert first == second
+    assert get_template_if_modified.call_count == 1
+    assert compile.call_count == 1
+
+
+def test_get_template_revalidates_unmodified_template(
+    template_engine: TemplatesEngine, mocker
+) -> None:
+    template_engine.revalidate_after_seconds = 0
+    get_object_if_modified = mocker.spy(
+        template_engine.templates_bucket.client, "get_object_if_modified"
+    )
+    compile = mocker.spy(template_engine.environment, "from_string")
+
+    template_engine.get_template(TEMPLATE_NAME, {})
+    template_engine.get_template(TEMPLATE_NAME, {})
+
+    assert get_object_if_modified.call_count == 2
+    etag = get_object_if_modified.spy_return[1]
+    get_object_if_modified.assert_called_with(
+        template_engine.templates_bucket.bucket,
+        "templates/default/template.jinja",
+        etag,
+    )
+    assert get_object_if_modified.spy_return == (None, etag)
+    assert compile.call_count == 1
+
+
+def test_get_template_recompiles_modified_template(
+    template_engine: TemplatesEngine, s3_client
+) -> None:
+    template_engine.revalidate_after_seconds = 0
+    template_engine.get_template(TEMPLATE_NAME, {})
+
+    s3_client.put_object(
+        Bucket=template_engine.templates_bucket.bucket,
+        Key="templates/default/template.jinja",
+        Body=b"Hello {{ User }}!",
+    )
+
+    assert template_engine.get_template(TEMPLATE_NAME, {"User": "walter"}) == (
+        "Hello walter!"
+    )
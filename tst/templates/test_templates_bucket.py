@@ -10,3 +10,52 @@ def test_get_template_spec(templates_bucket: TemplatesBucket) -> None:
 
 def test_get_template(templates_bucket: TemplatesBucket) -> None:
     templates_bucket.get_template(template=TEMPLATE_NAME)
+
+
+def test_get_template_assets_cached(templates_bucket: TemplatesBucket, mocker) -> None:
+    templates_bucket.client.client.put_object(
+        Bucket=templates_bucket.bucket,
+        Key="templates/default/assets/logo.png",
+        Body=b"logo",
+    )
+    list_object_etags = mocker.spy(templates_bucket.client, "list_object_etags")
+
+    first = templates_bucket.get_template_assets(template=TEMPLATE_NAME)
+    second = templates_bucket.get_template_assets(template=TEMPLATE_NAME)
+
+    assert first is second
+    assert first.assets["logo.png"].getvalue() == b"logo"
+    assert list_object_etags.call_count == 1
+
+
+def test_get_template_assets_downloads_modified_assets(
+    templates_bucket: TemplatesBucket, mocker
+) -> None:
+    s3 = templates_bucket.client.client
+    for name in ["logo.png", "icon.png"]:
+        s3.put_object(
+            Bucket=templates_bucket.bucket,
+            Key=f"templates/default/assets/{name}",
+            Body=name.encode(),
+        )
+    templates_bucket.revalidate_assets_after_seconds = 0
+    first = templates_bucket.get_template_assets(template=TEMPLATE_NAME)
+
+    # unmodified assets are revalidated without being downloaded again
+    download_object = mocker.spy(templates_bucket.client, "download_object")
+    assert templates_bucket.get_template_assets(template=TEMPLATE_NAME) is first
+    assert download_object.call_count == 0
+
+    s3.put_object(
+        Bucket=templates_bucket.bucket,
+        Key="templates/default/assets/logo.png",
+        Body=b"new logo",
+    )
+    second = templates_bucket.get_template_assets(template=TEMPLATE_NAME)
+
+    assert second is not first
+    assert second.assets["logo.png"].getvalue() == b"new logo"
+    assert second.assets["icon.png"] is first.assets["icon.png"]
+    download_object.assert_called_once_with(
+        templates_bucket.bucket, "templates/default/assets/logo.png"
+    )
@@ -0,0 +1,79 @@
+import json
+import os
+import subprocess
+import sys
+
+from src import clients
+from src.utils.coldstart import measure_cold_start
+
+
+def get_initialized_clients(statement: str) -> list:
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import json\n"
+            "from src import clients\n"
+            f"{statement}\n"
+            "print(json.dumps(sorted(clients.get_initialization_durations())))",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+        env={**os.environ, "AWS_DEFAULT_REGION": "us-east-1", "DOMAIN": "TESTING"},
+    )
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def test_import_walter_initializes_no_clients() -> None:
+    assert get_initialized_clients("import walter") == []
+
+
+def test_clients_initialized_on_first_use() -> None:
+    assert get_initialized_clients("clients.walter_db") == [
+        "walter_authenticator",
+        "walter_db",
+        "walter_sm",
+    ]
+
+
+def test_client_created_once() -> None:
+    assert get_initialized_clients("assert clients.walter_db is clients.walter_db") == [
+        "walter_authenticator",
+        "walter_db",
+        "walter_sm",
+    ]
+
+
+def test_measure_cold_start_logs_first_invocation_only(mocker) -> None:
+    log = mocker.patch("src.utils.coldstart.log")
+
+    @measure_cold_start
+    def entrypoint(event, context) -> dict:
+        return {"statusCode": 200}
+
+    assert entrypoint({}, {}) == {"statusCode": 200}
+    assert entrypoint({}, {}) == {"statusCode": 200}
+    log.info.assert_called_once()
+    assert "Cold start of 'entrypoint'" in log.info.call_args[0][0]
+
+
+def test_initialization_durations_exclude_dependencies(monkeypatch, mocker) -> None:
+    monkeypatch.setattr(clients, "_initialization_durations", {})
+    monkeypatch.setitem(clients._factories, "test_dependency", lambda: object())
+    monkeypatch.setitem(
+        clients._factories,
+        "test_client",
+        lambda: clients.get_client("test_dependency"),
+    )
+    # client starts at 0s, its dependency takes 2s and the client ends at 10s
+    mocker.patch("src.clients.time.perf_counter", side_effect=[0, 1, 3, 10])
+    try:
+        clients.get_client("test_client")
+        assert clients.get_initialization_durations() == {
+            "test_dependency": 2000,
+            "test_client": 8000,
+        }
+    finally:
+        for name in ["test_client", "test_dependency"]:
+            vars(clients).pop(name, None)
@@ -0,0 +1,105 @@
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+import pytest
+
+HANDLER_IMPORT_BUDGET_MS = 750
+"""(int): The maximum cumulative import time of an entrypoint and its handler module."""
+
+HEAVY_MODULES = ["bs4", "boto3", "jinja2", "markdown", "polygon"]
+"""(List[str]): Heavy third-party modules that should only be imported on first use."""
+
+HANDLERS = [
+    ("verify_email_entrypoint", "src.api.verify_email", HEAVY_MODULES),
+    ("auth_user_entrypoint", "src.api.auth_user", HEAVY_MODULES),
+    ("get_portfolio_entrypoint", "src.api.get_portfolio", HEAVY_MODULES),
+    (
+        "send_verify_email_entrypoint",
+        "src.api.send_verify_email",
+        ["bs4", "boto3", "markdown", "polygon"],
+    ),
+    ("ingest_news_entrypoint", "src.api.ingest_news", HEAVY_MODULES),
+    (
+        "add_ingest_news_shards_to_queue_entrypoint",
+        "src.knowledge.ingest",
+        HEAVY_MODULES,
+    ),
+    ("ingest_news_shards_entrypoint", "src.knowledge.ingest", HEAVY_MODULES),
+    (
+        "add_newsletter_to_queue_entrypoint",
+        "src.newsletters.publish",
+        HEAVY_MODULES,
+    ),
+    (
+        "create_newsletter_and_send_entrypoint",
+        "src.backend.backend",
+        ["bs4", "boto3", "jinja2", "polygon"],
+    ),
+]
+
+IMPORT_TIME_PATTERN = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)")
+
+
+def get_import_times(statement: str) -> List[Tuple[str, int, int, int]]:
+    """
+    Get the import times reported by `python -X importtime` for the given statement.
+
+    Returns:
+        The module name, self time (us), cumulative time (us) and nesting depth of each import.
+    """
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        check=True,
+        text=True,
+        env={**os.environ, "DOMAIN": "TESTING"},
+    )
+    import_times = []
+    for line in output.stderr.splitlines():
+        match = IMPORT_TIME_PATTERN.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            import_times.append((module, int(self_us), int(cumulative_us), len(indent)))
+    return import_times
+
+
+def get_report(import_times: List[Tuple[str, int, int, int]], limit: int = 15) -> str:
+    slowest = sorted(import_times, key=lambda import_time: -import_time[1])[:limit]
+    return "\n".join(
+        f"{self_us / 1000:8.2f}ms self | {cumulative_us / 1000:8.2f}ms cumulative | {module}"
+        for module, self_us, cumulative_us, _ in slowest
+    )
+
+
+@pytest.mark.parametrize("entrypoint, module, forbidden", HANDLERS)
+def test_handler_imports_heavy_modules_lazily(
+    entrypoint: str, module: str, forbidden: List[str]
+):
+    import_times = get_import_times(f"import walter\nimport {module}")
+    imported = {name for name, _, _, _ in import_times}
+
+    heavy = [name for name in forbidden if name in imported]
+    assert (
+        heavy == []
+    ), f"'{entrypoint}' imports {heavy} eagerly:\n{get_report(import_times)}"
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("entrypoint, module, forbidden", HANDLERS)
+def test_benchmark_handler_import_time(
+    entrypoint: str, module: str, forbidden: List[str]
+):
+    # import times depend on the machine so the budget is only checked on opt-in
+    import_times = get_import_times(f"import walter\nimport {module}")
+    imported: Dict[str, int] = {
+        name: cumulative_us for name, _, cumulative_us, _ in import_times
+    }
+    report = get_report(import_times)
+
+    import_time_ms = (imported["walter"] + imported.get(module, 0)) / 1000
+    assert (
+        import_time_ms < HANDLER_IMPORT_BUDGET_MS
+    ), f"'{entrypoint}' import time {import_time_ms:.2f}ms exceeds {HANDLER_IMPORT_BUDGET_MS}ms budget:\n{report}"
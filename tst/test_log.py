@@ -0,0 +1,110 @@
+import json
+import logging
+import time
+
+import pytest
+
+from src.utils.log import REDACTED, JSONFormatter, Logger, Payload, flush_logs
+
+EVENT = json.load(open("tst/api/data/event.json"))
+
+BENCHMARK_ITERATIONS = 500
+
+
+def get_event() -> dict:
+    return {
+        **EVENT,
+        "headers": {
+            "Authorization": "Bearer token",
+            "content-type": "application/json",
+        },
+        "body": json.dumps({"email": "walter@gmail.com", "password": "hunter2"}),
+    }
+
+
+def test_payload_redacts_sensitive_keys() -> None:
+    payload = json.loads(str(Payload(get_event(), max_chars=100000)))
+    assert payload["headers"]["Authorization"] == REDACTED
+    assert payload["body"] == {"email": "walter@gmail.com", "password": REDACTED}
+    assert "hunter2" not in str(Payload(get_event(), max_chars=100000))
+
+
+def test_payload_truncates_large_payloads() -> None:
+    serialized = str(Payload({"news": "a" * 1000}, max_chars=100))
+    assert serialized.startswith('{"news":"aaa')
+    assert serialized.endswith("...<truncated 911 chars>")
+
+
+def test_payload_is_not_serialized_if_level_disabled(mocker) -> None:
+    logger = logging.getLogger("tst.test_log")
+    logger.setLevel(logging.INFO)
+    event = get_event()
+    serialize = mocker.spy(Payload, "__str__")
+    dumps = mocker.spy(json, "dumps")
+    logger.debug("Event: %s", Payload(event))
+    serialize.assert_not_called()
+    dumps.assert_not_called()
+
+
+@pytest.mark.benchmark
+def test_benchmark_lazy_payload_logging(capsys) -> None:
+    """
+    Compare the per-request CPU time of logging the API Gateway event eagerly
+    pretty-printed at INFO with logging it lazily at DEBUG with INFO enabled.
+
+    Timings are reported rather than asserted, the lazy payload is covered by
+    `test_payload_is_not_serialized_if_level_disabled`.
+    """
+    logger = logging.getLogger("tst.test_log.benchmark")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.addHandler(logging.NullHandler())
+    event = get_event()
+
+    start = time.process_time()
+    for _ in range(BENCHMARK_ITERATIONS):
+        logger.info(f"Invoking 'API' API with event:\n{json.dumps(event, indent=4)}")
+    eager_us = (time.process_time() - start) / BENCHMARK_ITERATIONS * 1e6
+
+    start = time.process_time()
+    for _ in range(BENCHMARK_ITERATIONS):
+        logger.debug("Invoking '%s' API with event: %s", "API", Payload(event))
+    lazy_us = (time.process_time() - start) / BENCHMARK_ITERATIONS * 1e6
+
+    with capsys.disabled():
+        print(
+            f"\nEvent logging CPU per request: eager {eager_us:.1f}us, lazy {lazy_us:.1f}us"
+        )
+
+
+def test_get_logger_is_idempotent() -> None:
+    first = Logger("tst.test_log.idempotent").get_logger()
+    second = Logger("tst.test_log.idempotent").get_logger()
+    other = Logger("tst.test_log.other").get_logger()
+    assert first is second
+    assert len(first.handlers) == 1
+    assert first.handlers == other.handlers
+    assert not first.propagate
+
+
+def test_json_formatter() -> None:
+    record = logging.LogRecord(
+        "tst.test_log", logging.INFO, __file__, 1, "Hello %s", ("Walter",), None
+    )
+    document = json.loads(JSONFormatter().format(record))
+    assert document["level"] == "INFO"
+    assert document["logger"] == "tst.test_log"
+    assert document["message"] == "Hello Walter"
+
+
+def test_flush_logs_writes_queued_records(mocker) -> None:
+    log = Logger("tst.test_log.flush").get_logger()
+    handle = mocker.spy(logging.StreamHandler, "handle")
+
+    @flush_logs
+    def entrypoint(event, context) -> dict:
+        log.info("Invoked!")
+        return {}
+
+    assert entrypoint({}, {}) == {}
+    assert [call.args[1].getMessage() for call in handle.call_args_list] == ["Invoked!"]
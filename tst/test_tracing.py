@@ -0,0 +1,68 @@
+import contextvars
+import threading
+
+from src.config import CONFIG
+from src.utils.tracing import SpanKind, span, start_trace, traced
+
+
+@traced("Test.Call")
+def call() -> str:
+    return "result"
+
+
+@traced("Test.Pages")
+def pages():
+    yield from [1, 2, 3]
+
+
+def test_span_without_trace_is_noop() -> None:
+    with span("Validate"):
+        pass
+
+
+def test_span_records_stage() -> None:
+    with start_trace() as trace:
+        with span("Validate"):
+            pass
+        with span("Validate"):
+            pass
+    assert [(s.name, s.kind) for s in trace.spans] == [
+        ("Validate", SpanKind.STAGE),
+        ("Validate", SpanKind.STAGE),
+    ]
+    assert trace.get_totals()[(SpanKind.STAGE, "Validate")][1] == 2
+
+
+def test_traced_disabled_by_default(monkeypatch) -> None:
+    monkeypatch.setattr(CONFIG, "trace_downstream_calls", False)
+    with start_trace() as trace:
+        assert call() == "result"
+        assert list(pages()) == [1, 2, 3]
+    assert trace.spans == []
+
+
+def test_traced_records_downstream_calls(monkeypatch) -> None:
+    monkeypatch.setattr(CONFIG, "trace_downstream_calls", True)
+    with start_trace() as trace:
+        assert call() == "result"
+        assert list(pages()) == [1, 2, 3]
+    assert [(s.name, s.kind) for s in trace.spans] == [
+        ("Test.Call", SpanKind.DOWNSTREAM),
+        ("Test.Pages", SpanKind.DOWNSTREAM),
+    ]
+
+
+def test_traced_records_calls_from_copied_context(monkeypatch) -> None:
+    monkeypatch.setattr(CONFIG, "trace_downstream_calls", True)
+    with start_trace() as trace:
+        thread = threading.Thread(target=contextvars.copy_context().run, args=(call,))
+        thread.start()
+        thread.join()
+    assert [s.name for s in trace.spans] == ["Test.Call"]
+
+
+def test_server_timing() -> None:
+    with start_trace() as trace:
+        trace.record("DynamoDB.GetItem", SpanKind.DOWNSTREAM, 1.5)
+        trace.record("DynamoDB.GetItem", SpanKind.DOWNSTREAM, 2.0)
+    assert trace.to_server_timing() == 'dynamodb-getitem;dur=3.50;desc="Downstream x2"'
@@ -1,138 +1,274 @@
-from src.api.add_stock import AddStock
-from src.api.auth_user import AuthUser
-from src.api.change_password import ChangePassword
-from src.api.create_user import CreateUser
-from src.api.delete_stock import DeleteStock
-from src.api.get_news import GetNews
-from src.api.get_portfolio import GetPortfolio
-from src.api.get_prices import GetPrices
-from src.api.get_stock import GetStock
-from src.api.get_user import GetUser
-from src.api.ingest_news import IngestNews
-from src.api.send_change_password_email import SendChangePasswordEmail
-from src.api.send_newsletter import SendNewsletter
-from src.api.send_verify_email import SendVerifyEmail
-from src.api.subscribe import Subscribe
-from src.api.unsubscribe import Unsubscribe
-from src.api.verify_email import VerifyEmail
-from src.backend.backend import create_newsletter_and_send
-from src.clients import (
-    walter_cw,
-    walter_db,
-    walter_sm,
-    walter_stocks_api,
-    newsletters_queue,
-    walter_authenticator,
-    template_engine,
-    templates_bucket,
-    walter_ses,
-    knowledge_base,
-)
-from src.newsletters.publish import add_newsletter_to_queue
+"""
+Walter Entrypoints
+
+Each entrypoint imports the modules it needs on first invocation so that a
+Lambda function only pays the import cost of its own handler during cold start.
+"""
 
+from src import clients
+from src.aws.secretsmanager.client import WalterSecretsManagerClient
+from src.clients import prefetch_secrets
+from src.utils.coldstart import measure_cold_start
+from src.utils.log import flush_logs
 
 ##############
 # WALTER API #
 ##############
 
 
+@flush_logs
+@measure_cold_start
+@prefetch_secrets(
+    WalterSecretsManagerClient.USER_TOKEN_SECRET_IDS,
+    WalterSecretsManagerClient.VERIFY_EMAIL_SECRET_IDS,
+)
 def create_user_entrypoint(event, context) -> dict:
+    from src.api.create_user import CreateUser
+
     return CreateUser(
-        walter_authenticator,
-        walter_cw,
-        walter_db,
-        walter_ses,
-        template_engine,
-        templates_bucket,
+        clients.walter_authenticator,
+        clients.walter_cw,
+        clients.walter_db,
+        clients.walter_ses,
+        clients.template_engine,
+        clients.templates_bucket,
     ).invoke(event)
 
 
+@flush_logs
+@measure_cold_start
+@prefetch_secrets(WalterSecretsManagerClient.USER_TOKEN_SECRET_IDS)
 def auth_user_entrypoint(event, context) -> dict:
-    return AuthUser(walter_authenticator, walter_cw, walter_db, walter_sm).invoke(event)
+    from src.api.auth_user import AuthUser
+
+    return AuthUser(
+        clients.walter_authenticator,
+        clients.walter_cw,
+        clients.walter_db,
+        clients.walter_sm,
+    ).invoke(event)
 
 
+@flush_logs
+@measure_cold_start
+@prefetch_secrets(WalterSecretsManagerClient.USER_TOKEN_SECRET_IDS)
 def get_user_entrypoint(event, context) -> dict:
-    return GetUser(walter_authenticator, walter_cw, walter_db, walter_sm).invoke(event)
+    from src.api.get_user import GetUser
+
+    return GetUser(
+        clients.walter_authenticator,
+        clients.walter_cw,
+        clients.walter_db,
+        clients.walter_sm,
+    ).invoke(event)
 
 
+@flush_logs
+@measure_cold_start
+@prefetch_secrets(
+    WalterSecretsManagerClient.USER_TOKEN_SECRET_IDS,
+    WalterSecretsManagerClient.MARKET_DATA_SECRET_IDS,
+)
 def get_stock_entrypoint(event, context) -> dict:
+    from src.api.get_stock import GetStock
+
     return GetStock(
-        walter_authenticator, walter_cw, walter_db, walter_stocks_api
+        clients.walter_authenticator,
+        clients.walter_cw,
+        clients.walter_db,
+        clients.walter_stocks_api,
     ).invoke(event)
 
 
+@flush_logs
+@measure_cold_start
+@prefetch_secrets(
+    WalterSecretsManagerClient.USER_TOKEN_SECRET_IDS,
+    WalterSecretsManagerClient.MARKET_DATA_SECRET_IDS,
+)
 def add_stock_entrypoint(event, context) -> dict:
+    from src.api.add_stock import AddStock
+
     return AddStock(
-        walter_authenticator, walter_cw, walter_db, walter_stocks_api, walter_sm
+        clients.walter_authenticator,
+        clients.walter_cw,
+        clients.walter_db,
+        clients.walter_stocks_api,
+        clients.walter_sm,
     ).invoke(event)
 
 
+@flush_logs
+@measure_cold_start
+@prefetch_secrets(
+    WalterSecretsManagerClient.USER_TOKEN_SECRET_IDS,
+    WalterSecretsManagerClient.MARKET_DATA_SECRET_IDS,
+)
 def delete_stock_entrypoint(event, context) -> dict:
+    from src.api.delete_stock import DeleteStock
+
     return DeleteStock(
-        walter_authenticator, walter_cw, walter_db, walter_stocks_api, walter_sm
+        clients.walter_authenticator,
+        clients.walter_cw,
+        clients.walter_db,
+        clients.walter_stocks_api,
+        clients.walter_sm,
     ).invoke(event)
 
 
+@flush_logs
+@measure_cold_start
+@prefetch_secrets(
+    WalterSecretsManagerClient.USER_TOKEN_SECRET_IDS,
+    WalterSecretsManagerClient.MARKET_DATA_SECRET_IDS,
+)
 def get_portfolio_entrypoint(event, context) -> dict:
+    from src.api.get_portfolio import GetPortfolio
+
     return GetPortfolio(
-        walter_authenticator, walter_cw, walter_db, walter_sm, walter_stocks_api
+        clients.walter_authenticator,
+        clients.walter_cw,
+        clients.walter_db,
+        clients.walter_sm,
+        clients.walter_stocks_api,
     ).invoke(event)
 
 
+@flush_logs
+@measure_cold_start
+@prefetch_secrets(
+    WalterSecretsManagerClient.USER_TOKEN_SECRET_IDS,
+    WalterSecretsManagerClient.MARKET_DATA_SECRET_IDS,
+)
 def get_news_entrypoint(event, context) -> dict:
+    from src.api.get_news import GetNews
+
     return GetNews(
-        walter_authenticator, walter_cw, walter_db, walter_stocks_api
+        clients.walter_authenticator,
+        clients.walter_cw,
+        clients.walter_db,
+        clients.walter_stocks_api,
     ).invoke(event)
 
 
+@flush_logs
+@measure_cold_start
+@prefetch_secrets(WalterSecretsManagerClient.USER_TOKEN_SECRET_IDS)
 def send_newsletter_entrypoint(event, context) -> dict:
+    from src.api.send_newsletter import SendNewsletter
+
     return SendNewsletter(
-        walter_authenticator, walter_cw, walter_db, newsletters_queue, walter_sm
+        clients.walter_authenticator,
+        clients.walter_cw,
+        clients.walter_db,
+        clients.newsletters_queue,
+        clients.walter_sm,
     ).invoke(event)
 
 
+@flush_logs
+@measure_cold_start
+@prefetch_secrets(
+    WalterSecretsManagerClient.USER_TOKEN_SECRET_IDS,
+    WalterSecretsManagerClient.MARKET_DATA_SECRET_IDS,
+)
 def get_prices_entrypoint(event, context) -> dict:
+    from src.api.get_prices import GetPrices
+
     return GetPrices(
-        walter_authenticator, walter_cw, walter_db, walter_stocks_api
+        clients.walter_authenticator,
+        clients.walter_cw,
+        clients.walter_db,
+        clients.walter_stocks_api,
     ).invoke(event)
 
 
+@flush_logs
+@measure_cold_start
+@prefetch_secrets(
+    WalterSecretsManagerClient.USER_TOKEN_SECRET_IDS,
+    WalterSecretsManagerClient.VERIFY_EMAIL_SECRET_IDS,
+)
 def verify_email_entrypoint(event, context) -> dict:
-    return VerifyEmail(walter_authenticator, walter_cw, walter_db).invoke(event)
+    from src.api.verify_email import VerifyEmail
+
+    return VerifyEmail(
+        clients.walter_authenticator, clients.walter_cw, clients.walter_db
+    ).invoke(event)
 
 
+@flush_logs
+@measure_cold_start
+@prefetch_secrets(
+    WalterSecretsManagerClient.USER_TOKEN_SECRET_IDS,
+    WalterSecretsManagerClient.VERIFY_EMAIL_SECRET_IDS,
+)
 def send_verify_email_entrypoint(event, context) -> dict:
+    from src.api.send_verify_email import SendVerifyEmail
+
     return SendVerifyEmail(
-        walter_authenticator,
-        walter_cw,
-        walter_db,
-        walter_ses,
-        template_engine,
-        templates_bucket,
+        clients.walter_authenticator,
+        clients.walter_cw,
+        clients.walter_db,
+        clients.walter_ses,
+        clients.template_engine,
+        clients.templates_bucket,
     ).invoke(event)
 
 
+@flush_logs
+@measure_cold_start
+@prefetch_secrets(
+    WalterSecretsManagerClient.USER_TOKEN_SECRET_IDS,
+    WalterSecretsManagerClient.CHANGE_PASSWORD_SECRET_IDS,
+)
 def change_password_entrypoint(event, context) -> dict:
-    return ChangePassword(walter_authenticator, walter_cw, walter_db).invoke(event)
+    from src.api.change_password import ChangePassword
+
+    return ChangePassword(
+        clients.walter_authenticator, clients.walter_cw, clients.walter_db
+    ).invoke(event)
 
 
+@flush_logs
+@measure_cold_start
+@prefetch_secrets(
+    WalterSecretsManagerClient.USER_TOKEN_SECRET_IDS,
+    WalterSecretsManagerClient.CHANGE_PASSWORD_SECRET_IDS,
+)
 def send_change_password_email_entrypoint(event, context) -> dict:
+    from src.api.send_change_password_email import SendChangePasswordEmail
+
     return SendChangePasswordEmail(
-        walter_authenticator,
-        walter_cw,
-        walter_db,
-        walter_ses,
-        template_engine,
-        templates_bucket,
+        clients.walter_authenticator,
+        clients.walter_cw,
+        clients.walter_db,
+        clients.walter_ses,
+        clients.template_engine,
+        clients.templates_bucket,
     ).invoke(event)
 
 
+@flush_logs
+@measure_cold_start
+@prefetch_secrets(WalterSecretsManagerClient.USER_TOKEN_SECRET_IDS)
 def subscribe_entrypoint(event, context) -> dict:
-    return Subscribe(walter_authenticator, walter_cw, walter_db).invoke(event)
+    from src.api.subscribe import Subscribe
+
+    return Subscribe(
+        clients.walter_authenticator, clients.walter_cw, clients.walter_db
+    ).invoke(event)
 
 
+@flush_logs
+@measure_cold_start
+@prefetch_secrets(WalterSecretsManagerClient.USER_TOKEN_SECRET_IDS)
 def unsubscribe_entrypoint(event, context) -> dict:
-    return Unsubscribe(walter_authenticator, walter_cw, walter_db).invoke(event)
+    from src.api.unsubscribe import Unsubscribe
+
+    return Unsubscribe(
+        clients.walter_authenticator, clients.walter_cw, clients.walter_db
+    ).invoke(event)
 
 
 ######################
@@ -140,7 +276,12 @@ def unsubscribe_entrypoint(event, context) -> dict:
 ######################
 
 
+@flush_logs
+@measure_cold_start
+@prefetch_secrets(WalterSecretsManagerClient.MARKET_DATA_SECRET_IDS)
 def add_newsletter_to_queue_entrypoint(event, context) -> dict:
+    from src.newsletters.publish import add_newsletter_to_queue
+
     return add_newsletter_to_queue(event, context)
 
 
@@ -149,7 +290,15 @@ def add_newsletter_to_queue_entrypoint(event, context) -> dict:
 ##################
 
 
+@flush_logs
+@measure_cold_start
+@prefetch_secrets(
+    WalterSecretsManagerClient.USER_TOKEN_SECRET_IDS,
+    WalterSecretsManagerClient.MARKET_DATA_SECRET_IDS,
+)
 def create_newsletter_and_send_entrypoint(event, context) -> dict:
+    from src.backend.backend import create_newsletter_and_send
+
     return create_newsletter_and_send(event, context)
 
 
@@ -158,7 +307,36 @@ def create_newsletter_and_send_entrypoint(event, context) -> dict:
 ####################
 
 
+@flush_logs
+@measure_cold_start
+@prefetch_secrets(
+    WalterSecretsManagerClient.USER_TOKEN_SECRET_IDS,
+    WalterSecretsManagerClient.MARKET_DATA_SECRET_IDS,
+)
 def ingest_news_entrypoint(event, context) -> dict:
+    from src.api.ingest_news import IngestNews
+
     return IngestNews(
-        walter_authenticator, walter_cw, walter_db, walter_stocks_api, knowledge_base
+        clients.walter_authenticator,
+        clients.walter_cw,
+        clients.walter_db,
+        clients.walter_stocks_api,
+        clients.knowledge_base,
     ).invoke(event)
+
+
+@flush_logs
+@measure_cold_start
+def add_ingest_news_shards_to_queue_entrypoint(event, context) -> dict:
+    from src.knowledge.ingest import add_ingest_news_shards_to_queue
+
+    return add_ingest_news_shards_to_queue(event, context)
+
+
+@flush_logs
+@measure_cold_start
+@prefetch_secrets(WalterSecretsManagerClient.MARKET_DATA_SECRET_IDS)
+def ingest_news_shards_entrypoint(event, context) -> dict:
+    from src.knowledge.ingest import ingest_news_shards
+
+    return ingest_news_shards(event, context)